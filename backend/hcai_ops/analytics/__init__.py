@@ -1,11 +1,29 @@
-import os
+import atexit
 import os
 import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
+from typing import Optional, Tuple
 
+from hcai_ops.analytics.aggregates import StreamingMetricAggregator
 from hcai_ops.analytics.store import EventStore, PersistentEventStore, SQLiteEventStore
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.correlation import DEFAULT_FINDINGS, StreamingCorrelator
+from hcai_ops.analytics.hotseries import DEFAULT_CAPACITY, HotSeriesCache
+from hcai_ops.analytics.lazy import LazyProxy
+from hcai_ops.analytics.lograte import LogRateDetector
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore, parse_ttls
+from hcai_ops.analytics.rollups import RollupStore
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
+EVENT_STORE_MODE = os.getenv("HCAI_EVENT_STORE", "sqlite").lower()
+# Optional hot tier limits for SQLite: keep only recent events in memory, read older ranges from disk.
+HOT_WINDOW = timedelta(minutes=float(os.environ["HCAI_HOT_WINDOW_MINUTES"])) if os.getenv("HCAI_HOT_WINDOW_MINUTES") else None
+HOT_BYTES = int(os.environ["HCAI_HOT_BYTES"]) if os.getenv("HCAI_HOT_BYTES") else None
+# Size at which the JSONL fallback rotates its active file into a closed segment.
+JSONL_SEGMENT_BYTES = int(os.getenv("HCAI_JSONL_SEGMENT_BYTES", str(PersistentEventStore.DEFAULT_SEGMENT_BYTES)))
 DEFAULT_DATA_DIR = Path(os.getenv("HCAI_STORAGE_DIR", "")) if os.getenv("HCAI_STORAGE_DIR") else (Path.home() / ".hcai_ops_storage")
 
 
@@ -30,32 +48,11 @@ def _ensure_dir(path: Path) -> Path:
     return path
 
 
-def _choose_sqlite_path() -> Path:
-    """
-    Choose a durable SQLite path:
-    1. If HCAI_STORAGE_DIR is set, use it (create if needed).
-    2. Otherwise use ~/.hcai_ops_storage/events.db
-    3. If repo storage files have more rows, migrate them into the primary.
-    """
+def _primary_sqlite_path() -> Path:
+    """HCAI_STORAGE_DIR (a directory or an explicit .db file), else ~/.hcai_ops_storage/events.db."""
     primary = DEFAULT_DATA_DIR
     if primary.suffix != ".db":
         primary = primary / "events.db"
-    _ensure_dir(primary)
-
-    candidates = [
-        primary,
-        ROOT_DIR / "storage" / "events.db",
-        ROOT_DIR / "backend" / "storage" / "events.db",
-    ]
-    # Pick the candidate with the most rows.
-    row_counts = {p: _sqlite_row_count(p) for p in candidates}
-    best_path = max(row_counts, key=row_counts.get)
-    if best_path != primary and row_counts[best_path] > row_counts.get(primary, 0):
-        try:
-            shutil.copy2(best_path, primary)
-        except Exception:
-            # If copy fails, fall back to primary (may be empty).
-            pass
     return primary
 
 
@@ -63,26 +60,202 @@ def _choose_jsonl_path() -> Path:
     primary = DEFAULT_DATA_DIR
     if primary.suffix != ".jsonl":
         primary = primary / "events.jsonl"
-    return _ensure_dir(primary)
+    return primary
 
 
-SQLITE_PATH = _ensure_dir(_choose_sqlite_path())
+# Paths are plain values: nothing is opened or created until the store is first used.
+SQLITE_PATH = _primary_sqlite_path()
 JSONL_PATH = _choose_jsonl_path()
+PARTITION_DIR = SQLITE_PATH.parent / "partitions"
+ROLLUP_PATH = SQLITE_PATH.parent / "rollups.db"
+SNAPSHOT_PATH = SQLITE_PATH.with_name(SQLITE_PATH.name + ".snapshot")
+# How often the SQLite store snapshots its in-memory state for fast restarts; 0 disables.
+SNAPSHOT_INTERVAL = float(os.getenv("HCAI_SNAPSHOT_INTERVAL_SECONDS", "300"))
+# Several API worker processes on one events.db: memory follows the table instead of
+# each worker's own ingest. On by default when uvicorn/gunicorn run more than one worker.
+SHARED_STORE = os.getenv("HCAI_SHARED_STORE", "").lower() in ("1", "true", "yes") or (
+    int(os.getenv("WEB_CONCURRENCY", "1") or 1) > 1
+)
+# Samples kept per (metric_name, source_id) in the hot-series ring buffers, and how far
+# back the buffers are filled from the store at startup.
+HOT_SERIES_CAPACITY = int(os.getenv("HCAI_HOT_SERIES_CAPACITY", str(DEFAULT_CAPACITY)))
+HOT_SERIES_SEED = timedelta(minutes=float(os.getenv("HCAI_HOT_SERIES_SEED_MINUTES", "60")))
+# Metric/error-log correlations kept by the streaming correlator (seeded from the same window).
+CORRELATION_FINDINGS = int(os.getenv("HCAI_CORRELATION_FINDINGS", str(DEFAULT_FINDINGS)))
+# Opt back into copying a fuller legacy repo database over the primary on first use.
+MIGRATE_ON_START = os.getenv("HCAI_MIGRATE_LEGACY_STORAGE", "").lower() in ("1", "true", "yes")
 
-# Prefer SQLite for durability and querying; fall back gracefully to JSONL or in-memory.
-try:
-    event_store = SQLiteEventStore(SQLITE_PATH)
-except Exception:  # pragma: no cover
+LEGACY_SQLITE_PATHS = (
+    ROOT_DIR / "storage" / "events.db",
+    ROOT_DIR / "backend" / "storage" / "events.db",
+)
+
+
+def migrate_legacy_storage(primary: Path = SQLITE_PATH) -> Optional[Path]:
+    """
+    Copy the legacy repo database with the most rows over primary if it holds more rows
+    than primary does. Returns the copied path, or None if primary was kept. Run it
+    (e.g. `hcai migrate-storage`) before the event store is first used in this process.
+    """
+    if event_store.initialized and primary == SQLITE_PATH:
+        raise RuntimeError("the event store is already open; migrate before first use")
+    _ensure_dir(primary)
+    row_counts = {p: _sqlite_row_count(p) for p in (primary, *LEGACY_SQLITE_PATHS)}
+    best_path = max(row_counts, key=row_counts.get)
+    if best_path == primary or row_counts[best_path] <= row_counts.get(primary, 0):
+        return None
+    shutil.copy2(best_path, primary)
+    return best_path
+
+
+def _build_event_store() -> EventStore:
+    # Prefer SQLite for durability and querying; fall back gracefully to JSONL or in-memory.
+    # HCAI_EVENT_STORE=columnar selects the NumPy-backed in-memory store for large working sets.
+    # HCAI_EVENT_STORE=partitioned writes one SQLite file per event_type and day (or hour) with
+    # HCAI_RETENTION TTLs in days, e.g. "metric=7,log=30,*=90".
+    if EVENT_STORE_MODE == "columnar":
+        return ColumnarEventStore()
+    if EVENT_STORE_MODE == "partitioned":
+        ttls, default_ttl = parse_ttls(os.getenv("HCAI_RETENTION", ""))
+        return PartitionedSQLiteEventStore(
+            PARTITION_DIR,
+            granularity=os.getenv("HCAI_PARTITION_GRANULARITY", "day"),
+            ttls=ttls,
+            default_ttl=default_ttl,
+        )
     try:
-        event_store = PersistentEventStore(JSONL_PATH)
-    except Exception:
-        event_store = EventStore()
+        store = SQLiteEventStore(
+            _ensure_dir(SQLITE_PATH),
+            hot_window=HOT_WINDOW,
+            hot_bytes=HOT_BYTES,
+            snapshot_path=SNAPSHOT_PATH if SNAPSHOT_INTERVAL > 0 else None,
+            snapshot_interval=SNAPSHOT_INTERVAL,
+            shared=SHARED_STORE,
+        )
+        if SNAPSHOT_INTERVAL > 0:
+            atexit.register(store.close)
+        return store
+    except Exception:  # pragma: no cover
+        try:
+            return PersistentEventStore(
+                _ensure_dir(JSONL_PATH), max_segment_bytes=JSONL_SEGMENT_BYTES, hot_window=HOT_WINDOW
+            )
+        except Exception:
+            return EventStore()
+
+
+_storage_lock = threading.Lock()
+_Storage = Tuple[
+    EventStore, RollupStore, Optional[HotSeriesCache], Optional[StreamingCorrelator], Optional[LogRateDetector]
+]
+_storage: Optional[_Storage] = None
+
+
+def _init_storage() -> _Storage:
+    """
+    Build the event store, its rollups, hot-series buffers, streaming correlator and
+    error-rate detector together, once, on first use of any.
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if MIGRATE_ON_START:
+                try:
+                    migrate_legacy_storage()
+                except Exception:
+                    # If copy fails, fall back to primary (may be empty).
+                    pass
+            store = _build_event_store()
+            # 1m/5m/1h metric rollups next to events.db, fed by every add_events call.
+            try:
+                rollup_store = RollupStore(_ensure_dir(ROLLUP_PATH))
+            except Exception:  # pragma: no cover
+                rollup_store = RollupStore(None)
+            store.add_listener(rollup_store.add_events)
+            if rollup_store.empty or rollup_store.backfill_pending:
+                # First run with rollups enabled: one process folds the history that is
+                # already stored, in batches on a background thread; listeners cover what
+                # is newer than the fold's end.
+                rollup_store.start_backfill(store, datetime.now(timezone.utc))
+            hot = correlator = rates = None
+            if not SHARED_STORE:
+                # Shared workers never see each other's ingest through listeners.
+                hot = HotSeriesCache(HOT_SERIES_CAPACITY)
+                correlator = StreamingCorrelator(capacity=CORRELATION_FINDINGS)
+                rates = LogRateDetector()
+                recent = store.iter_range(datetime.now(timezone.utc) - HOT_SERIES_SEED)
+                for batch in iter(lambda: list(islice(recent, 10_000)), []):
+                    hot.add_events(batch)
+                    correlator.add_events(batch)
+                    rates.add_events(batch)
+                store.add_listener(hot.add_events)
+                store.add_listener(correlator.add_events)
+                store.add_listener(rates.add_events)
+            _storage = (store, rollup_store, hot, correlator, rates)
+        return _storage
+
+
+def _event_store() -> EventStore:
+    return _init_storage()[0]
+
+
+def _rollups() -> RollupStore:
+    return _init_storage()[1]
+
+
+def hot_series() -> Optional[HotSeriesCache]:
+    """
+    Ring buffers of the latest samples per series, fed by the global event store; None
+    in shared mode, where callers fall back to reading the store.
+    """
+    return _init_storage()[2]
+
+
+def stream_correlator() -> Optional[StreamingCorrelator]:
+    """
+    Correlations found as events arrive, fed by the global event store; None in shared
+    mode, where callers run CorrelationEngine over the store instead.
+    """
+    return _init_storage()[3]
+
+
+def log_rates() -> Optional[LogRateDetector]:
+    """
+    Per-source error rates against their baselines, fed by the global event store; None
+    in shared mode, where callers build a detector from the store's recent logs instead.
+    """
+    return _init_storage()[4]
+
+
+# Importing hcai_ops.analytics has no I/O: the stores open on first attribute access.
+event_store: EventStore = LazyProxy(_event_store)  # type: ignore[assignment]
+rollups: RollupStore = LazyProxy(_rollups)  # type: ignore[assignment]
+# Running per-series metric stats; callers sync() it with event_store, which folds only the
+# events added since the last call (see EventStore.changes_since).
+metric_stats = StreamingMetricAggregator()
 
 __all__ = [
     "event_store",
     "EventStore",
     "PersistentEventStore",
     "SQLiteEventStore",
+    "ColumnarEventStore",
+    "PartitionedSQLiteEventStore",
+    "LazyProxy",
+    "migrate_legacy_storage",
     "SQLITE_PATH",
     "JSONL_PATH",
+    "PARTITION_DIR",
+    "ROLLUP_PATH",
+    "SNAPSHOT_PATH",
+    "rollups",
+    "RollupStore",
+    "hot_series",
+    "HotSeriesCache",
+    "log_rates",
+    "LogRateDetector",
+    "metric_stats",
+    "stream_correlator",
+    "StreamingCorrelator",
+    "StreamingMetricAggregator",
 ]
@@ -0,0 +1,300 @@
+"""
+Running per-series metric statistics, maintained as events arrive.
+
+StreamingMetricAggregator keeps, for every (metric_name, source_id) series, the
+count/min/max/last and a Welford mean and variance over all history, plus optional
+sliding windows (e.g. the last 5 minutes) kept as fixed-width bucket counters. It follows
+a store through the store's change feed (EventStore.changes_since), so a summary costs
+O(new events + series) instead of a pass over every stored event.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.analytics.timeutil import coerce_epoch_us, from_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+# Sliding windows in seconds, and how many buckets each is split into. A window read
+# includes the whole oldest bucket, so it may reach back up to one bucket further.
+DEFAULT_WINDOWS: Dict[str, int] = {"5m": 300, "1h": 3600}
+WINDOW_BUCKETS = 60
+
+# (metric_name, source_id)
+SeriesKey = Tuple[str, str]
+
+
+def _as_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class RunningStats:
+    """All-history statistics of one series; mean and variance by Welford's method."""
+
+    __slots__ = ("count", "total", "mean", "m2", "low", "high", "last", "last_ts")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+        self.last: Optional[float] = None
+        self.last_ts: Optional[int] = None
+
+    def add(self, value: float, ts_us: Optional[int]) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+        if ts_us is None or self.last_ts is None or ts_us >= self.last_ts:
+            self.last = value
+            self.last_ts = ts_us
+
+    @classmethod
+    def from_sums(
+        cls, count: int, total: float, total_sq: float, low: float, high: float, last: float, last_ts: Optional[int]
+    ) -> "RunningStats":
+        """Stats seeded from SQL aggregates of a series (count, sums, extremes, latest value)."""
+        stats = cls()
+        stats.count, stats.total, stats.low, stats.high = count, total, low, high
+        stats.last, stats.last_ts = last, last_ts
+        stats.mean = total / count
+        stats.m2 = max(total_sq - total * stats.mean, 0.0)
+        return stats
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else 0.0
+
+
+class _WindowBucket:
+    __slots__ = ("count", "total", "total_sq", "low", "high")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+
+
+class StreamingMetricAggregator:
+    """
+    MetricAggregator results kept current incrementally.
+
+    add_events() folds samples in; sync(store) catches up with a store through its change
+    feed and rebuilds from a full scan only when the feed cannot say what changed (first
+    use, a different store, a reset or truncation, or a consumer that fell behind the
+    change log). A rebuild scans with the store's writes paused (writes_paused), so the
+    seq it records is exactly the scan's; ingest waits for it to finish. On a SQLite
+    store with typed columns the all-history stats come from SQL aggregates and only the
+    longest window is scanned.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, int]] = None, buckets: int = WINDOW_BUCKETS) -> None:
+        self.windows = dict(DEFAULT_WINDOWS if windows is None else windows)
+        self._widths_us = {name: max(1, seconds * 1_000_000 // buckets) for name, seconds in self.windows.items()}
+        self._lock = threading.RLock()
+        self._series: Dict[SeriesKey, RunningStats] = {}
+        # window name -> series -> bucket start epoch-us -> counters
+        self._buckets: Dict[str, Dict[SeriesKey, Dict[int, _WindowBucket]]] = {name: {} for name in self.windows}
+        self._store: Optional[EventStore] = None
+        self.seq: Optional[int] = None
+        self.folded_samples = 0
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------------ writes
+    def add_events(self, events: Iterable[HCaiEvent], now_us: Optional[int] = None) -> None:
+        """Fold metric samples into the running and windowed stats; other events are ignored."""
+        self._fold(events, now_us, running=True)
+
+    def _fold(self, events: Iterable[HCaiEvent], now_us: Optional[int], running: bool) -> None:
+        now_us = _now_us() if now_us is None else now_us
+        cutoffs = {name: self._window_start(name, now_us) for name in self.windows}
+        folded = 0
+        with self._lock:
+            series = self._series
+            for e in events:
+                if e.metric_name is None:
+                    continue
+                value = _as_float(e.metric_value)
+                if value is None:
+                    continue
+                key = (e.metric_name, e.source_id)
+                ts_us = coerce_epoch_us(e.timestamp)
+                if running:
+                    stats = series.get(key)
+                    if stats is None:
+                        stats = series[key] = RunningStats()
+                    stats.add(value, ts_us)
+                    folded += 1
+                if ts_us is None:
+                    continue
+                for name, width_us in self._widths_us.items():
+                    if ts_us < cutoffs[name]:
+                        continue
+                    per_series = self._buckets[name].setdefault(key, {})
+                    start = ts_us - ts_us % width_us
+                    bucket = per_series.get(start)
+                    if bucket is None:
+                        # A new bucket is the moment to drop expired ones, so memory stays
+                        # bounded per series even when nobody reads this window.
+                        for old in [old for old in per_series if old < cutoffs[name]]:
+                            del per_series[old]
+                        bucket = per_series[start] = _WindowBucket()
+                    bucket.add(value)
+            self.folded_samples += folded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series = {}
+            self._buckets = {name: {} for name in self.windows}
+            self._store = None
+            self.seq = None
+
+    def sync(self, store: EventStore) -> "StreamingMetricAggregator":
+        """Catch up with store's changes (rebuilding if needed); returns self for chaining."""
+        with self._lock:
+            if self._store is store and self.seq is not None:
+                batch = store.changes_since(self.seq)
+                if batch.complete:
+                    if batch.events:
+                        self.add_events(batch.events)
+                    self.seq = batch.seq
+                    return self
+            self.clear()
+            with store.writes_paused() as seq:
+                rows = store.metric_series() if isinstance(store, SQLiteEventStore) else None
+                if rows is None:
+                    self.add_events(store.iter_range())
+                else:
+                    self._seed(store, rows)
+            self._store, self.seq = store, seq
+            self.rebuilds += 1
+        return self
+
+    def _seed(self, store: EventStore, rows: List[tuple]) -> None:
+        """Running stats from SQLiteEventStore.metric_series(); windows from a scan of the longest one."""
+        for name, source, count, total, total_sq, low, high, last, last_ts in rows:
+            self._series[(name, source)] = RunningStats.from_sums(count, total, total_sq, low, high, last, last_ts)
+            self.folded_samples += count
+        if self.windows:
+            now_us = _now_us()
+            start_us = min(self._window_start(name, now_us) for name in self.windows)
+            self._fold(store.iter_range(from_epoch_us(start_us)), now_us, running=False)
+
+    # ------------------------------------------------------------------- reads
+    def summary(self, window: Optional[str] = None, now_us: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """
+        MetricAggregator-shaped summary, {"metric:source": count/min/max/avg}, in first-seen
+        order. window names one of self.windows; None covers all history.
+        """
+        return {
+            f"{metric_name}:{source_id}": {key: stats[key] for key in ("count", "min", "max", "avg")}
+            for (metric_name, source_id), stats in self._rows(window, now_us)
+        }
+
+    def series_stats(self, window: Optional[str] = None, now_us: Optional[int] = None) -> List[dict]:
+        """Per-series rows with count/min/max/avg/stddev (and last over all history)."""
+        return [
+            {"metric_name": metric_name, "source_id": source_id, **stats}
+            for (metric_name, source_id), stats in self._rows(window, now_us)
+        ]
+
+    def _rows(self, window: Optional[str], now_us: Optional[int]) -> List[Tuple[SeriesKey, dict]]:
+        if window is None:
+            with self._lock:
+                return [
+                    (
+                        key,
+                        {
+                            "count": s.count,
+                            "min": s.low,
+                            "max": s.high,
+                            "avg": s.total / s.count,
+                            "stddev": math.sqrt(s.variance),
+                            "last": s.last,
+                        },
+                    )
+                    for key, s in self._series.items()
+                ]
+        if window not in self.windows:
+            raise ValueError(f"window must be one of {list(self.windows)}")
+        cutoff = self._window_start(window, _now_us() if now_us is None else now_us)
+        rows = []
+        with self._lock:
+            per_window = self._buckets[window]
+            for key in self._series:
+                per_series = per_window.get(key)
+                if not per_series:
+                    continue
+                for start in [start for start in per_series if start < cutoff]:
+                    del per_series[start]
+                if not per_series:
+                    del per_window[key]
+                    continue
+                buckets = per_series.values()
+                count = sum(b.count for b in buckets)
+                total = sum(b.total for b in buckets)
+                mean = total / count
+                variance = max(sum(b.total_sq for b in buckets) / count - mean * mean, 0.0)
+                rows.append(
+                    (
+                        key,
+                        {
+                            "count": count,
+                            "min": min(b.low for b in buckets),
+                            "max": max(b.high for b in buckets),
+                            "avg": mean,
+                            "stddev": math.sqrt(variance),
+                        },
+                    )
+                )
+        return rows
+
+    def _window_start(self, window: str, now_us: int) -> int:
+        """Start of the oldest bucket that still overlaps the window ending at now_us."""
+        width_us = self._widths_us[window]
+        start = now_us - self.windows[window] * 1_000_000
+        return start - start % width_us
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "window_buckets": {
+                    name: sum(len(b) for b in per_window.values()) for name, per_window in self._buckets.items()
+                },
+                "seq": self.seq,
+                "folded_samples": self.folded_samples,
+                "rebuilds": self.rebuilds,
+            }
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1_000
@@ -1,49 +1,202 @@
-from dataclasses import asdict
+import json
 from datetime import UTC, datetime, timedelta
-from typing import List
+from typing import Iterable, List, Optional, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
+from hcai_ops.analytics.columnar import analysis_view
 from hcai_ops.analytics.store import EventStore
 from hcai_ops.analytics.processors import (
-    MetricAggregator,
-    LogAnomalyDetector,
     CorrelationEngine,
     MetricThresholdDetector,
 )
-from hcai_ops.analytics import event_store
+from hcai_ops.analytics import HOT_SERIES_SEED, event_store, hot_series, log_rates, metric_stats, rollups
+from hcai_ops.analytics.aggregates import StreamingMetricAggregator
+from hcai_ops.analytics.downsample import METHODS, downsample
+from hcai_ops.analytics.hotseries import HotSeriesCache
+from hcai_ops.analytics.kernels import event_columns
+from hcai_ops.analytics.lograte import LogRateDetector
+from hcai_ops.analytics.rollups import (
+    DEFAULT_MAX_POINTS,
+    TIERS,
+    RollupStore,
+    iter_raw_points,
+    iter_raw_rows,
+    pick_tier,
+    points,
+    raw_points,
+)
+from hcai_ops.analytics.timeutil import to_epoch_us
 
 router = APIRouter(prefix="/analytics")
 
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(request: Optional[Request]) -> bool:
+    """True when the client asked for newline-delimited JSON in its Accept header."""
+    return request is not None and NDJSON in request.headers.get("accept", "")
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def ndjson_response(rows: Iterable[dict], batch: int = 256) -> StreamingResponse:
+    """
+    Stream rows as one JSON document per line. Rows are pulled from the iterable as the
+    client reads, in batches of `batch` lines, so memory stays flat however large the result.
+    """
+
+    def body():
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, default=_json_default))
+            if len(lines) >= batch:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON)
+
 
 def get_store() -> EventStore:
     return event_store
 
 
+def get_metric_stats() -> StreamingMetricAggregator:
+    return metric_stats
+
+
 @router.get("/summary")
-def get_summary(store: EventStore = Depends(get_store)) -> dict:
-    aggregator = MetricAggregator()
-    return aggregator.aggregate(store.all())
+def get_summary(
+    window: Optional[str] = None,
+    store: EventStore = Depends(get_store),
+    running: StreamingMetricAggregator = Depends(get_metric_stats),
+) -> dict:
+    """
+    count/min/max/avg per "metric:source", from running stats kept current with the
+    store's change feed. window ("5m" or "1h") limits it to recent samples.
+    """
+    if window is not None and window not in running.windows:
+        raise HTTPException(status_code=400, detail=f"window must be one of {list(running.windows)}")
+    return running.sync(store).summary(window)
+
+
+def get_rollups() -> RollupStore:
+    return rollups
+
+
+@router.get("/timeseries", response_model=None)
+def get_timeseries(
+    minutes: int = 60,
+    metric_name: Optional[str] = None,
+    source_id: Optional[str] = None,
+    resolution: Optional[int] = None,
+    store: EventStore = Depends(get_store),
+    rollup_store: RollupStore = Depends(get_rollups),
+    request: Request = None,
+    max_points: Optional[int] = None,
+    step: Optional[int] = None,
+    method: str = "lttb",
+) -> Union[List[dict], StreamingResponse]:
+    """
+    Raw events of the last `minutes`. With metric_name and/or resolution (seconds) it
+    returns metric points instead, read from the coarsest rollup tier that still meets
+    the resolution (or keeps the window under ~720 points), falling back to raw samples.
+
+    max_points and/or step (seconds) downsample each (metric_name, source_id) series on
+    the server: method "lttb" keeps at most max_points representative points, "minmax"
+    merges them into step-wide buckets with count/min/max/avg. With
+    `Accept: application/x-ndjson` the rows are streamed one per line instead.
+    """
+    end = datetime.now(UTC)
+    cutoff = end - timedelta(minutes=minutes)
+    stream = wants_ndjson(request)
+    reduce = max_points is not None or step is not None
+    if metric_name is None and resolution is None and not reduce:
+        if stream:
+            return ndjson_response(e.to_dict() for e in store.iter_range(cutoff))
+        return [e.to_dict() for e in store.since(cutoff)]
+    if method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {list(METHODS)}")
+    fine = resolution or step
+    if max_points is not None:
+        max_points = max(3, min(max_points, 10_000))
+    tier = pick_tier(
+        cutoff, end, timedelta(seconds=fine) if fine else None, max_points or DEFAULT_MAX_POINTS, rollup_store.ttls, end
+    )
+    if not reduce:
+        if tier is None:
+            if stream:
+                samples = store.iter_range(cutoff, metric_name=metric_name, source_id=source_id)
+                return ndjson_response(iter_raw_points(samples))
+            return raw_points(store.range(cutoff, metric_name=metric_name, source_id=source_id))
+        result = rollup_store.series(metric_name, tier, cutoff, source_id=source_id)
+        return ndjson_response(result) if stream else result
+
+    if tier is None:
+        rows = sorted(
+            iter_raw_rows(store.iter_range(cutoff, metric_name=metric_name, source_id=source_id)),
+            key=lambda row: (row[0], row[1]),
+        )
+        width = 0
+    else:
+        rows = rollup_store.series_rows(metric_name, tier, cutoff, source_id=source_id)
+        width = TIERS[tier]
+    rows, bucket_width = downsample(
+        rows,
+        method=method,
+        max_points=max_points,
+        step_us=step * 1_000_000 if step else None,
+        window_us=to_epoch_us(end) - to_epoch_us(cutoff),
+    )
+    result = points(rows, max(width, bucket_width or 0))
+    return ndjson_response(result) if stream else result
+
+
+def get_hot_series() -> Optional[HotSeriesCache]:
+    return hot_series()
+
+
+def get_log_rates() -> Optional[LogRateDetector]:
+    return log_rates()
 
 
-@router.get("/timeseries")
-def get_timeseries(minutes: int = 60, store: EventStore = Depends(get_store)) -> List[dict]:
-    cutoff = datetime.now(UTC) - timedelta(minutes=minutes)
-    events = store.since(cutoff)
-    return [asdict(e) for e in events]
+def recent_log_rates(store: EventStore) -> LogRateDetector:
+    """A LogRateDetector over the store's recent logs, for when no live one is kept (shared mode)."""
+    detector = LogRateDetector()
+    detector.add_events(store.iter_range(datetime.now(UTC) - HOT_SERIES_SEED, event_type="log"))
+    return detector
 
 
 @router.get("/anomalies")
-def get_anomalies(store: EventStore = Depends(get_store)) -> List[dict]:
-    events = store.all()
-    log_detector = LogAnomalyDetector()
+def get_anomalies(
+    store: EventStore = Depends(get_store),
+    hot: Optional[HotSeriesCache] = Depends(get_hot_series),
+    rates: Optional[LogRateDetector] = Depends(get_log_rates),
+) -> List[dict]:
+    """Per-source error-log rates against their baselines, then metric threshold findings."""
+    log_anomalies = (rates or recent_log_rates(store)).detect()
     metric_detector = MetricThresholdDetector()
-    log_anomalies = log_detector.detect(events)
-    metric_anomalies = metric_detector.detect(events)
+    if hot is not None:
+        metric_anomalies = metric_detector.detect_latest(hot)
+    else:
+        metric_anomalies = metric_detector.detect(event_columns(analysis_view(store)))
     return log_anomalies + metric_anomalies
 
 
 @router.get("/correlations")
-def get_correlations(store: EventStore = Depends(get_store)) -> List[dict]:
-    engine = CorrelationEngine()
+def get_correlations(
+    store: EventStore = Depends(get_store),
+    metric_name: Optional[List[str]] = Query(None),
+    log_level: Optional[List[str]] = Query(None),
+) -> List[dict]:
+    """
+    High metric samples paired with a nearby error log of the same source. Repeat
+    metric_name to check only those metrics, and log_level to match other levels than ERROR.
+    """
+    engine = CorrelationEngine(metric_names=metric_name, log_levels=log_level or ("ERROR",))
     return engine.correlate(store.all())
@@ -0,0 +1,516 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from hcai_ops.analytics.store import EventPage, EventStore, LevelFilter, normalize_levels
+from hcai_ops.analytics.timeutil import from_epoch_us, to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+# Fields that are kept per row only when set; everything else lives in columns.
+_REST_FIELDS = (
+    "log_message",
+    "incident_label",
+    "op_user_id",
+    "op_action_type",
+    "alert_id",
+    "recommended_action",
+    "applied_action",
+    "outcome_label",
+)
+
+
+def first_seen_order(codes: np.ndarray) -> np.ndarray:
+    """Unique codes ordered by first appearance, matching dict insertion order in the list-based paths."""
+    uniq, first = np.unique(codes, return_index=True)
+    return uniq[np.argsort(first, kind="stable")]
+
+
+class Vocabulary:
+    """
+    Dictionary encoder mapping hashable values to dense int32 codes.
+    Code 0 is reserved for None.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[Optional[Hashable]] = [None]
+        self._codes: Dict[Optional[Hashable], int] = {None: 0}
+
+    def encode(self, value: Optional[Hashable]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Optional[Hashable]) -> Optional[int]:
+        """Return the code for value, or None if it was never seen."""
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@dataclass
+class EventColumns:
+    """
+    Read-only columnar view of an event batch.
+
+    Timestamps are int64 epoch microseconds (UTC), metric values are float64
+    with NaN for missing values, and string columns are int32 codes into the
+    matching vocabulary list (code 0 means None).
+    """
+
+    timestamps: np.ndarray
+    metric_values: np.ndarray
+    source_ids: np.ndarray
+    event_types: np.ndarray
+    metric_names: np.ndarray
+    log_levels: np.ndarray
+    source_vocab: List[Optional[Hashable]]
+    type_vocab: List[Optional[Hashable]]
+    metric_vocab: List[Optional[Hashable]]
+    level_vocab: List[Optional[Hashable]]
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    def code_mask(self, vocab: List[Optional[Hashable]], predicate) -> np.ndarray:
+        """Evaluate predicate once per vocabulary entry and return a lookup table indexed by code."""
+        return np.fromiter((bool(predicate(v)) for v in vocab), dtype=bool, count=len(vocab))
+
+    def type_code(self, event_type: str) -> int:
+        try:
+            return self.type_vocab.index(event_type)
+        except ValueError:
+            return -1
+
+
+# Column arrays a _Chunk holds and columns() exposes, with their dtypes.
+_COLUMN_DTYPES = (
+    ("timestamps", np.int64),
+    ("metric_values", np.float64),
+    ("source_ids", np.int32),
+    ("event_types", np.int32),
+    ("metric_names", np.int32),
+    ("log_levels", np.int32),
+)
+
+
+class _Chunk:
+    """Fixed-capacity block of column arrays."""
+
+    def __init__(self, capacity: int) -> None:
+        self.size = 0
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.metric_values = np.full(capacity, np.nan, dtype=np.float64)
+        self.source_ids = np.zeros(capacity, dtype=np.int32)
+        self.event_types = np.zeros(capacity, dtype=np.int32)
+        self.metric_names = np.zeros(capacity, dtype=np.int32)
+        self.log_levels = np.zeros(capacity, dtype=np.int32)
+        self.aware = np.zeros(capacity, dtype=np.bool_)
+        # Per-row dict of non-columnar fields; None for bare samples.
+        self.rest: List[Optional[Dict[str, Any]]] = []
+
+    @property
+    def capacity(self) -> int:
+        return int(self.timestamps.shape[0])
+
+
+class ColumnarEventStore(EventStore):
+    """
+    In-memory event store that keeps events as NumPy columns in growable chunks.
+
+    HCaiEvent objects are only materialized when a caller asks for them
+    (all/since/filter); analytics code can read the arrays directly via columns().
+    """
+
+    CHUNK_ROWS = 65536
+
+    def __init__(self, chunk_rows: Optional[int] = None) -> None:
+        self._chunk_rows = chunk_rows or self.CHUNK_ROWS
+        # EventStore.__init__ assigns _events, which resets the columns via the setter below.
+        super().__init__()
+
+    def _reset(self) -> None:
+        self._chunks: List[_Chunk] = []
+        self._sources = Vocabulary()
+        self._types = Vocabulary()
+        self._metrics = Vocabulary()
+        self._levels = Vocabulary()
+        self._count = 0
+        self._columns_cache: Optional[EventColumns] = None
+        # Contiguous copies of every column for columns(); rows are only ever appended, so
+        # each refresh copies just the rows written since the last one.
+        self._flat = {name: np.zeros(0, dtype=dtype) for name, dtype in _COLUMN_DTYPES}
+        self._flat_rows = 0
+        self._time_order: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # ------------------------------------------------------------------ writes
+    def add_events(self, events: List[HCaiEvent]) -> None:
+        """Append events to the columns."""
+        if not events:
+            return
+        with self._write_lock:
+            self._append(events)
+            self._record_changes(events)
+        self._call_listeners(events)
+
+    def _append(self, events: List[HCaiEvent]) -> None:
+        offset = 0
+        while offset < len(events):
+            if not self._chunks or self._chunks[-1].size >= self._chunks[-1].capacity:
+                self._chunks.append(_Chunk(self._chunk_rows))
+            chunk = self._chunks[-1]
+            take = min(chunk.capacity - chunk.size, len(events) - offset)
+            self._fill(chunk, events[offset : offset + take])
+            offset += take
+        self._count += len(events)
+        self._columns_cache = None
+        self._time_order = None
+
+    def _fill(self, chunk: _Chunk, batch: List[HCaiEvent]) -> None:
+        start, end = chunk.size, chunk.size + len(batch)
+        ts_col, value_col, aware_col = [], [], []
+        src_col, type_col, metric_col, level_col = [], [], [], []
+        encode_src, encode_type = self._sources.encode, self._types.encode
+        encode_metric, encode_level = self._metrics.encode, self._levels.encode
+        for event in batch:
+            rest: Optional[Dict[str, Any]] = None
+            ts = event.timestamp
+            if isinstance(ts, datetime):
+                ts_col.append(to_epoch_us(ts))
+                aware_col.append(ts.tzinfo is not None)
+            else:
+                ts_col.append(0)
+                aware_col.append(False)
+                rest = {"timestamp": ts}
+            value = event.metric_value
+            if value is None:
+                value_col.append(np.nan)
+            else:
+                try:
+                    value_col.append(float(value))
+                except (TypeError, ValueError):
+                    value_col.append(np.nan)
+                if type(value) is not float:
+                    # Keep the original object so materialization round-trips exactly.
+                    rest = rest or {}
+                    rest["metric_value"] = value
+            src_col.append(encode_src(event.source_id))
+            type_col.append(encode_type(event.event_type))
+            metric_col.append(encode_metric(event.metric_name))
+            level_col.append(encode_level(event.log_level))
+            for name in _REST_FIELDS:
+                field_value = getattr(event, name)
+                if field_value is not None:
+                    rest = rest or {}
+                    rest[name] = field_value
+            if event.has_extras:
+                rest = rest or {}
+                rest["extras"] = event.extras
+            chunk.rest.append(rest)
+
+        chunk.timestamps[start:end] = ts_col
+        chunk.metric_values[start:end] = value_col
+        chunk.aware[start:end] = aware_col
+        chunk.source_ids[start:end] = src_col
+        chunk.event_types[start:end] = type_col
+        chunk.metric_names[start:end] = metric_col
+        chunk.log_levels[start:end] = level_col
+        chunk.size = end
+
+    # ------------------------------------------------------------------- reads
+    def __len__(self) -> int:
+        return self._count
+
+    def columns(self) -> EventColumns:
+        """Return a columnar view over every stored event (cached until the next write)."""
+        with self._write_lock:
+            if self._columns_cache is None:
+                self._flatten()
+                count = self._count
+                self._columns_cache = EventColumns(
+                    **{name: self._flat[name][:count] for name, _ in _COLUMN_DTYPES},
+                    source_vocab=list(self._sources.values),
+                    type_vocab=list(self._types.values),
+                    metric_vocab=list(self._metrics.values),
+                    level_vocab=list(self._levels.values),
+                )
+            return self._columns_cache
+
+    def _flatten(self) -> None:
+        """Copy the rows written since the last call into the flat buffers, growing them geometrically."""
+        count, flat = self._count, self._flat
+        capacity = flat["timestamps"].shape[0]
+        if count > capacity:
+            # Views handed out earlier keep the old buffers, whose rows never change.
+            capacity = max(count, 2 * capacity)
+            for name, dtype in _COLUMN_DTYPES:
+                grown = np.empty(capacity, dtype=dtype)
+                grown[: self._flat_rows] = flat[name][: self._flat_rows]
+                flat[name] = grown
+        row = self._flat_rows
+        while row < count:
+            chunk = self._chunks[row // self._chunk_rows]
+            offset = row % self._chunk_rows
+            take = chunk.size - offset
+            for name, _ in _COLUMN_DTYPES:
+                flat[name][row : row + take] = getattr(chunk, name)[offset : chunk.size]
+            row += take
+        self._flat_rows = count
+
+    def _materialize(self, chunk: _Chunk, row: int) -> HCaiEvent:
+        rest = chunk.rest[row]
+        value = chunk.metric_values[row]
+        data: Dict[str, Any] = {
+            "timestamp": from_epoch_us(chunk.timestamps[row], bool(chunk.aware[row])),
+            "source_id": self._sources.values[chunk.source_ids[row]],
+            "event_type": self._types.values[chunk.event_types[row]],
+            "metric_name": self._metrics.values[chunk.metric_names[row]],
+            "metric_value": None if np.isnan(value) else float(value),
+            "log_level": self._levels.values[chunk.log_levels[row]],
+        }
+        if rest:
+            data.update(rest)
+        return HCaiEvent(**data)
+
+    def _materialize_rows(self, rows: np.ndarray) -> List[HCaiEvent]:
+        """Build HCaiEvent objects for global row numbers, in the order given."""
+        out: List[HCaiEvent] = []
+        rows_per_chunk = self._chunk_rows
+        for row in rows.tolist():
+            out.append(self._materialize(self._chunks[row // rows_per_chunk], row % rows_per_chunk))
+        return out
+
+    def all(self) -> List[HCaiEvent]:
+        """Materialize every stored event."""
+        out: List[HCaiEvent] = []
+        for chunk in self._chunks:
+            out.extend(self._materialize(chunk, row) for row in range(chunk.size))
+        return out
+
+    def since(self, dt: datetime) -> List[HCaiEvent]:
+        """Return events occurring at or after the provided datetime, in time order."""
+        return self.range(dt)
+
+    def _sorted_by_time(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row numbers in time order, their timestamps), cached until the next write."""
+        if self._time_order is None:
+            timestamps = self.columns().timestamps
+            order = np.argsort(timestamps, kind="stable")
+            self._time_order = (order, timestamps[order])
+        return self._time_order
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Events with start <= timestamp < end, located with searchsorted on the sorted timestamps."""
+        return self._materialize_rows(self._range_rows(start, end, source_id, event_type, metric_name, log_level))
+
+    def _range_rows(self, start, end, source_id, event_type, metric_name, log_level) -> np.ndarray:
+        """Row numbers of the matching events in [start, end), in time order."""
+        order, timestamps = self._sorted_by_time()
+        lo = int(np.searchsorted(timestamps, to_epoch_us(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, to_epoch_us(end), side="left")) if end is not None else len(order)
+        rows = order[lo:hi]
+        if source_id is not None or event_type is not None or metric_name is not None or log_level is not None:
+            rows = rows[self._mask(source_id, event_type, metric_name, log_level)[rows]]
+        return rows
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """range() with the matching rows picked up front and materialized one at a time."""
+        rows = self._range_rows(start, end, source_id, event_type, metric_name, log_level)
+        chunks, rows_per_chunk = self._chunks, self._chunk_rows
+        for row in rows.tolist():
+            yield self._materialize(chunks[row // rows_per_chunk], row % rows_per_chunk)
+
+    def _mask(
+        self,
+        source_id: Optional[str],
+        event_type: Optional[str],
+        metric_name: Optional[str],
+        log_level: LevelFilter,
+        window: slice = slice(None),
+    ) -> np.ndarray:
+        """Boolean mask of matching rows, over all rows or just the rows in window."""
+        cols = self.columns()
+        size = len(range(*window.indices(len(cols))))
+        mask = np.ones(size, dtype=bool)
+        for vocab, column, value in (
+            (self._sources, cols.source_ids, source_id),
+            (self._types, cols.event_types, event_type),
+            (self._metrics, cols.metric_names, metric_name),
+        ):
+            if value is None:
+                continue
+            code = vocab.lookup(value)
+            if code is None:
+                return np.zeros(size, dtype=bool)
+            mask &= column[window] == code
+        levels = normalize_levels(log_level)
+        if levels is not None:
+            wanted = cols.code_mask(cols.level_vocab, lambda v: v is not None and str(v).upper() in levels)
+            mask &= wanted[cols.log_levels[window]]
+        return mask
+
+    def filter(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Filter events by optional source_id, event_type, metric_name and log level(s)."""
+        return self._materialize_rows(np.flatnonzero(self._mask(source_id, event_type, metric_name, log_level)))
+
+    def tail(
+        self,
+        limit: Optional[int] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Iterate matching events newest-first, materializing only the rows returned."""
+        rows = np.flatnonzero(self._mask(source_id, event_type, metric_name, log_level))[::-1]
+        if limit is not None:
+            rows = rows[:limit]
+        return iter(self._materialize_rows(rows))
+
+    def page(
+        self,
+        limit: int = 100,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> EventPage:
+        """
+        Keyset page over row numbers (see EventStore.page), masking a window of rows
+        after or before the cursor at a time instead of the whole store.
+        """
+        total = len(self)
+        step = max(4 * limit, 4096)
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        picked: List[int] = []
+        ascending = after_id is not None
+        lo = hi = 0
+        if ascending:
+            hi = max(0, after_id)
+        else:
+            lo = min(total, before_id - 1) if before_id is not None else total
+        while len(picked) <= limit:
+            if ascending:
+                lo, hi = hi, min(total, hi + step)
+            else:
+                lo, hi = max(0, lo - step), lo
+            if lo >= hi:
+                break
+            window = slice(lo, hi)
+            mask = self._mask(source_id, event_type, metric_name, log_level, window)
+            if start_us is not None or end_us is not None:
+                stamps = self.columns().timestamps[window]
+                if start_us is not None:
+                    mask &= stamps >= start_us
+                if end_us is not None:
+                    mask &= stamps < end_us
+            rows = lo + np.flatnonzero(mask)
+            picked.extend((rows if ascending else rows[::-1]).tolist())
+        more = len(picked) > limit
+        picked = picked[:limit]
+        events = self._materialize_rows(np.asarray(picked, dtype=np.int64))
+        items = [(row + 1, event) for row, event in zip(picked, events)]
+        return items, (items[-1][0] if more else None)
+
+    def count(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> int:
+        return int(np.count_nonzero(self._mask(source_id, event_type, metric_name, log_level)))
+
+    def last_seen(self) -> Dict[str, datetime]:
+        cols = self.columns()
+        if not len(cols):
+            return {}
+        latest = np.full(len(cols.source_vocab), np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(latest, cols.source_ids, cols.timestamps)
+        seen: Dict[str, datetime] = {}
+        for code in first_seen_order(cols.source_ids).tolist():
+            seen[cols.source_vocab[code]] = from_epoch_us(latest[code])
+        return seen
+
+    def reload(self) -> int:
+        """No backing storage; returns the number of stored events."""
+        return self._count
+
+    def stats(self) -> dict:
+        nbytes = sum(
+            c.timestamps.nbytes
+            + c.metric_values.nbytes
+            + c.source_ids.nbytes
+            + c.event_types.nbytes
+            + c.metric_names.nbytes
+            + c.log_levels.nbytes
+            + c.aware.nbytes
+            for c in self._chunks
+        )
+        return {
+            "backend": "columnar",
+            "stored_events": self._count,
+            "in_memory": self._count,
+            "chunks": len(self._chunks),
+            "column_bytes": nbytes,
+            "sources": len(self._sources) - 1,
+            "metrics": len(self._metrics) - 1,
+        }
+
+    # Compatibility with callers that reset or inspect the list-based stores.
+    @property
+    def _events(self) -> List[HCaiEvent]:
+        return self.all()
+
+    @_events.setter
+    def _events(self, events: List[HCaiEvent]) -> None:
+        # Like the list stores, assigning rebuilds the columns without touching the change
+        # feed or the listeners; callers that reset the store call mark_reset() themselves.
+        with self._write_lock:
+            self._reset()
+            self._append(list(events))
+
+
+def analysis_view(store: EventStore):
+    """Return the store's columns when it keeps them, otherwise the materialized event list."""
+    if isinstance(store, ColumnarEventStore):
+        return store.columns()
+    return store.all()
@@ -0,0 +1,148 @@
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from hcai_ops.analytics.timeutil import coerce_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+DEFAULT_FINDINGS = 1000
+# Hard cap per source and kind, so a burst inside one window cannot grow state unboundedly.
+DEFAULT_MAX_PER_SOURCE = 10_000
+
+
+class _SourceWindow:
+    __slots__ = ("logs", "samples", "latest_us")
+
+    def __init__(self, max_entries: int) -> None:
+        # (epoch-us, log_message) of matching logs, in arrival order
+        self.logs: Deque[Tuple[int, object]] = deque(maxlen=max_entries)
+        # (epoch-us, event) of high samples that have not found a log yet
+        self.samples: Deque[Tuple[int, HCaiEvent]] = deque(maxlen=max_entries)
+        self.latest_us = 0
+
+    def expire(self, cutoff_us: int) -> None:
+        for entries in (self.logs, self.samples):
+            while entries and entries[0][0] < cutoff_us:
+                entries.popleft()
+
+    def take_samples(self, ts_us: int, window_us: int) -> List[HCaiEvent]:
+        """Remove and return the waiting samples within window_us of ts_us, oldest first."""
+        matched = [event for sample_us, event in self.samples if abs(sample_us - ts_us) <= window_us]
+        if matched:
+            kept = [item for item in self.samples if abs(item[0] - ts_us) > window_us]
+            self.samples = deque(kept, maxlen=self.samples.maxlen)
+        return matched
+
+
+class StreamingCorrelator:
+    """
+    CorrelationEngine over a live event stream, with state bounded by the window.
+
+    Fed like HotSeriesCache, through EventStore.add_listener. Each source keeps a deque of
+    its recent matching logs and of high samples still waiting for one; entries older than
+    the source's newest event minus window_minutes are dropped. A high sample pairs with
+    the first buffered log within +/- window, or with the first such log to arrive later,
+    so on time-ordered input the findings equal CorrelationEngine.correlate()'s. Findings
+    are kept in a ring of the latest `capacity`.
+    """
+
+    def __init__(
+        self,
+        metric_threshold: float = 0.9,
+        window_minutes: int = 5,
+        metric_names: Optional[Iterable[str]] = None,
+        log_levels: Iterable[str] = ("ERROR",),
+        capacity: int = DEFAULT_FINDINGS,
+        max_per_source: int = DEFAULT_MAX_PER_SOURCE,
+    ) -> None:
+        self.metric_threshold = metric_threshold
+        self.window_us = timedelta(minutes=window_minutes) // timedelta(microseconds=1)
+        self.metric_names = None if metric_names is None else frozenset(metric_names)
+        self.log_levels = frozenset(level.upper() for level in log_levels)
+        self.max_per_source = max_per_source
+        self._sources: Dict[object, _SourceWindow] = {}
+        self._findings: Deque[Dict[str, object]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._latest_us = 0
+        self.emitted = 0
+
+    def _is_high(self, event: HCaiEvent) -> bool:
+        if event.metric_name is None or event.metric_value is None:
+            return False
+        if self.metric_names is not None and event.metric_name not in self.metric_names:
+            return False
+        try:
+            return float(event.metric_value) > self.metric_threshold
+        except (TypeError, ValueError):
+            return False
+
+    def add_events(self, events: Iterable[HCaiEvent]) -> List[Dict[str, object]]:
+        """Fold events in arrival order; returns the findings they completed."""
+        window = self.window_us
+        found: List[Dict[str, object]] = []
+        with self._lock:
+            for e in events:
+                is_log = e.event_type == "log" and (e.log_level or "").upper() in self.log_levels
+                if not is_log and not self._is_high(e):
+                    continue
+                ts_us = coerce_epoch_us(e.timestamp)
+                if ts_us is None:
+                    continue
+                state = self._sources.get(e.source_id)
+                if state is None:
+                    state = self._sources[e.source_id] = _SourceWindow(self.max_per_source)
+                if ts_us > state.latest_us:
+                    state.latest_us = ts_us
+                    state.expire(ts_us - window)
+                self._latest_us = max(self._latest_us, ts_us)
+                if is_log:
+                    found.extend(_finding(sample, e.log_message) for sample in state.take_samples(ts_us, window))
+                    state.logs.append((ts_us, e.log_message))
+                    continue
+                message = next((msg for log_us, msg in state.logs if abs(log_us - ts_us) <= window), _NO_MATCH)
+                if message is _NO_MATCH:
+                    state.samples.append((ts_us, e))
+                else:
+                    found.append(_finding(e, message))
+            # Sources that have gone quiet for a whole window hold nothing that can still match.
+            cutoff = self._latest_us - window
+            for source_id in [s for s, state in self._sources.items() if state.latest_us < cutoff]:
+                del self._sources[source_id]
+            self._findings.extend(found)
+            self.emitted += len(found)
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sources = {}
+            self._findings.clear()
+            self._latest_us = 0
+
+    def findings(self) -> List[Dict[str, object]]:
+        """Buffered findings, oldest first (in the order they were completed)."""
+        with self._lock:
+            return list(self._findings)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sources": len(self._sources),
+                "buffered_logs": sum(len(s.logs) for s in self._sources.values()),
+                "pending_samples": sum(len(s.samples) for s in self._sources.values()),
+                "findings": len(self._findings),
+                "capacity": self._findings.maxlen,
+                "emitted": self.emitted,
+            }
+
+
+_NO_MATCH = object()
+
+
+def _finding(sample: HCaiEvent, log_message: object) -> Dict[str, object]:
+    return {
+        "source_id": sample.source_id,
+        "metric": sample.metric_name,
+        "metric_value": sample.metric_value,
+        "log_message": log_message,
+    }
@@ -0,0 +1,161 @@
+"""
+Server-side downsampling of metric series for charts.
+
+Both methods work on rollup-shaped rows (see rollups.Row), sorted by metric, source
+and time, and handle every (metric_name, source_id) series in one vectorized pass:
+
+* ``lttb`` keeps at most max_points of the original points per series, chosen by
+  Largest-Triangle-Three-Buckets so spikes and the overall shape survive.
+* ``minmax`` merges points into fixed-width time buckets, keeping count/sum/min/max/last,
+  so each bucket still reports the true extremes of what it replaced.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hcai_ops.analytics.rollups import Row
+
+METHODS = ("lttb", "minmax")
+
+
+def series_bounds(rows: Sequence[Row]) -> Tuple[np.ndarray, np.ndarray]:
+    """(start, length) of each (metric_name, source_id) run in rows."""
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    names = np.array([r[0] for r in rows], dtype=object)
+    sources = np.array([r[1] for r in rows], dtype=object)
+    change = np.flatnonzero((names[1:] != names[:-1]) | (sources[1:] != sources[:-1])) + 1
+    starts = np.concatenate(([0], change)).astype(np.int64)
+    lengths = np.diff(np.concatenate((starts, [len(rows)])))
+    return starts, lengths
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, starts: np.ndarray, lengths: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Flat indices picked by LTTB for every series (x must be sorted within each series).
+
+    Series of at most n_out points are kept whole. The others are reduced together:
+    each step picks one point from bucket k of every series at once, so the Python loop
+    runs n_out times regardless of how many series there are.
+    """
+    if n_out < 3:
+        raise ValueError("LTTB needs n_out >= 3")
+    keep = lengths <= n_out
+    whole = [np.arange(s, s + n) for s, n in zip(starts[keep].tolist(), lengths[keep].tolist())]
+    starts, lengths = starts[~keep], lengths[~keep]
+    if not len(starts):
+        return np.sort(np.concatenate(whole)) if whole else np.zeros(0, dtype=np.int64)
+
+    # Bucket k of a series covers [lo[k], hi[k]) and is scored against the mean of bucket k+1
+    # (the last point, for the final bucket). Offsets are local to each series.
+    every = (lengths - 2) / (n_out - 2)
+    k = np.arange(n_out - 1)
+    edges = np.floor(k[None, :] * every[:, None]).astype(np.int64) + 1
+    edges = np.minimum(edges, lengths[:, None])
+    edges[:, -1] = lengths - 1
+    lo, hi = edges[:, :-1], edges[:, 1:]
+    next_hi = np.concatenate((edges[:, 2:], lengths[:, None]), axis=1)
+    lo, hi, next_hi = lo + starts[:, None], hi + starts[:, None], next_hi + starts[:, None]
+
+    # Relative x keeps the cumulative sums exact enough for epoch-microsecond timestamps.
+    origin = np.repeat(x[starts], lengths)
+    flat = np.concatenate([np.arange(s, s + n) for s, n in zip(starts.tolist(), lengths.tolist())])
+    xs = np.zeros(len(x))
+    xs[flat] = x[flat] - origin
+    cx = np.concatenate(([0.0], np.cumsum(xs)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    span = next_hi - hi
+    mean_x = (cx[next_hi] - cx[hi]) / span
+    mean_y = (cy[next_hi] - cy[hi]) / span
+
+    picked = np.empty((len(starts), n_out), dtype=np.int64)
+    picked[:, 0] = starts
+    picked[:, -1] = starts + lengths - 1
+    a = starts
+    for b in range(n_out - 2):
+        first, sizes = lo[:, b], hi[:, b] - lo[:, b]
+        offsets = np.cumsum(sizes) - sizes
+        local = np.arange(int(sizes.sum())) - np.repeat(offsets, sizes)
+        idx = np.repeat(first, sizes) + local
+        ax, ay = np.repeat(xs[a], sizes), np.repeat(y[a], sizes)
+        mx, my = np.repeat(mean_x[:, b], sizes), np.repeat(mean_y[:, b], sizes)
+        area = np.abs((ax - mx) * (y[idx] - ay) - (ax - xs[idx]) * (my - ay))
+        best = np.repeat(np.maximum.reduceat(area, offsets), sizes)
+        a = first + np.minimum.reduceat(np.where(area == best, local, np.iinfo(np.int64).max), offsets)
+        picked[:, b + 1] = a
+    return np.sort(np.concatenate(whole + [picked.ravel()]))
+
+
+def minmax_buckets(
+    ts: np.ndarray, starts: np.ndarray, lengths: np.ndarray, step_us: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (segment starts, bucket start epoch-us) for step_us-wide buckets aligned to the epoch,
+    never crossing a series boundary.
+    """
+    bucket = ts - ts % step_us
+    change = np.zeros(len(ts), dtype=bool)
+    change[starts] = True
+    change[1:] |= bucket[1:] != bucket[:-1]
+    segments = np.flatnonzero(change)
+    return segments, bucket[segments]
+
+
+def downsample(
+    rows: Sequence[Row],
+    *,
+    method: str = "lttb",
+    max_points: Optional[int] = None,
+    step_us: Optional[int] = None,
+    window_us: Optional[int] = None,
+) -> Tuple[List[Row], Optional[int]]:
+    """
+    Reduce every series in rows to at most max_points points, or to one point per step_us.
+
+    Returns the reduced rows and, for minmax, the bucket width in seconds they now
+    represent (None when LTTB kept original points). With only max_points, minmax buckets
+    are window_us / max_points wide (the data's own span when no window is given); with
+    only step_us, LTTB keeps one point per step of the window.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {list(METHODS)}")
+    if not rows or (max_points is None and step_us is None):
+        return list(rows), None
+    starts, lengths = series_bounds(rows)
+    ts = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+    if window_us is None:
+        window_us = int(ts.max() - ts.min()) + 1
+    if method == "lttb":
+        n_out = max_points if max_points is not None else -(-window_us // step_us)
+        if step_us is not None and max_points is not None:
+            n_out = min(n_out, -(-window_us // step_us))
+        y = np.fromiter((r[4] / r[3] for r in rows), dtype=np.float64, count=len(rows))
+        picked = lttb_indices(ts.astype(np.float64), y, starts, lengths, max(3, int(n_out)))
+        return [rows[i] for i in picked.tolist()], None
+
+    if step_us is None or (max_points is not None and -(-window_us // max_points) > step_us):
+        step_us = -(-window_us // max_points)
+    step_us = max(1, int(step_us))
+    segments, buckets = minmax_buckets(ts, starts, lengths, step_us)
+    columns = np.array([r[3:] for r in rows], dtype=np.float64)
+    count = np.add.reduceat(columns[:, 0], segments)
+    total = np.add.reduceat(columns[:, 1], segments)
+    total_sq = np.add.reduceat(columns[:, 2], segments)
+    low = np.minimum.reduceat(columns[:, 3], segments)
+    high = np.maximum.reduceat(columns[:, 4], segments)
+    last = columns[np.concatenate((segments[1:], [len(rows)])) - 1, 5]
+    out = [
+        (rows[i][0], rows[i][1], bucket, int(n), *rest)
+        for i, bucket, n, *rest in zip(
+            segments.tolist(),
+            buckets.tolist(),
+            count.tolist(),
+            total.tolist(),
+            total_sq.tolist(),
+            low.tolist(),
+            high.tolist(),
+            last.tolist(),
+        )
+    ]
+    return out, step_us // 1_000_000
@@ -0,0 +1,179 @@
+import math
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from hcai_ops.analytics.timeutil import coerce_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+DEFAULT_CAPACITY = 128
+
+# (metric_name, source_id)
+SeriesKey = Tuple[str, str]
+
+
+def _empty_window() -> Dict[str, Optional[float]]:
+    return {"count": 0, "min": None, "max": None, "avg": None, "last": None}
+
+
+class SeriesRing:
+    """
+    Fixed-size ring of (epoch-us, value) samples for one series, in arrival order.
+
+    The arrays are allocated once; appends overwrite the oldest slot. The newest sample
+    by timestamp is tracked separately, so late arrivals cannot hide the current value.
+    """
+
+    __slots__ = ("timestamps", "values", "head", "size", "latest_ts", "latest_value")
+
+    def __init__(self, capacity: int) -> None:
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.head = 0
+        self.size = 0
+        self.latest_ts: Optional[int] = None
+        self.latest_value: Optional[float] = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self.values)
+
+    def extend(self, timestamps: List[int], values: List[float]) -> None:
+        capacity = self.capacity
+        newest = max(range(len(timestamps)), key=timestamps.__getitem__)
+        if self.latest_ts is None or timestamps[newest] >= self.latest_ts:
+            self.latest_ts, self.latest_value = timestamps[newest], values[newest]
+        if len(values) > capacity:
+            timestamps, values = timestamps[-capacity:], values[-capacity:]
+        slots = (self.head + np.arange(len(values))) % capacity
+        self.timestamps[slots] = timestamps
+        self.values[slots] = values
+        self.head = (self.head + len(values)) % capacity
+        self.size = min(capacity, self.size + len(values))
+
+    def _order(self) -> np.ndarray:
+        """Slot numbers oldest to newest."""
+        return (self.head - self.size + np.arange(self.size)) % self.capacity
+
+    def last(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The n most recent arrivals as (timestamps, values), oldest first."""
+        slots = self._order()[-n:] if n > 0 else self._order()[:0]
+        return self.timestamps[slots], self.values[slots]
+
+    def window(self, since_us: Optional[int] = None) -> Dict[str, Optional[float]]:
+        """count/min/max/avg/last of the buffered samples at or after since_us."""
+        slots = self._order()
+        values = self.values[slots]
+        if since_us is not None:
+            values = values[self.timestamps[slots] >= since_us]
+        if not len(values):
+            return _empty_window()
+        return {
+            "count": int(len(values)),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "avg": float(values.mean()),
+            "last": float(values[-1]),
+        }
+
+
+class HotSeriesCache:
+    """
+    The most recent samples of every (metric_name, source_id) series, one SeriesRing each.
+
+    Fed like RollupStore, through EventStore.add_listener, so ingest keeps it current and
+    "latest value", "last N samples" and window stats never touch the event list: each
+    costs O(capacity) at most, however many events are stored.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._rings: Dict[SeriesKey, SeriesRing] = {}
+        self._lock = threading.Lock()
+        self.folded_samples = 0
+
+    def add_events(self, events: Iterable[HCaiEvent]) -> None:
+        """Fold metric samples into their series' rings; other events are ignored."""
+        batches: Dict[SeriesKey, Tuple[List[int], List[float]]] = {}
+        for e in events:
+            if e.metric_name is None or e.metric_value is None:
+                continue
+            try:
+                value = float(e.metric_value)
+            except (TypeError, ValueError):
+                continue
+            ts_us = coerce_epoch_us(e.timestamp)
+            if ts_us is None or math.isnan(value):
+                continue
+            batch = batches.get((e.metric_name, e.source_id))
+            if batch is None:
+                batch = batches[(e.metric_name, e.source_id)] = ([], [])
+            batch[0].append(ts_us)
+            batch[1].append(value)
+        if not batches:
+            return
+        with self._lock:
+            rings = self._rings
+            for key, (timestamps, values) in batches.items():
+                ring = rings.get(key)
+                if ring is None:
+                    ring = rings[key] = SeriesRing(self.capacity)
+                ring.extend(timestamps, values)
+                self.folded_samples += len(values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rings = {}
+
+    # ------------------------------------------------------------------- reads
+    def series(self) -> List[SeriesKey]:
+        with self._lock:
+            return list(self._rings)
+
+    def latest(self, metric_name: str, source_id: str) -> Optional[Tuple[int, float]]:
+        """(epoch-us, value) of the series' newest sample by timestamp, or None."""
+        with self._lock:
+            ring = self._rings.get((metric_name, source_id))
+            if ring is None or ring.latest_ts is None:
+                return None
+            return ring.latest_ts, ring.latest_value
+
+    def latest_all(self, since_us: Optional[int] = None) -> Iterator[Tuple[str, str, int, float]]:
+        """(metric_name, source_id, epoch-us, value) of every series whose newest sample is at or after since_us."""
+        with self._lock:
+            latest = [(key, ring.latest_ts, ring.latest_value) for key, ring in self._rings.items()]
+        for (metric_name, source_id), ts_us, value in latest:
+            if ts_us is not None and (since_us is None or ts_us >= since_us):
+                yield metric_name, source_id, ts_us, value
+
+    def last(self, metric_name: str, source_id: str, n: int) -> List[Tuple[int, float]]:
+        """Up to n most recent (epoch-us, value) samples by arrival, oldest first."""
+        with self._lock:
+            ring = self._rings.get((metric_name, source_id))
+            if ring is None:
+                return []
+            timestamps, values = ring.last(min(n, ring.size))
+        return list(zip(timestamps.tolist(), values.tolist()))
+
+    def window_stats(
+        self, metric_name: str, source_id: str, since_us: Optional[int] = None
+    ) -> Dict[str, Optional[float]]:
+        """count/min/max/avg/last over the buffered samples at or after since_us."""
+        with self._lock:
+            ring = self._rings.get((metric_name, source_id))
+            if ring is None:
+                return _empty_window()
+            return ring.window(since_us)
+
+    def stats(self) -> dict:
+        with self._lock:
+            series = len(self._rings)
+        return {
+            "series": series,
+            "capacity": self.capacity,
+            "bytes": series * self.capacity * 16,
+            "folded_samples": self.folded_samples,
+        }
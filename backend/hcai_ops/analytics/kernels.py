@@ -0,0 +1,219 @@
+"""
+Vectorized kernels behind the batch processors (MetricAggregator, LogAnomalyDetector,
+MetricThresholdDetector, RiskScoringEngine).
+
+An event batch is encoded into EventColumns once, by event_columns(); every kernel then
+works on those arrays with np.bincount / argsort + ufunc.reduceat instead of looping over
+HCaiEvent objects. String predicates such as "level is ERROR" are evaluated once per
+vocabulary entry, never per event. Groups come back in first-seen order, so callers
+that build dicts keep the insertion order of the original per-event loops.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from hcai_ops.analytics.columnar import EventColumns, first_seen_order
+from hcai_ops.analytics.timeutil import EPOCH_NAIVE
+from hcai_ops.data.schemas import HCaiEvent
+
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+_SECOND = timedelta(seconds=1)
+
+
+def event_columns(events: Union[Iterable[HCaiEvent], EventColumns]) -> EventColumns:
+    """
+    Encode events as EventColumns in one pass (EventColumns are returned as they are).
+    Timestamps that are not datetimes become 0 and non-numeric metric values NaN, as in
+    ColumnarEventStore.
+    """
+    if isinstance(events, EventColumns):
+        return events
+    # Code 0 is None, as in Vocabulary; dict.setdefault assigns the next code in one call.
+    sources: Dict[Hashable, int] = {None: 0}
+    types: Dict[Hashable, int] = {None: 0}
+    metrics: Dict[Hashable, int] = {None: 0}
+    levels: Dict[Hashable, int] = {None: 0}
+    seconds: List[float] = []
+    value_col: List[float] = []
+    src_col: List[int] = []
+    type_col: List[int] = []
+    metric_col: List[int] = []
+    level_col: List[int] = []
+    nan = float("nan")
+    for event in events:
+        ts = event.timestamp
+        if not isinstance(ts, datetime):
+            seconds.append(0.0)
+        elif ts.tzinfo is None:
+            seconds.append((ts - EPOCH_NAIVE) / _SECOND)
+        else:
+            # datetime.timestamp() is exact to well under a microsecond for any realistic
+            # date, and much cheaper than integer timedelta arithmetic per event.
+            seconds.append(ts.timestamp())
+        value = event.metric_value
+        if value is None:
+            value_col.append(nan)
+        elif type(value) is float:
+            value_col.append(value)
+        else:
+            try:
+                value_col.append(float(value))
+            except (TypeError, ValueError):
+                value_col.append(nan)
+        src_col.append(sources.setdefault(event.source_id, len(sources)))
+        type_col.append(types.setdefault(event.event_type, len(types)))
+        metric_col.append(metrics.setdefault(event.metric_name, len(metrics)))
+        level_col.append(levels.setdefault(event.log_level, len(levels)))
+    return EventColumns(
+        timestamps=np.rint(np.array(seconds, dtype=np.float64) * 1e6).astype(np.int64),
+        metric_values=np.array(value_col, dtype=np.float64),
+        source_ids=np.array(src_col, dtype=np.int32),
+        event_types=np.array(type_col, dtype=np.int32),
+        metric_names=np.array(metric_col, dtype=np.int32),
+        log_levels=np.array(level_col, dtype=np.int32),
+        source_vocab=list(sources),
+        type_vocab=list(types),
+        metric_vocab=list(metrics),
+        level_vocab=list(levels),
+    )
+
+
+def level_rows(cols: EventColumns, levels: Tuple[str, ...] = ERROR_LEVELS) -> np.ndarray:
+    """Per-row mask of log events whose level, upper-cased, is one of levels."""
+    wanted = cols.code_mask(cols.level_vocab, lambda v: (v or "").upper() in levels)
+    return (cols.event_types == cols.type_code("log")) & wanted[cols.log_levels]
+
+
+def series_codes(cols: EventColumns) -> np.ndarray:
+    """One int64 code per row for its (metric_name, source_id) pair; see split_series."""
+    return cols.metric_names.astype(np.int64) * len(cols.source_vocab) + cols.source_ids
+
+
+def split_series(cols: EventColumns, code: int) -> Tuple[object, object]:
+    """(metric_name, source_id) of a series_codes() value."""
+    metric_code, source_code = divmod(int(code), len(cols.source_vocab))
+    return cols.metric_vocab[metric_code], cols.source_vocab[source_code]
+
+
+def metric_rows(cols: EventColumns) -> np.ndarray:
+    """Rows with a metric name and a numeric value."""
+    return (cols.metric_names != 0) & ~np.isnan(cols.metric_values)
+
+
+def grouped_stats(
+    keys: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (keys, count, sum, min, max) per distinct key, keys in first-seen order. One stable
+    argsort plus reduceat over the contiguous runs, so min/max need no ufunc.at loop.
+    """
+    if not len(keys):
+        empty = np.zeros(0)
+        return keys[:0], empty.astype(np.int64), empty, empty, empty
+    order = np.argsort(keys, kind="stable")
+    sorted_keys, sorted_values = keys[order], values[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    counts = np.diff(np.append(starts, len(keys)))
+    sums = np.add.reduceat(sorted_values, starts)
+    mins = np.minimum.reduceat(sorted_values, starts)
+    maxs = np.maximum.reduceat(sorted_values, starts)
+    # order[starts] is each group's first row, since the sort was stable.
+    seen = np.argsort(order[starts], kind="stable")
+    return sorted_keys[starts][seen], counts[seen], sums[seen], mins[seen], maxs[seen]
+
+
+def latest_rows(keys: np.ndarray, timestamps: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Row number of the newest masked row per key (the first such row on ties), keys in the
+    order they first appear among the masked rows.
+    """
+    rows = np.flatnonzero(mask)
+    if not len(rows):
+        return rows
+    keys, timestamps = keys[rows], timestamps[rows]
+    # Sort by key, newest first, then by position, and take the head of each key's run.
+    order = np.lexsort((rows, -timestamps, keys))
+    sorted_keys = keys[order]
+    heads = order[np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))]
+    # Both heads and np.unique's first indices follow ascending key order.
+    _, first = np.unique(keys, return_index=True)
+    return rows[heads][np.argsort(first, kind="stable")]
+
+
+def source_counts(cols: EventColumns, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(source codes in first-seen order among masked rows, count per source code)."""
+    sources = cols.source_ids[mask]
+    return first_seen_order(sources), np.bincount(sources, minlength=len(cols.source_vocab))
+
+
+def source_risk(cols: EventColumns, metric_threshold: float = 0.9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (errors, metric_anomalies, risk) per source code: ERROR logs score 10, CRITICAL 20,
+    metric values above metric_threshold 15.
+    """
+    n_sources = len(cols.source_vocab)
+    is_error = level_rows(cols, ("ERROR",))
+    is_critical = level_rows(cols, ("CRITICAL",))
+    is_high = cols.metric_values > metric_threshold  # NaN compares False
+    errors = np.bincount(cols.source_ids, weights=is_error | is_critical, minlength=n_sources)
+    anomalies = np.bincount(cols.source_ids, weights=is_high, minlength=n_sources)
+    risk = 10 * errors + 10 * np.bincount(cols.source_ids, weights=is_critical, minlength=n_sources) + 15 * anomalies
+    return errors, anomalies, risk
+
+
+def _range_min(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    min(values[lo[i]:hi[i]]) for every i (ranges must be non-empty), from a sparse table:
+    O(n log n) to build, two lookups per range.
+    """
+    out = np.empty(len(lo), dtype=values.dtype)
+    if not len(lo):
+        return out
+    # floor(log2(length)), exactly: frexp gives length = m * 2**e with 0.5 <= m < 1.
+    levels = np.frexp(hi - lo)[1] - 1
+    table = values
+    for level in range(int(levels.max()) + 1):
+        if level:
+            # table[i] becomes min(values[i : i + 2**level]).
+            span = 1 << (level - 1)
+            table = np.minimum(table[:-span], table[span:])
+        at = levels == level
+        if at.any():
+            out[at] = np.minimum(table[lo[at]], table[hi[at] - (1 << level)])
+    return out
+
+
+def window_join(
+    left_groups: np.ndarray,
+    left_ts: np.ndarray,
+    right_groups: np.ndarray,
+    right_ts: np.ndarray,
+    window_us: int,
+) -> np.ndarray:
+    """
+    For every left row, the position of the first right row (in the order given) with the
+    same group and a timestamp within +/- window_us, or -1 if there is none.
+
+    The right side is sorted once by (group, time), and each left row finds its window
+    with two binary searches, so the join costs O((L + R) log R) rather than L x R
+    comparisons. The "first in the given order" rule matches a nested loop that stops at
+    its first hit, even when the input is not sorted by time.
+    """
+    out = np.full(len(left_ts), -1, dtype=np.int64)
+    if not len(left_ts) or not len(right_ts):
+        return out
+    # Replace timestamps by their rank among the right side's distinct times, so
+    # group * stride + rank is one sortable int64 key per row.
+    times = np.unique(right_ts)
+    stride = len(times) + 1
+    right_keys = right_groups.astype(np.int64) * stride + np.searchsorted(times, right_ts)
+    order = np.argsort(right_keys, kind="stable")
+    right_keys = right_keys[order]
+    base = left_groups.astype(np.int64) * stride
+    lo = np.searchsorted(right_keys, base + np.searchsorted(times, left_ts - window_us, side="left"), side="left")
+    hi = np.searchsorted(right_keys, base + np.searchsorted(times, left_ts + window_us, side="right"), side="left")
+    hit = hi > lo
+    out[hit] = _range_min(order, lo[hit], hi[hit])
+    return out
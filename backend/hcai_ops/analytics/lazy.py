@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyProxy(Generic[T]):
+    """
+    Stand-in for a module-level singleton that is only built on first use.
+
+    Attribute reads, writes and isinstance() checks go to the object factory() returns;
+    the factory runs once, under a lock, the first time any attribute is touched.
+    Attributes set before that are kept and applied to the object once it is built.
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_target", "_lazy_lock", "_lazy_pending")
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+        object.__setattr__(self, "_lazy_pending", {})
+
+    def _lazy_resolve(self) -> T:
+        target = self._lazy_target
+        if target is None:
+            with self._lazy_lock:
+                target = self._lazy_target
+                if target is None:
+                    target = self._lazy_factory()
+                    pending: Dict[str, Any] = self._lazy_pending
+                    for name, value in pending.items():
+                        setattr(target, name, value)
+                    pending.clear()
+                    object.__setattr__(self, "_lazy_target", target)
+        return target
+
+    @property
+    def initialized(self) -> bool:
+        return self._lazy_target is not None
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:
+        return type(self._lazy_resolve())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        with self._lazy_lock:
+            target = self._lazy_target
+            if target is None:
+                self._lazy_pending[name] = value
+                return
+        setattr(target, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._lazy_resolve(), name)
+
+    def __repr__(self) -> str:
+        if self._lazy_target is None:
+            return f"<LazyProxy of {getattr(self._lazy_factory, '__name__', 'factory')} (not initialized)>"
+        return repr(self._lazy_target)
@@ -0,0 +1,215 @@
+"""
+Per-source error-log rates with exponentially decayed counters, kept as logs arrive.
+
+LogAnomalyDetector counts every ERROR/CRITICAL log a source ever sent against a fixed
+threshold, so a source that once had a burst stays anomalous forever. LogRateDetector
+instead keeps, per source, an error count that halves every half_life_minutes (its
+current rate) and an EWMA mean and variance of the errors per bucket_seconds bucket (its
+baseline). A source is anomalous while its current rate is k standard deviations above
+its baseline. Each log costs O(1), and reads cost O(sources).
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from hcai_ops.analytics.kernels import ERROR_LEVELS
+from hcai_ops.analytics.timeutil import coerce_epoch_us, from_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+DEFAULT_HALF_LIFE_MINUTES = 5.0
+DEFAULT_BUCKET_SECONDS = 60
+DEFAULT_ALPHA = 0.05
+DEFAULT_SIGMA = 3.0
+# Decayed errors a source must have before it can be flagged (LogAnomalyDetector's threshold).
+DEFAULT_MIN_ERRORS = 3.0
+# Floor for the baseline standard deviation, in errors per minute, so a source whose
+# baseline is flat zero is compared against something.
+DEFAULT_MIN_STDDEV = 0.1
+
+
+class _SourceRate:
+    __slots__ = ("level", "level_us", "bucket_start", "bucket_count", "mean", "var", "buckets", "total", "last_us")
+
+    def __init__(self, ts_us: int, bucket_start: int) -> None:
+        # Decayed error count as of level_us
+        self.level = 0.0
+        self.level_us = ts_us
+        # The open baseline bucket
+        self.bucket_start = bucket_start
+        self.bucket_count = 0
+        # EWMA mean and variance of closed buckets' error counts
+        self.mean = 0.0
+        self.var = 0.0
+        self.buckets = 0
+        self.total = 0
+        self.last_us = ts_us
+
+    def update_baseline(self, count: float, alpha: float) -> None:
+        diff = count - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        self.var = (1 - alpha) * (self.var + diff * increment)
+        self.buckets += 1
+
+
+class LogRateDetector:
+    """
+    Incremental error-rate anomaly detection per source.
+
+    Fed like HotSeriesCache, through EventStore.add_listener. An error log at t adds 1 to
+    its source's counter after decaying it from the previous error's time, and counts
+    into the bucket that contains t. When a later error opens a new bucket, the closed
+    bucket and any empty ones skipped since are folded into the baseline, so the baseline
+    never includes the burst that is being judged until it is over. Late logs count
+    into the open bucket.
+
+    Rates are reported in errors per minute. A steady rate of r gives a decayed count of
+    r * half_life_minutes / ln 2, so the two scales are comparable.
+    """
+
+    def __init__(
+        self,
+        half_life_minutes: float = DEFAULT_HALF_LIFE_MINUTES,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        alpha: float = DEFAULT_ALPHA,
+        k: float = DEFAULT_SIGMA,
+        min_errors: float = DEFAULT_MIN_ERRORS,
+        min_stddev: float = DEFAULT_MIN_STDDEV,
+        log_levels: Iterable[str] = ERROR_LEVELS,
+    ) -> None:
+        if half_life_minutes <= 0 or bucket_seconds <= 0:
+            raise ValueError("half_life_minutes and bucket_seconds must be positive")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.half_life_minutes = half_life_minutes
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.k = k
+        self.min_errors = min_errors
+        self.min_stddev = min_stddev
+        self.log_levels = frozenset(level.upper() for level in log_levels)
+        self._half_life_us = half_life_minutes * 60_000_000
+        self._bucket_us = bucket_seconds * 1_000_000
+        # Errors per bucket -> errors per minute
+        self._per_minute = 60 / bucket_seconds
+        # After this many empty buckets the baseline has decayed below 1e-6 of itself;
+        # folding more is skipped, which keeps a long-idle source's next error O(1).
+        self._max_idle = 1 if alpha == 1 else math.ceil(math.log(1e-6) / math.log(1 - alpha))
+        self._sources: Dict[object, _SourceRate] = {}
+        self._lock = threading.Lock()
+        self.folded_logs = 0
+
+    # ------------------------------------------------------------------ writes
+    def add_events(self, events: Iterable[HCaiEvent]) -> None:
+        """Fold error logs into their sources' rates; other events are ignored."""
+        levels = self.log_levels
+        half_life_us, bucket_us = self._half_life_us, self._bucket_us
+        folded = 0
+        with self._lock:
+            sources = self._sources
+            for e in events:
+                if e.event_type != "log" or (e.log_level or "").upper() not in levels:
+                    continue
+                ts_us = coerce_epoch_us(e.timestamp)
+                if ts_us is None:
+                    continue
+                start = ts_us - ts_us % bucket_us
+                state = sources.get(e.source_id)
+                if state is None:
+                    state = sources[e.source_id] = _SourceRate(ts_us, start)
+                if ts_us >= state.level_us:
+                    state.level = state.level * 2.0 ** ((state.level_us - ts_us) / half_life_us) + 1.0
+                    state.level_us = ts_us
+                else:
+                    state.level += 2.0 ** ((ts_us - state.level_us) / half_life_us)
+                if start > state.bucket_start:
+                    self._close_buckets(state, start)
+                state.bucket_count += 1
+                state.total += 1
+                state.last_us = max(state.last_us, ts_us)
+                folded += 1
+            self.folded_logs += folded
+
+    def _close_buckets(self, state: _SourceRate, start: int) -> None:
+        alpha = self.alpha
+        state.update_baseline(state.bucket_count, alpha)
+        for _ in range(min((start - state.bucket_start) // self._bucket_us - 1, self._max_idle)):
+            state.update_baseline(0.0, alpha)
+        state.bucket_start = start
+        state.bucket_count = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sources = {}
+
+    # ------------------------------------------------------------------- reads
+    def detect(self, now_us: Optional[int] = None) -> List[Dict[str, object]]:
+        """
+        One finding per source that has sent an error log, in first-seen order, with
+        its current rate and baseline in errors per minute. The anomaly flag is set when
+        the rate is at least k standard deviations above the baseline and the decayed
+        count is at least min_errors.
+        """
+        now_us = _now_us() if now_us is None else now_us
+        to_rate = math.log(2) / self.half_life_minutes
+        with self._lock:
+            rows = [
+                (source_id, s.level * 2.0 ** (min(s.level_us - now_us, 0) / self._half_life_us), s)
+                for source_id, s in self._sources.items()
+            ]
+        findings: List[Dict[str, object]] = []
+        for source_id, level, s in rows:
+            rate = level * to_rate
+            baseline = s.mean * self._per_minute
+            stddev = max(math.sqrt(s.var) * self._per_minute, self.min_stddev)
+            zscore = (rate - baseline) / stddev
+            is_anomaly = zscore >= self.k and level >= self.min_errors
+            message = (
+                f"Error rate {rate:.2f}/min is {zscore:.1f} sigma above baseline {baseline:.2f}/min"
+                if is_anomaly
+                else f"Error rate {rate:.2f}/min (baseline {baseline:.2f}/min)"
+            )
+            findings.append(
+                {
+                    "id": f"log_rate:{source_id}",
+                    "source_id": source_id,
+                    "error_count": s.total,
+                    "decayed_errors": round(level, 3),
+                    "rate_per_min": round(rate, 4),
+                    "baseline_per_min": round(baseline, 4),
+                    "baseline_stddev": round(stddev, 4),
+                    "zscore": round(zscore, 2),
+                    "threshold": self.k,
+                    "anomaly": is_anomaly,
+                    "message": message,
+                    "timestamp": from_epoch_us(s.last_us).isoformat(),
+                    "type": "log_rate",
+                }
+            )
+        return findings
+
+    def state(self, now_us: Optional[int] = None) -> dict:
+        """Settings, counters and every source's finding, for inspecting the detector."""
+        return {
+            "half_life_minutes": self.half_life_minutes,
+            "bucket_seconds": self.bucket_seconds,
+            "alpha": self.alpha,
+            "k": self.k,
+            "min_errors": self.min_errors,
+            **self.stats(),
+            "sources": self.detect(now_us),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "source_count": len(self._sources),
+                "baseline_buckets": sum(s.buckets for s in self._sources.values()),
+                "folded_logs": self.folded_logs,
+            }
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1_000
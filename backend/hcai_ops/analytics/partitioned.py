@@ -0,0 +1,508 @@
+import heapq
+import json
+from itertools import islice
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from hcai_ops.analytics.store import EventPage, EventStore, LevelFilter, event_matches, normalize_levels
+from hcai_ops.analytics.timeutil import EPOCH, from_epoch_us, to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+# Larger than any SQLite rowid; see _keyed_scan.
+_MAX_ROWID = 2**63 - 1
+
+GRANULARITIES = {
+    "day": (timedelta(days=1), "%Y%m%d"),
+    "hour": (timedelta(hours=1), "%Y%m%d%H"),
+}
+
+
+def parse_ttls(spec: str) -> Tuple[Dict[str, timedelta], Optional[timedelta]]:
+    """
+    Parse a retention spec like "metric=7,log=30,*=90" (days) into per-event_type TTLs
+    and a default TTL (the "*" entry). Malformed entries are ignored.
+    """
+    ttls: Dict[str, timedelta] = {}
+    default: Optional[timedelta] = None
+    for part in (spec or "").split(","):
+        name, _, days = part.partition("=")
+        name = name.strip()
+        try:
+            ttl = timedelta(days=float(days))
+        except ValueError:
+            continue
+        if not name:
+            continue
+        if name == "*":
+            default = ttl
+        else:
+            ttls[name] = ttl
+    return ttls, default
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One SQLite file holding a single event_type for one time period."""
+
+    event_type: str
+    start: datetime
+    end: datetime
+    path: Path
+
+
+class PartitionedSQLiteEventStore(EventStore):
+    """
+    Event store that writes one SQLite file per (event_type, day|hour).
+
+    Range queries only open partitions whose period overlaps the requested window,
+    and retention removes whole files according to per-event_type TTLs, so deletes
+    never rewrite or VACUUM live data.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        granularity: str = "day",
+        ttls: Optional[Dict[str, timedelta]] = None,
+        default_ttl: Optional[timedelta] = None,
+    ) -> None:
+        super().__init__()
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {sorted(GRANULARITIES)}")
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self.granularity = granularity
+        self._period, self._fmt = GRANULARITIES[granularity]
+        self._period_us = self._period // timedelta(microseconds=1)
+        # Keyed by partition directory name, which is what retention sees on disk.
+        self.ttls: Dict[str, timedelta] = {self._type_dir(k): v for k, v in (ttls or {}).items()}
+        self.default_ttl = default_ttl
+        self._conns: Dict[Path, sqlite3.Connection] = {}
+        # Read-only connections to partitions this store has not written to.
+        self._readers: Dict[Path, sqlite3.Connection] = {}
+        self._lock = threading.RLock()
+        self.dropped_partitions: int = 0
+
+    # -------------------------------------------------------------- partitions
+    @staticmethod
+    def _type_dir(event_type: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", str(event_type)) or "_"
+
+    def _partition_path(self, event_type: str, bucket: int) -> Path:
+        start = EPOCH + timedelta(microseconds=bucket * self._period_us)
+        return self._root / self._type_dir(event_type) / f"{start.strftime(self._fmt)}.db"
+
+    def partitions(self, event_type: Optional[str] = None) -> List[Partition]:
+        """List partitions on disk, optionally for a single event_type, ordered by start time."""
+        dirs = [self._root / self._type_dir(event_type)] if event_type is not None else sorted(self._root.iterdir())
+        out: List[Partition] = []
+        for type_dir in dirs:
+            if not type_dir.is_dir():
+                continue
+            for path in type_dir.glob("*.db"):
+                try:
+                    start = datetime.strptime(path.stem, self._fmt).replace(tzinfo=timezone.utc)
+                except ValueError:
+                    continue
+                out.append(Partition(type_dir.name, start, start + self._period, path))
+        out.sort(key=lambda p: (p.start, p.event_type))
+        return out
+
+    def _connection(self, path: Path) -> sqlite3.Connection:
+        conn = self._conns.get(path)
+        if conn is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts INTEGER,
+                    source_id TEXT,
+                    payload TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source ON events(source_id, ts)")
+            conn.commit()
+            self._conns[path] = conn
+        return conn
+
+    def _query(self, path: Path, query: str, params: tuple = ()) -> List[tuple]:
+        """
+        Rows of a read from an existing partition, or [] once it is gone. Reads never go
+        through _connection(), which would recreate a file retention just removed.
+        """
+        with self._lock:
+            if not path.exists():
+                self._close(path)
+                return []
+            conn = self._conns.get(path) or self._readers.get(path)
+            if conn is None:
+                try:
+                    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+                except sqlite3.OperationalError:
+                    return []
+                self._readers[path] = conn
+            return conn.execute(query, params).fetchall()
+
+    def _close(self, path: Path) -> None:
+        for conns in (self._conns, self._readers):
+            conn = conns.pop(path, None)
+            if conn is not None:
+                conn.close()
+
+    def _unlink(self, partition: Partition) -> None:
+        self._close(partition.path)
+        for suffix in ("", "-wal", "-shm"):
+            candidate = partition.path.with_name(partition.path.name + suffix)
+            if candidate.exists():
+                candidate.unlink()
+        self.dropped_partitions += 1
+
+    # ------------------------------------------------------------------ codecs
+    def _serialize(self, event: HCaiEvent) -> dict:
+        data = event.to_dict()
+        ts = data.get("timestamp")
+        if hasattr(ts, "isoformat"):
+            data["timestamp"] = ts.isoformat()
+        return data
+
+    def _deserialize(self, data: dict) -> Optional[HCaiEvent]:
+        try:
+            return HCaiEvent.from_dict(data)
+        except Exception:
+            return None
+
+    # ------------------------------------------------------------------ writes
+    def add_events(self, events: List[HCaiEvent]) -> None:
+        """Route events to their partitions; one transaction per touched partition."""
+        grouped: Dict[Path, List[tuple]] = {}
+        for e in events:
+            ts = e.timestamp
+            epoch = to_epoch_us(ts) if isinstance(ts, datetime) else to_epoch_us(datetime.now(timezone.utc))
+            path = self._partition_path(e.event_type, epoch // self._period_us)
+            grouped.setdefault(path, []).append((epoch, e.source_id, json.dumps(self._serialize(e), default=str)))
+        created = False
+        with self._write_lock, self._lock:
+            for path, rows in grouped.items():
+                created = created or (path not in self._conns and not path.exists())
+                conn = self._connection(path)
+                with conn:
+                    conn.executemany("INSERT INTO events(ts, source_id, payload) VALUES (?,?,?)", rows)
+            self._record_changes(events)
+        self._call_listeners(events)
+        if created:
+            # New periods are the natural point to expire old ones.
+            self.apply_retention()
+
+    # -------------------------------------------------------------- retention
+    def ttl_for(self, event_type: str) -> Optional[timedelta]:
+        """TTL of an event_type, or of the partition directory it is stored under."""
+        return self.ttls.get(self._type_dir(event_type), self.default_ttl)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> List[Partition]:
+        """Drop every partition whose whole period is older than its event_type TTL."""
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        dropped: List[Partition] = []
+        with self._lock:
+            for partition in self.partitions():
+                ttl = self.ttl_for(partition.event_type)
+                if ttl is not None and partition.end <= now - ttl:
+                    self._unlink(partition)
+                    dropped.append(partition)
+        if dropped:
+            self.mark_reset()
+        return dropped
+
+    def drop_all(self) -> int:
+        """Remove every partition file; returns the number of partitions dropped."""
+        with self._lock:
+            parts = self.partitions()
+            for partition in parts:
+                self._unlink(partition)
+        self.mark_reset()
+        return len(parts)
+
+    # ------------------------------------------------------------------- reads
+    def _scan(
+        self,
+        partition: Partition,
+        start_us: Optional[int],
+        end_us: Optional[int],
+        source_id: Optional[str],
+        descending: bool = False,
+        page: int = 500,
+        last: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[Tuple[int, int, HCaiEvent]]:
+        """
+        (ts, row id, event) of one partition in (ts, id) order, read a page at a time;
+        with last, only rows after that (ts, id) in the scan direction.
+        """
+        clauses, params = [], []
+        if start_us is not None and start_us > to_epoch_us(partition.start):
+            clauses.append("ts >= ?")
+            params.append(start_us)
+        if end_us is not None and end_us < to_epoch_us(partition.end):
+            clauses.append("ts < ?")
+            params.append(end_us)
+        if source_id is not None:
+            clauses.append("source_id = ?")
+            params.append(source_id)
+        order, after = ("DESC", "<") if descending else ("ASC", ">")
+        while True:
+            where = clauses if last is None else clauses + [f"(ts, id) {after} (?, ?)"]
+            query = "SELECT ts, id, payload FROM events"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += f" ORDER BY ts {order}, id {order} LIMIT {page}"
+            rows = self._query(partition.path, query, tuple(params) + (last or ()))
+            if not rows:
+                return
+            last = rows[-1][:2]
+            for ts, row_id, payload in rows:
+                try:
+                    evt = self._deserialize(json.loads(payload))
+                except Exception:
+                    continue
+                if evt:
+                    yield ts, row_id, evt
+            if len(rows) < page:
+                return
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Events with start <= timestamp < end, reading only overlapping partitions."""
+        return list(
+            self.iter_range(
+                start, end, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+            )
+        )
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Lazy range(): the partition scans are merged by timestamp as they are consumed."""
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        selected = [
+            p
+            for p in self.partitions(event_type)
+            if (start_us is None or to_epoch_us(p.end) > start_us) and (end_us is None or to_epoch_us(p.start) < end_us)
+        ]
+        streams = [self._scan(p, start_us, end_us, source_id) for p in selected]
+        merged = (evt for _, _, evt in heapq.merge(*streams, key=lambda item: item[0]))
+        if metric_name is None and log_level is None:
+            return merged
+        levels = normalize_levels(log_level)
+        return (e for e in merged if event_matches(e, None, None, metric_name, levels))
+
+    def all(self) -> List[HCaiEvent]:
+        return self.range()
+
+    def since(self, dt: datetime) -> List[HCaiEvent]:
+        return self.range(dt)
+
+    def filter(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        return self.range(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+
+    def tail(
+        self,
+        limit: Optional[int] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Newest-first by timestamp; periods are opened newest first and only as far back as needed."""
+        levels = normalize_levels(log_level)
+        events = self._tail(source_id, event_type, metric_name, levels)
+        return islice(events, limit) if limit is not None else events
+
+    def page(
+        self,
+        limit: int = 100,
+        *,
+        after_id: Union[int, str, None] = None,
+        before_id: Union[int, str, None] = None,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> EventPage:
+        """
+        Keyset pagination as in EventStore.page. Row ids are per partition file, so ids
+        here are "ts:type:rowid" strings, ordered by timestamp, then partition type, then
+        row id (an int id is a bare timestamp; see _parse_event_id). Periods are opened
+        one at a time from the cursor on, as in tail(), and the partitions of one period
+        are merged on that key. Raises ValueError for a malformed id.
+        """
+        descending = after_id is None
+        cursor = _parse_event_id(after_id if after_id is not None else before_id)
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        parts = [
+            p
+            for p in self.partitions(event_type)
+            if (start_us is None or to_epoch_us(p.end) > start_us)
+            and (end_us is None or to_epoch_us(p.start) < end_us)
+            and (
+                cursor is None
+                or (to_epoch_us(p.start) <= cursor[0] if descending else to_epoch_us(p.end) > cursor[0])
+            )
+        ]
+        levels = normalize_levels(log_level)
+        items: List[Tuple[str, HCaiEvent]] = []
+        for period in sorted({p.start for p in parts}, reverse=descending):
+            streams = [
+                self._keyed_scan(p, start_us, end_us, source_id, cursor, descending) for p in parts if p.start == period
+            ]
+            for ts, type_dir, row_id, evt in heapq.merge(*streams, key=lambda item: item[:3], reverse=descending):
+                if event_matches(evt, None, None, metric_name, levels):
+                    if len(items) == limit:
+                        return items, items[-1][0]
+                    items.append((f"{ts}:{type_dir}:{row_id}", evt))
+        return items, None
+
+    def _keyed_scan(
+        self,
+        partition: Partition,
+        start_us: Optional[int],
+        end_us: Optional[int],
+        source_id: Optional[str],
+        cursor: Optional[Tuple[int, str, int]],
+        descending: bool,
+    ) -> Iterator[Tuple[int, str, int, HCaiEvent]]:
+        """_scan() rows as (ts, type, row id, event), past cursor in the scan direction."""
+        last = None
+        if cursor is not None:
+            ts, type_dir, row_id = cursor
+            # Another type's rows at the cursor's ts sort wholly before or after it by type.
+            if partition.event_type != type_dir:
+                row_id = _MAX_ROWID if partition.event_type < type_dir else 0
+            last = (ts, row_id)
+        for ts, row_id, evt in self._scan(partition, start_us, end_us, source_id, descending, last=last):
+            yield ts, partition.event_type, row_id, evt
+
+    def _tail(self, source_id, event_type, metric_name, levels) -> Iterator[HCaiEvent]:
+        parts = self.partitions(event_type)
+        periods = sorted({p.start for p in parts}, reverse=True)
+        for start in periods:
+            streams = [self._scan(p, None, None, source_id, descending=True) for p in parts if p.start == start]
+            for _, _, evt in heapq.merge(*streams, key=lambda item: item[0], reverse=True):
+                if event_matches(evt, None, None, metric_name, levels):
+                    yield evt
+
+    def count(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> int:
+        """
+        COUNT(*) per partition of the event_type. The partition tables have no typed
+        columns, so metric_name and log_level are matched with json_extract on the
+        payload, inside SQLite, with event_matches()' semantics.
+        """
+        clauses: List[str] = []
+        params: List[str] = []
+        if source_id is not None:
+            clauses.append("source_id = ?")
+            params.append(source_id)
+        if metric_name is not None:
+            clauses.append("json_extract(payload, '$.metric_name') = ?")
+            params.append(metric_name)
+        levels = normalize_levels(log_level)
+        if levels is not None:
+            clauses.append(
+                f"UPPER(COALESCE(json_extract(payload, '$.log_level'), '')) IN ({','.join('?' * len(levels))})"
+            )
+            params.extend(levels)
+        query = "SELECT COUNT(*) FROM events"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        total = 0
+        for p in self.partitions(event_type):
+            total += sum(n for n, in self._query(p.path, query, tuple(params)))
+        return total
+
+    def last_seen(self) -> Dict[str, datetime]:
+        latest: Dict[str, int] = {}
+        for p in self.partitions():
+            for source, ts in self._query(p.path, "SELECT source_id, MAX(ts) FROM events GROUP BY source_id"):
+                if ts is not None and ts > latest.get(source, ts - 1):
+                    latest[source] = ts
+        return {source: from_epoch_us(ts) for source, ts in latest.items()}
+
+    def stats(self) -> dict:
+        parts = self.partitions()
+        stored = 0
+        for p in parts:
+            stored += sum(n for n, in self._query(p.path, "SELECT COUNT(*) FROM events"))
+        return {
+            "backend": "sqlite-partitioned",
+            "path": str(self._root),
+            "granularity": self.granularity,
+            "partitions": len(parts),
+            "stored_events": stored,
+            "bytes": sum(p.path.stat().st_size for p in parts if p.path.exists()),
+            "dropped_partitions": self.dropped_partitions,
+            "ttls_days": {k: v.total_seconds() / 86400 for k, v in self.ttls.items()},
+        }
+
+    def reload(self) -> int:
+        """Partitions are read on demand; returns the stored event count."""
+        return self.stats()["stored_events"]
+
+
+def _parse_event_id(value: Union[int, str, None]) -> Optional[Tuple[int, str, int]]:
+    """
+    (ts, type, row id) of a PartitionedSQLiteEventStore id; ValueError if malformed. A
+    bare int is an epoch-us timestamp ahead of every row at it, so after_id=0 starts
+    from the oldest event, as with the other stores.
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value, "", 0
+    parts = value.split(":") if isinstance(value, str) else ()
+    if len(parts) != 3:
+        raise ValueError(f"invalid event id: {value!r}")
+    return int(parts[0]), parts[1], int(parts[2])
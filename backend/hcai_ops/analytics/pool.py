@@ -0,0 +1,117 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+
+class _Timing:
+    """Count, total and max of a duration in milliseconds."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "_lock")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def stats(self, prefix: str) -> dict:
+        return {
+            f"{prefix}_count": self.count,
+            f"{prefix}_ms_avg": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            f"{prefix}_ms_max": round(self.max_ms, 3),
+        }
+
+
+class TimedLock:
+    """RLock that records how long callers waited to acquire it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._waits = _Timing()
+
+    def __enter__(self) -> "TimedLock":
+        started = time.perf_counter()
+        self._lock.acquire()
+        self._waits.add((time.perf_counter() - started) * 1000.0)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+    def stats(self) -> dict:
+        return self._waits.stats("wait")
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections for concurrent readers.
+
+    Connections are opened on demand up to size and handed to one thread at a time,
+    so no connection (or cursor) is ever shared between threads. stats() reports how
+    long callers waited for a connection and how long they held it (query latency).
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int = 4) -> None:
+        self._connect = connect
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._waits = _Timing()
+        self._queries = _Timing()
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ConnectionPool is closed")
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the with-block."""
+        started = time.perf_counter()
+        conn = self._checkout()
+        acquired = time.perf_counter()
+        self._waits.add((acquired - started) * 1000.0)
+        try:
+            yield conn
+        finally:
+            self._queries.add((time.perf_counter() - acquired) * 1000.0)
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            opened = len(self._all)
+        return {
+            "size": self.size,
+            "open": opened,
+            "idle": self._idle.qsize(),
+            **self._waits.stats("wait"),
+            **self._queries.stats("query"),
+        }
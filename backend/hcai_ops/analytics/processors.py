@@ -1,24 +1,38 @@
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
-
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from hcai_ops.analytics.columnar import EventColumns
+from hcai_ops.analytics.hotseries import HotSeriesCache
+from hcai_ops.analytics.kernels import (
+    event_columns,
+    grouped_stats,
+    latest_rows,
+    level_rows,
+    metric_rows,
+    series_codes,
+    source_counts,
+    split_series,
+    window_join,
+)
+from hcai_ops.analytics.timeutil import from_epoch_us, to_epoch_us
 from hcai_ops.data.schemas import HCaiEvent
 
 
 class MetricAggregator:
     """Aggregate metric events by name and source."""
 
-    def aggregate(self, events: List[HCaiEvent]) -> Dict[str, Dict[str, float]]:
+    def aggregate(self, events: Union[List[HCaiEvent], EventColumns]) -> Dict[str, Dict[str, float]]:
+        cols = event_columns(events)
+        mask = metric_rows(cols)
+        keys, counts, sums, mins, maxs = grouped_stats(series_codes(cols)[mask], cols.metric_values[mask])
         summary: Dict[str, Dict[str, float]] = {}
-        for event in events:
-            if event.metric_name is None or event.metric_value is None:
-                continue
-            key = f"{event.metric_name}:{event.source_id}"
-            bucket = summary.setdefault(key, {"count": 0, "min": event.metric_value, "max": event.metric_value, "avg": 0.0})
-            bucket["count"] += 1
-            bucket["min"] = min(bucket["min"], event.metric_value)
-            bucket["max"] = max(bucket["max"], event.metric_value)
-            # Running average
-            bucket["avg"] = ((bucket["avg"] * (bucket["count"] - 1)) + event.metric_value) / bucket["count"]
+        for code, count, total, low, high in zip(
+            keys.tolist(), counts.tolist(), sums.tolist(), mins.tolist(), maxs.tolist()
+        ):
+            metric_name, source_id = split_series(cols, code)
+            summary[f"{metric_name}:{source_id}"] = {"count": count, "min": low, "max": high, "avg": total / count}
         return summary
 
 
@@ -28,20 +42,15 @@ class LogAnomalyDetector:
     def __init__(self, threshold: int = 3) -> None:
         self.threshold = threshold
 
-    def detect(self, events: List[HCaiEvent]) -> List[Dict[str, object]]:
-        error_counts: Dict[str, int] = {}
-        for event in events:
-            if event.event_type != "log":
-                continue
-            level = (event.log_level or "").upper()
-            if level == "ERROR" or level == "CRITICAL":
-                error_counts[event.source_id] = error_counts.get(event.source_id, 0) + 1
-
+    def detect(self, events: Union[List[HCaiEvent], EventColumns]) -> List[Dict[str, object]]:
+        cols = event_columns(events)
+        order, counts = source_counts(cols, level_rows(cols))
         results: List[Dict[str, object]] = []
-        for source_id, count in error_counts.items():
+        for code in order.tolist():
+            count = int(counts[code])
             results.append(
                 {
-                    "source_id": source_id,
+                    "source_id": cols.source_vocab[code],
                     "error_count": count,
                     "threshold": self.threshold,
                     "anomaly": count >= self.threshold,
@@ -51,37 +60,54 @@ class LogAnomalyDetector:
 
 
 class CorrelationEngine:
-    """Correlate high metrics with recent error logs."""
+    """
+    Correlate high metrics with recent error logs.
+
+    Each metric sample above metric_threshold is paired with the first log (in input
+    order) from the same source whose level is in log_levels and whose timestamp is
+    within +/- window_minutes. metric_names, when given, limits which metrics are checked.
+    """
 
-    def __init__(self, metric_threshold: float = 0.9, window_minutes: int = 5) -> None:
+    def __init__(
+        self,
+        metric_threshold: float = 0.9,
+        window_minutes: int = 5,
+        metric_names: Optional[Iterable[str]] = None,
+        log_levels: Iterable[str] = ("ERROR",),
+    ) -> None:
         self.metric_threshold = metric_threshold
         self.window = timedelta(minutes=window_minutes)
+        self.metric_names = None if metric_names is None else frozenset(metric_names)
+        self.log_levels = tuple(level.upper() for level in log_levels)
 
     def correlate(self, events: List[HCaiEvent]) -> List[Dict[str, object]]:
+        cols = event_columns(events)
+        high = (cols.metric_names != 0) & (cols.metric_values > self.metric_threshold)  # NaN compares False
+        if self.metric_names is not None:
+            wanted = cols.code_mask(cols.metric_vocab, lambda v: v in self.metric_names)
+            high &= wanted[cols.metric_names]
+        samples = np.flatnonzero(high)
+        logs = np.flatnonzero(level_rows(cols, self.log_levels))
+        matches = window_join(
+            cols.source_ids[samples],
+            cols.timestamps[samples],
+            cols.source_ids[logs],
+            cols.timestamps[logs],
+            self.window // timedelta(microseconds=1),
+        )
         findings: List[Dict[str, object]] = []
-        logs_by_source: Dict[str, List[HCaiEvent]] = {}
-        for event in events:
-            if event.event_type == "log":
-                logs_by_source.setdefault(event.source_id, []).append(event)
-
-        for event in events:
-            if event.metric_value is None or event.metric_name is None:
+        for row, match in zip(samples.tolist(), matches.tolist()):
+            if match < 0:
                 continue
-            if event.metric_value <= self.metric_threshold:
-                continue
-            source_logs = logs_by_source.get(event.source_id, [])
-            for log_event in source_logs:
-                if log_event.log_level and log_event.log_level.upper() == "ERROR":
-                    if abs((event.timestamp - log_event.timestamp)) <= self.window:
-                        findings.append(
-                            {
-                                "source_id": event.source_id,
-                                "metric": event.metric_name,
-                                "metric_value": event.metric_value,
-                                "log_message": log_event.log_message,
-                            }
-                        )
-                        break
+            event, log_event = events[row], events[int(logs[match])]
+            findings.append(
+                {
+                    "source_id": event.source_id,
+                    "metric": event.metric_name,
+                    "metric_value": event.metric_value,
+                    "log_message": log_event.log_message,
+                }
+            )
         return findings
 
 
@@ -115,55 +141,54 @@ class MetricThresholdDetector:
             return num * 100.0
         return num
 
-    def detect(self, events: List[HCaiEvent]) -> List[Dict[str, object]]:
-        now = datetime.now(timezone.utc)
-        cutoff = now - self.lookback
-
-        latest: Dict[str, tuple[datetime, HCaiEvent]] = {}
-        for event in events:
-            if event.event_type != "metric" or event.metric_name is None or event.metric_value is None:
-                continue
-            ts = event.timestamp
-            if ts is None:
-                continue
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            else:
-                ts = ts.astimezone(timezone.utc)
-            if ts < cutoff:
-                continue
-            key = f"{event.metric_name}:{event.source_id}"
-            if key not in latest or ts > latest[key][0]:
-                latest[key] = (ts, event)
-
+    def detect(self, events: Union[List[HCaiEvent], EventColumns]) -> List[Dict[str, object]]:
+        """Check the newest sample of each (metric, source) series seen within the lookback."""
+        cols = event_columns(events)
+        cutoff_us = to_epoch_us(datetime.now(timezone.utc) - self.lookback)
+        mask = (cols.event_types == cols.type_code("metric")) & metric_rows(cols) & (cols.timestamps >= cutoff_us)
         findings: List[Dict[str, object]] = []
-        for key, (ts, evt) in latest.items():
-            metric_name, source_id = key.split(":", 1)
-            threshold = self.thresholds.get(metric_name)
-            if threshold is None:
-                continue
-            normalized_value = self._normalize_percent(evt.metric_value)
-            if normalized_value is None:
-                continue
-
-            is_anomaly = normalized_value >= threshold
-            message = (
-                f"High {metric_name}: {normalized_value:.1f}% >= {threshold}%"
-                if is_anomaly
-                else f"{metric_name} at {normalized_value:.1f}% (threshold {threshold}%)"
+        for row in latest_rows(series_codes(cols), cols.timestamps, mask).tolist():
+            finding = self._finding(
+                cols.metric_vocab[cols.metric_names[row]],
+                cols.source_vocab[cols.source_ids[row]],
+                from_epoch_us(cols.timestamps[row]),
+                float(cols.metric_values[row]),
             )
+            if finding is not None:
+                findings.append(finding)
+        return findings
 
-            findings.append(
-                {
-                    "id": f"{metric_name}:{source_id}",
-                    "source_id": source_id,
-                    "metric": metric_name,
-                    "current_value": round(normalized_value, 2),
-                    "threshold": threshold,
-                    "anomaly": is_anomaly,
-                    "message": message,
-                    "timestamp": ts.isoformat() if hasattr(ts, "isoformat") else None,
-                    "type": "metric_threshold",
-                }
-            )
+    def detect_latest(self, hot_series: HotSeriesCache) -> List[Dict[str, object]]:
+        """detect() over the newest sample of each series in a HotSeriesCache, without scanning events."""
+        cutoff_us = to_epoch_us(datetime.now(timezone.utc) - self.lookback)
+        findings: List[Dict[str, object]] = []
+        for metric_name, source_id, ts_us, value in hot_series.latest_all(cutoff_us):
+            finding = self._finding(metric_name, source_id, from_epoch_us(ts_us), value)
+            if finding is not None:
+                findings.append(finding)
         return findings
+
+    def _finding(self, metric_name: str, source_id: str, ts: datetime, value: object) -> Optional[Dict[str, object]]:
+        threshold = self.thresholds.get(metric_name)
+        if threshold is None:
+            return None
+        normalized_value = self._normalize_percent(value)
+        if normalized_value is None:
+            return None
+        is_anomaly = normalized_value >= threshold
+        message = (
+            f"High {metric_name}: {normalized_value:.1f}% >= {threshold}%"
+            if is_anomaly
+            else f"{metric_name} at {normalized_value:.1f}% (threshold {threshold}%)"
+        )
+        return {
+            "id": f"{metric_name}:{source_id}",
+            "source_id": source_id,
+            "metric": metric_name,
+            "current_value": round(normalized_value, 2),
+            "threshold": threshold,
+            "anomaly": is_anomaly,
+            "message": message,
+            "timestamp": ts.isoformat() if hasattr(ts, "isoformat") else None,
+            "type": "metric_threshold",
+        }
@@ -0,0 +1,522 @@
+import atexit
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.analytics.timeutil import coerce_epoch_us, from_epoch_us, to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+# Bucket widths in seconds, finest first.
+TIERS: Dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600}
+# How long each tier's buckets are kept; None keeps them forever.
+DEFAULT_TTLS: Dict[str, Optional[timedelta]] = {"1m": timedelta(days=2), "5m": timedelta(days=14), "1h": None}
+DEFAULT_MAX_POINTS = 720
+# Events per batch when folding stored history into the rollups.
+BACKFILL_BATCH = 10_000
+# A backfill whose owner has not reported progress for this long is taken over.
+BACKFILL_STALE_SECONDS = 60.0
+
+# (tier, metric_name, source_id, bucket start epoch-us)
+BucketKey = Tuple[str, str, str, int]
+# (metric_name, source_id, bucket start epoch-us, count, total, total_sq, low, high, last)
+Row = Tuple[str, str, int, int, float, float, float, float, float]
+
+
+class _Bucket:
+    __slots__ = ("count", "total", "total_sq", "low", "high", "last", "last_ts")
+
+    def __init__(self, value: float, ts_us: int) -> None:
+        self.count = 1
+        self.total = value
+        self.total_sq = value * value
+        self.low = value
+        self.high = value
+        self.last = value
+        self.last_ts = ts_us
+
+    def add(self, value: float, ts_us: int) -> None:
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+        if ts_us >= self.last_ts:
+            self.last = value
+            self.last_ts = ts_us
+
+
+def pick_tier(
+    start: datetime,
+    end: datetime,
+    resolution: Optional[timedelta] = None,
+    max_points: int = DEFAULT_MAX_POINTS,
+    ttls: Optional[Dict[str, Optional[timedelta]]] = None,
+    now: Optional[datetime] = None,
+) -> Optional[str]:
+    """
+    Coarsest tier whose bucket width still meets the requested resolution (or, without
+    one, keeps the window under max_points). None means only raw samples are fine enough.
+    Tiers whose retention (ttls, DEFAULT_TTLS by default) no longer reaches back to start
+    are skipped; if that leaves none fine enough, the finest tier that does is used.
+    """
+    if resolution is not None:
+        step = resolution.total_seconds()
+    else:
+        step = max((end - start).total_seconds(), 0.0) / max(1, max_points)
+    if all(width > step for width in TIERS.values()):
+        return None
+    ttls = DEFAULT_TTLS if ttls is None else ttls
+    now = now or datetime.now(timezone.utc)
+    kept = [name for name in TIERS if ttls.get(name) is None or start >= now - ttls[name]]
+    fine = [name for name in kept if TIERS[name] <= step]
+    if fine:
+        return fine[-1]
+    return kept[0] if kept else None
+
+
+def _point(metric_name: str, source_id: str, bucket_us: int, width: int, count, total, total_sq, low, high, last) -> dict:
+    avg = total / count if count else None
+    variance = max(total_sq / count - avg * avg, 0.0) if count else None
+    return {
+        "timestamp": from_epoch_us(bucket_us).isoformat(),
+        "bucket_seconds": width,
+        "metric_name": metric_name,
+        "source_id": source_id,
+        "count": count,
+        "sum": total,
+        "sumsq": total_sq,
+        "min": low,
+        "max": high,
+        "last": last,
+        "avg": avg,
+        "stddev": math.sqrt(variance) if variance is not None else None,
+    }
+
+
+def points(rows: Iterable[Row], width: int) -> List[dict]:
+    """Rollup points for rows of `width`-second buckets (0 for raw samples)."""
+    return [_point(name, source, bucket_us, width, *rest) for name, source, bucket_us, *rest in rows]
+
+
+def raw_points(events: Iterable[HCaiEvent]) -> List[dict]:
+    """Raw metric samples in the same shape as rollup points (one-sample buckets)."""
+    return list(iter_raw_points(events))
+
+
+def iter_raw_points(events: Iterable[HCaiEvent]) -> Iterator[dict]:
+    """Lazy raw_points(), for streaming responses."""
+    for name, source, ts_us, *rest in iter_raw_rows(events):
+        yield _point(name, source, ts_us, 0, *rest)
+
+
+def iter_raw_rows(events: Iterable[HCaiEvent]) -> Iterator[Row]:
+    """Metric samples as one-sample rollup rows, in input order."""
+    for e in events:
+        ts_us = coerce_epoch_us(e.timestamp)
+        value = _as_float(e.metric_value)
+        if e.metric_name is None or value is None or ts_us is None:
+            continue
+        yield (e.metric_name, e.source_id, ts_us, 1, value, value * value, value, value, value)
+
+
+def _as_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+_COLUMNS = "tier, metric_name, source_id, bucket, count, total, total_sq, low, high, last, last_ts"
+# Merges an incoming bucket into the stored one; used by flushes and the backfill's final merge.
+_MERGE = """
+    ON CONFLICT(tier, metric_name, source_id, bucket) DO UPDATE SET
+        count = count + excluded.count,
+        total = total + excluded.total,
+        total_sq = total_sq + excluded.total_sq,
+        low = MIN(low, excluded.low),
+        high = MAX(high, excluded.high),
+        last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last ELSE last END,
+        last_ts = MAX(last_ts, excluded.last_ts)
+"""
+
+
+def _rows(buckets: Dict[BucketKey, _Bucket]) -> List[tuple]:
+    return [key + (b.count, b.total, b.total_sq, b.low, b.high, b.last, b.last_ts) for key, b in buckets.items()]
+
+
+class RollupStore:
+    """
+    Per-series metric rollups at 1m/5m/1h, persisted in their own SQLite file.
+
+    add_events() folds metric samples into in-memory buckets (count/sum/sum of
+    squares/min/max/last); a background tick upserts the dirty buckets, merging with
+    what is already on disk, so several processes can feed the same file. Reads flush
+    first. Buckets expire per tier (DEFAULT_TTLS) independently of raw events.
+
+    History stored before the rollups existed is folded by one backfill per file (see
+    start_backfill): it covers events older than its end, the listeners everything from
+    end on, and its buckets are staged apart and merged in one transaction when it
+    completes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        flush_interval: float = 1.0,
+        ttls: Optional[Dict[str, Optional[timedelta]]] = None,
+    ) -> None:
+        self._path = path
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # rollup_staging holds a running backfill's buckets until it merges them.
+        for table in ("rollups", "rollup_staging"):
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    tier TEXT NOT NULL,
+                    metric_name TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    total_sq REAL NOT NULL,
+                    low REAL NOT NULL,
+                    high REAL NOT NULL,
+                    last REAL NOT NULL,
+                    last_ts INTEGER NOT NULL,
+                    PRIMARY KEY (tier, metric_name, source_id, bucket)
+                ) WITHOUT ROWID
+                """
+            )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_rollups_bucket ON rollups(tier, bucket)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS rollup_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._lock = threading.RLock()
+        self._dirty: Dict[BucketKey, _Bucket] = {}
+        self.folded_samples: int = 0
+        self.flushes: int = 0
+        self.last_error: Optional[str] = None
+        self._last_retention = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backfill_thread: Optional[threading.Thread] = None
+        self.backfilled_samples: int = 0
+        # Identifies this store's claim on the file's backfill.
+        self._owner = uuid.uuid4().hex
+        # While a backfill runs, add_events leaves events older than its end to it.
+        self._backfill_end_us: Optional[int] = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(
+                target=self._tick, args=(flush_interval,), name="hcai-rollups", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def empty(self) -> bool:
+        with self._lock:
+            if self._dirty:
+                return False
+            return self.conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone() is None
+
+    @property
+    def backfill_pending(self) -> bool:
+        """True if a backfill() was started on this file and has not finished."""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM rollup_meta WHERE key = 'backfill'").fetchone()
+        return row is not None and row[0] == "pending"
+
+    # ------------------------------------------------------------------ writes
+    def backfill(self, store: EventStore, end: datetime, batch: int = BACKFILL_BATCH) -> int:
+        """
+        Fold the store's events older than end, batch events at a time, if this store
+        can claim the file's backfill (see _claim_backfill); returns the samples folded,
+        0 if another store owns or finished it. A claim taken over from a dead owner
+        keeps that owner's end.
+        """
+        state, end_us = self._claim_backfill(to_epoch_us(end))
+        return self._fold_history(store, end_us, batch) if state == "claimed" else 0
+
+    def start_backfill(
+        self, store: EventStore, end: datetime, batch: int = BACKFILL_BATCH
+    ) -> Optional[threading.Thread]:
+        """
+        Claim or join the file's backfill now, so add_events already leaves older events
+        to it, then run it on a background thread, off the caller's (request) path. A
+        store that finds another live owner waits, and takes over if that owner stops
+        reporting progress. Returns None if the file's backfill already completed.
+        """
+        state, end_us = self._claim_backfill(to_epoch_us(end))
+        if state == "done":
+            return None
+
+        def run() -> None:
+            current = state
+            try:
+                while current != "done":
+                    if current == "claimed":
+                        self._fold_history(store, end_us, batch)
+                    elif self._stop.wait(BACKFILL_STALE_SECONDS / 4):
+                        return
+                    if self._stop.is_set():
+                        return
+                    current = self._claim_backfill(end_us)[0]
+            except Exception as exc:
+                self.last_error = str(exc)
+
+        self._backfill_thread = threading.Thread(target=run, name="hcai-rollups-backfill", daemon=True)
+        self._backfill_thread.start()
+        return self._backfill_thread
+
+    def _claim_backfill(self, end_us: int) -> Tuple[str, int]:
+        """
+        In one write transaction, read the file's backfill state and claim it unless it
+        is done or another owner reported progress within BACKFILL_STALE_SECONDS.
+        Returns ("claimed" | "running" | "done", the backfill's end).
+        """
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM rollup_meta WHERE key LIKE 'backfill%'").fetchall())
+                status = meta.get("backfill")
+                end_us = int(meta.get("backfill_end", end_us))
+                if status == "done":
+                    state = "done"
+                elif (
+                    status == "pending"
+                    and meta.get("backfill_owner") != self._owner
+                    and time.time() - float(meta.get("backfill_heartbeat", 0)) < BACKFILL_STALE_SECONDS
+                ):
+                    state = "running"
+                else:
+                    # A fresh fold, or one whose owner died: whatever it staged is discarded.
+                    conn.execute("DELETE FROM rollup_staging")
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO rollup_meta(key, value) VALUES (?, ?)",
+                        [
+                            ("backfill", "pending"),
+                            ("backfill_owner", self._owner),
+                            ("backfill_heartbeat", repr(time.time())),
+                            ("backfill_end", str(end_us)),
+                        ],
+                    )
+                    state = "claimed"
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._backfill_end_us = None if state == "done" else end_us
+        return state, end_us
+
+    def _fold_history(self, store: EventStore, end_us: int, batch: int) -> int:
+        """
+        Fold a claimed backfill: stage each batch's buckets together with a heartbeat,
+        then merge the staging table into rollups and mark the backfill done. Stops if
+        the store closes or the claim was taken over. Returns the samples folded.
+        """
+        folded = 0
+        events = store.iter_range(end=from_epoch_us(end_us))
+        for chunk in iter(lambda: list(islice(events, batch)), []):
+            if self._stop.is_set():
+                return folded
+            staged: Dict[BucketKey, _Bucket] = {}
+            count = self._fold(staged, chunk)
+            if not self._commit_staged(staged):
+                return folded
+            folded += count
+        if not self._commit_staged({}, merge=True):
+            return folded
+        self.backfilled_samples += folded
+        return folded
+
+    def _commit_staged(self, staged: Dict[BucketKey, _Bucket], merge: bool = False) -> bool:
+        """Write staged buckets (and merge them all if merge) while this store still owns the backfill."""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                owner = conn.execute("SELECT value FROM rollup_meta WHERE key = 'backfill_owner'").fetchone()
+                if owner is None or owner[0] != self._owner:
+                    conn.rollback()
+                    return False
+                conn.executemany(
+                    f"INSERT INTO rollup_staging({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?,?)" + _MERGE, _rows(staged)
+                )
+                heartbeat = [("backfill_heartbeat", repr(time.time()))]
+                if merge:
+                    conn.execute(f"INSERT INTO rollups({_COLUMNS}) SELECT {_COLUMNS} FROM rollup_staging WHERE true" + _MERGE)
+                    conn.execute("DELETE FROM rollup_staging")
+                    heartbeat.append(("backfill", "done"))
+                conn.executemany("INSERT OR REPLACE INTO rollup_meta(key, value) VALUES (?, ?)", heartbeat)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if merge:
+                self._backfill_end_us = None
+        return True
+
+    def add_events(self, events: List[HCaiEvent]) -> None:
+        """
+        Fold metric samples into every tier's buckets; other events are ignored, as are
+        samples older than a running backfill's end, which it folds itself.
+        """
+        with self._lock:
+            self.folded_samples += self._fold(self._dirty, events, self._backfill_end_us)
+
+    def _fold(self, dirty: Dict[BucketKey, _Bucket], events: List[HCaiEvent], floor_us: Optional[int] = None) -> int:
+        tiers = [(name, width * 1_000_000) for name, width in TIERS.items()]
+        folded = 0
+        for e in events:
+            if e.metric_name is None:
+                continue
+            value = _as_float(e.metric_value)
+            ts_us = coerce_epoch_us(e.timestamp)
+            if value is None or ts_us is None or (floor_us is not None and ts_us < floor_us):
+                continue
+            folded += 1
+            for name, width_us in tiers:
+                key = (name, e.metric_name, e.source_id, ts_us - ts_us % width_us)
+                bucket = dirty.get(key)
+                if bucket is None:
+                    dirty[key] = _Bucket(value, ts_us)
+                else:
+                    bucket.add(value, ts_us)
+        return folded
+
+    def flush(self) -> int:
+        """Upsert dirty buckets into SQLite; returns how many buckets were written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            rows = _rows(self._dirty)
+            with self.conn:
+                self.conn.executemany(f"INSERT INTO rollups({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?,?)" + _MERGE, rows)
+            self._dirty = {}
+            self.flushes += 1
+            return len(rows)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        """Delete buckets older than their tier's TTL; returns the number of rows removed."""
+        now = now or datetime.now(timezone.utc)
+        removed = 0
+        with self._lock:
+            self.flush()
+            with self.conn:
+                for tier, ttl in self.ttls.items():
+                    if ttl is None:
+                        continue
+                    cur = self.conn.execute(
+                        "DELETE FROM rollups WHERE tier = ? AND bucket < ?", (tier, to_epoch_us(now - ttl))
+                    )
+                    removed += cur.rowcount
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dirty = {}
+            with self.conn:
+                self.conn.execute("DELETE FROM rollups")
+                self.conn.execute("DELETE FROM rollup_staging")
+
+    def _tick(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+                if time.monotonic() - self._last_retention >= 3600:
+                    self._last_retention = time.monotonic()
+                    self.apply_retention()
+            except Exception as exc:
+                self.last_error = str(exc)
+
+    def close(self) -> None:
+        self._stop.set()
+        for thread in (self._thread, self._backfill_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
+        try:
+            self.flush()
+            self.conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+    # ------------------------------------------------------------------- reads
+    def series(
+        self,
+        metric_name: Optional[str],
+        tier: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source_id: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Buckets of one tier overlapping [start, end), ordered by metric, source, then time.
+        metric_name None returns every metric.
+        """
+        return points(self.series_rows(metric_name, tier, start, end, source_id), TIERS[tier])
+
+    def series_rows(
+        self,
+        metric_name: Optional[str],
+        tier: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source_id: Optional[str] = None,
+    ) -> List[Row]:
+        """series() as bare rows, for callers that post-process them (e.g. downsampling)."""
+        if tier not in TIERS:
+            raise ValueError(f"tier must be one of {list(TIERS)}")
+        width = TIERS[tier]
+        clauses, params = ["tier = ?"], [tier]
+        if metric_name is not None:
+            clauses.append("metric_name = ?")
+            params.append(metric_name)
+        if source_id is not None:
+            clauses.append("source_id = ?")
+            params.append(source_id)
+        if start is not None:
+            start_us = to_epoch_us(start)
+            clauses.append("bucket >= ?")
+            params.append(start_us - start_us % (width * 1_000_000))
+        if end is not None:
+            clauses.append("bucket < ?")
+            params.append(to_epoch_us(end))
+        with self._lock:
+            self.flush()
+            return self.conn.execute(
+                "SELECT metric_name, source_id, bucket, count, total, total_sq, low, high, last FROM rollups "
+                f"WHERE {' AND '.join(clauses)} ORDER BY metric_name, source_id, bucket",
+                tuple(params),
+            ).fetchall()
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_tier = dict(self.conn.execute("SELECT tier, COUNT(*) FROM rollups GROUP BY tier").fetchall())
+            pending = len(self._dirty)
+        return {
+            "path": str(self._path) if self._path is not None else None,
+            "buckets": per_tier,
+            "pending_buckets": pending,
+            "folded_samples": self.folded_samples,
+            "backfill_pending": self.backfill_pending,
+            "backfilled_samples": self.backfilled_samples,
+            "flushes": self.flushes,
+            "last_error": self.last_error,
+        }
@@ -1,40 +1,484 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import gzip
+import heapq
 import json
+import os
+import shutil
 import sqlite3
-from typing import List, Optional, Iterable
+import threading
+import time
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from bisect import bisect_left, insort
+from itertools import chain, compress, islice
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
+import numpy as np
+
+from hcai_ops.analytics.pool import ConnectionPool, TimedLock
+from hcai_ops.analytics.snapshot import dump_snapshot, load_snapshot
+from hcai_ops.analytics.timeutil import coerce_epoch_us, from_epoch_us, to_epoch_us
+from hcai_ops.analytics.writer import SQLiteWriter
 from hcai_ops.data.schemas import HCaiEvent
 
 
+LevelFilter = Union[str, Iterable[str], None]
+# A keyset page: (id, event) pairs and the id to continue from (None once exhausted).
+# Ids are ints, except for PartitionedSQLiteEventStore's "ts:type:rowid" strings.
+EventId = Union[int, str]
+EventPage = Tuple[List[Tuple[EventId, HCaiEvent]], Optional[EventId]]
+_EMPTY = array("q")
+
+
+class ChangeBatch(NamedTuple):
+    """
+    What changes_since() returns: the events added after the requested sequence number
+    and the sequence number to ask from next time. complete is False when some changes
+    are no longer in the change log (or the store was reset); the consumer should then
+    rebuild from the store instead of applying events.
+    """
+
+    events: List[HCaiEvent]
+    seq: int
+    complete: bool
+
+
+def normalize_levels(log_level: LevelFilter) -> Optional[Tuple[str, ...]]:
+    """Upper-case a single level or a collection of levels; None means no level filter."""
+    if log_level is None:
+        return None
+    if isinstance(log_level, str):
+        return (log_level.upper(),)
+    return tuple(str(level).upper() for level in log_level)
+
+
+def event_matches(
+    event: HCaiEvent,
+    source_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    metric_name: Optional[str] = None,
+    levels: Optional[Tuple[str, ...]] = None,
+) -> bool:
+    """Check an event against the store filter arguments (levels already normalized)."""
+    if source_id is not None and event.source_id != source_id:
+        return False
+    if event_type is not None and event.event_type != event_type:
+        return False
+    if metric_name is not None and event.metric_name != metric_name:
+        return False
+    if levels is not None and str(event.log_level or "").upper() not in levels:
+        return False
+    return True
+
+
 class EventStore:
     """
     In-memory store for HCaiEvent objects.
+
+    Keeps position indexes by source_id, event_type, log level and
+    (metric_name, source_id) series, updated on add_events, so filter/tail/count
+    cost time proportional to the matching set rather than the whole store.
+
+    Every stored event also gets a canonical int64 UTC epoch (microseconds; naive
+    timestamps are read as UTC), and positions are kept sorted by that epoch so
+    since()/range() bisect instead of scanning. In-order arrivals append; late
+    ones are inserted at their sorted place.
     """
 
+    # Events kept in the change log for changes_since(); older changes need a rebuild.
+    CHANGE_LOG_SIZE = 100_000
+
     def __init__(self) -> None:
+        self._listeners: List[Callable[[List[HCaiEvent]], None]] = []
+        # Held while events are applied and recorded in the change feed; see writes_paused().
+        self._write_lock = threading.RLock()
+        self._change_lock = threading.Lock()
+        self._change_seq = 0
+        self._change_floor = 0
+        self._change_log: Deque[Tuple[int, List[HCaiEvent]]] = deque()
+        self._change_logged = 0
         self._events: List[HCaiEvent] = []
 
+    @property
+    def _events(self) -> List[HCaiEvent]:
+        return self._rows
+
+    @_events.setter
+    def _events(self, events: Iterable[HCaiEvent]) -> None:
+        # Assigning the list (reset, eviction, reload) rebuilds every index.
+        self._rows: List[HCaiEvent] = []
+        self._by_source: Dict[str, array] = {}
+        self._by_type: Dict[str, array] = {}
+        self._by_level: Dict[str, array] = {}
+        self._by_series: Dict[Tuple[str, str], array] = {}
+        self._last_seen: Dict[str, Tuple[int, datetime]] = {}
+        self._epochs = array("q")
+        self._by_time = array("q")
+        self._index(list(events))
+
+    def _index(self, events: List[HCaiEvent]) -> None:
+        start = len(self._rows)
+        self._rows.extend(events)
+        by_source, by_type, by_level, by_series = self._by_source, self._by_type, self._by_level, self._by_series
+        last_seen, epochs, by_time = self._last_seen, self._epochs, self._by_time
+        for pos, e in enumerate(events, start):
+            source = e.source_id
+            (by_source.get(source) or by_source.setdefault(source, array("q"))).append(pos)
+            (by_type.get(e.event_type) or by_type.setdefault(e.event_type, array("q"))).append(pos)
+            if e.log_level:
+                level = str(e.log_level).upper()
+                (by_level.get(level) or by_level.setdefault(level, array("q"))).append(pos)
+            if e.metric_name is not None:
+                key = (e.metric_name, source)
+                (by_series.get(key) or by_series.setdefault(key, array("q"))).append(pos)
+            ts = e.timestamp
+            us = coerce_epoch_us(ts)
+            if us is None:
+                us = 0
+            elif isinstance(ts, datetime):
+                seen = last_seen.get(source)
+                if seen is None or us > seen[0]:
+                    last_seen[source] = (us, ts)
+            epochs.append(us)
+            if not by_time or epochs[by_time[-1]] <= us:
+                by_time.append(pos)
+            else:
+                insort(by_time, pos, key=epochs.__getitem__)
+
+    def _drop_oldest(self, n: int) -> List[HCaiEvent]:
+        """
+        Remove the n oldest events by timestamp and return them in arrival order. The
+        index arrays are compacted in place with NumPy instead of being rebuilt from the
+        remaining rows, so the cost does not include re-parsing every timestamp.
+        """
+        rows = self._rows
+        if n <= 0:
+            return []
+        if n >= len(rows):
+            dropped = list(rows)
+            self._events = []
+            return dropped
+        by_time = np.frombuffer(self._by_time, dtype=np.int64)
+        gone = np.sort(by_time[:n])
+        keep = np.ones(len(rows), dtype=bool)
+        keep[gone] = False
+        # Old position -> new position, for the positions that are kept.
+        moved = np.cumsum(keep, dtype=np.int64) - 1
+        dropped = [rows[p] for p in gone.tolist()]
+        if gone[-1] == n - 1:
+            # The oldest events were also the first to arrive: trim the prefix.
+            del rows[:n]
+        else:
+            self._rows = list(compress(rows, keep.tolist()))
+        for index in (self._by_source, self._by_type, self._by_level, self._by_series):
+            for key, positions in list(index.items()):
+                positions = np.frombuffer(positions, dtype=np.int64)
+                positions = positions[keep[positions]]
+                if len(positions):
+                    index[key] = array("q", moved[positions].tobytes())
+                else:
+                    del index[key]
+        # A source's newest event is evicted only together with all of its others.
+        for source in [source for source in self._last_seen if source not in self._by_source]:
+            del self._last_seen[source]
+        self._epochs = array("q", np.frombuffer(self._epochs, dtype=np.int64)[keep].tobytes())
+        self._by_time = array("q", moved[by_time[n:]].tobytes())
+        return dropped
+
+    def _index_state(self) -> dict:
+        """Copies of the index structures, for snapshots; see _restore_index."""
+        return {
+            "by_source": {key: positions[:] for key, positions in self._by_source.items()},
+            "by_type": {key: positions[:] for key, positions in self._by_type.items()},
+            "by_level": {key: positions[:] for key, positions in self._by_level.items()},
+            "by_series": {key: positions[:] for key, positions in self._by_series.items()},
+            "last_seen": dict(self._last_seen),
+            "epochs": self._epochs[:],
+            "by_time": self._by_time[:],
+        }
+
+    def _restore_index(self, rows: List[HCaiEvent], state: dict) -> None:
+        """Install rows with index structures saved by _index_state, skipping the rebuild."""
+        self._rows = rows
+        self._by_source = state["by_source"]
+        self._by_type = state["by_type"]
+        self._by_level = state["by_level"]
+        self._by_series = state["by_series"]
+        self._last_seen = state["last_seen"]
+        self._epochs = state["epochs"]
+        self._by_time = state["by_time"]
+
+    def _positions(
+        self,
+        source_id: Optional[str],
+        event_type: Optional[str],
+        metric_name: Optional[str],
+        levels: Optional[Tuple[str, ...]],
+    ) -> Optional[Sequence[int]]:
+        """Smallest index posting list that covers one of the filters; None if no index applies."""
+        candidates: List[Sequence[int]] = []
+        if source_id is not None and metric_name is not None:
+            candidates.append(self._by_series.get((metric_name, source_id), _EMPTY))
+        elif source_id is not None:
+            candidates.append(self._by_source.get(source_id, _EMPTY))
+        if event_type is not None:
+            candidates.append(self._by_type.get(event_type, _EMPTY))
+        if levels is not None:
+            lists = [self._by_level.get(level, _EMPTY) for level in levels]
+            candidates.append(lists[0] if len(lists) == 1 else sorted(chain.from_iterable(lists)))
+        if not candidates:
+            return None
+        return min(candidates, key=len)
+
     def add_events(self, events: List[HCaiEvent]) -> None:
         """Append events to the store."""
-        self._events.extend(events)
+        events = list(events)
+        with self._write_lock:
+            self._index(events)
+            self._record_changes(events)
+        self._call_listeners(events)
+
+    def add_listener(self, callback: Callable[[List[HCaiEvent]], None]) -> None:
+        """
+        Call callback with every batch passed to add_events. Events loaded back from
+        storage (startup, reload) are not replayed to listeners.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[List[HCaiEvent]], None]) -> None:
+        """Stop calling a callback registered with add_listener."""
+        self._listeners.remove(callback)
+
+    # ------------------------------------------------------------- change feed
+    @property
+    def seq(self) -> int:
+        """
+        Sequence number of the newest change: it grows by one per event added (by this
+        process or picked up from other writers on reload) and by one per reset, and
+        never goes back, so an unchanged seq means an unchanged store.
+        """
+        return self._change_seq
+
+    def changes_since(self, seq: int) -> ChangeBatch:
+        """Events added after sequence number seq, oldest first; see ChangeBatch."""
+        with self._change_lock:
+            current, floor = self._change_seq, self._change_floor
+            if seq == current:
+                return ChangeBatch([], current, True)
+            complete = floor <= seq < current
+            since = seq if complete else floor
+            batches = []
+            for first, events in reversed(self._change_log):
+                if first + len(events) - 1 <= since:
+                    break
+                batches.append(events if first > since else events[since - first + 1 :])
+        return ChangeBatch([e for events in reversed(batches) for e in events], current, complete)
+
+    @contextmanager
+    def writes_paused(self) -> Iterator[int]:
+        """
+        Hold off add_events and reloads for the duration of the block and yield seq, so
+        whatever the block reads from the store is exactly its contents at that seq.
+        """
+        with self._write_lock:
+            yield self.seq
+
+    def mark_reset(self) -> None:
+        """
+        Record that the store was emptied or replaced: the change log is dropped and every
+        consumer's next changes_since() comes back incomplete.
+        """
+        with self._change_lock:
+            self._change_seq += 1
+            self._change_floor = self._change_seq
+            self._change_log.clear()
+            self._change_logged = 0
+
+    def _record_changes(self, events: List[HCaiEvent]) -> None:
+        if not events:
+            return
+        with self._change_lock:
+            self._change_log.append((self._change_seq + 1, list(events)))
+            self._change_seq += len(events)
+            self._change_logged += len(events)
+            while self._change_logged > self.CHANGE_LOG_SIZE and len(self._change_log) > 1:
+                first, dropped = self._change_log.popleft()
+                self._change_logged -= len(dropped)
+                self._change_floor = first + len(dropped) - 1
+
+    def _call_listeners(self, events: List[HCaiEvent]) -> None:
+        for callback in self._listeners:
+            try:
+                callback(events)
+            except Exception:
+                # A failing listener must not break ingestion.
+                pass
 
     def all(self) -> List[HCaiEvent]:
         """Return a copy of all events."""
         return list(self._events)
 
     def since(self, dt: datetime) -> List[HCaiEvent]:
-        """Return events occurring at or after the provided datetime."""
-        return [event for event in self._events if event.timestamp >= dt]
+        """Return events occurring at or after the provided datetime, in time order."""
+        return self.range(dt)
 
-    def filter(self, *, source_id: Optional[str] = None, event_type: Optional[str] = None) -> List[HCaiEvent]:
-        """Filter events by optional source_id and event_type."""
-        events = self._events
-        if source_id is not None:
-            events = [e for e in events if e.source_id == source_id]
-        if event_type is not None:
-            events = [e for e in events if e.event_type == event_type]
-        return list(events)
+    def _time_slice(self, start: Optional[datetime], end: Optional[datetime]) -> Sequence[int]:
+        """Positions with start <= epoch < end, in time order (O(log n) to locate)."""
+        by_time, key = self._by_time, self._epochs.__getitem__
+        lo = bisect_left(by_time, to_epoch_us(start), key=key) if start is not None else 0
+        hi = bisect_left(by_time, to_epoch_us(end), key=key) if end is not None else len(by_time)
+        return by_time[lo:hi]
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Events with start <= timestamp < end (either bound optional), oldest first."""
+        rows = self._rows
+        window = [rows[p] for p in self._time_slice(start, end)]
+        if source_id is None and event_type is None and metric_name is None and log_level is None:
+            return window
+        levels = normalize_levels(log_level)
+        return [e for e in window if event_matches(e, source_id, event_type, metric_name, levels)]
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """
+        Lazy range(): the same events in the same order, produced one at a time so a
+        caller streaming a large window never holds the whole list.
+        """
+        rows = self._rows
+        levels = normalize_levels(log_level)
+        for p in self._time_slice(start, end):
+            e = rows[p]
+            if event_matches(e, source_id, event_type, metric_name, levels):
+                yield e
+
+    def filter(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Filter events by optional source_id, event_type, metric_name and log level(s), oldest first."""
+        return list(self._matching(source_id, event_type, metric_name, normalize_levels(log_level)))
+
+    def _matching(
+        self,
+        source_id: Optional[str],
+        event_type: Optional[str],
+        metric_name: Optional[str],
+        levels: Optional[Tuple[str, ...]],
+    ) -> Iterator[HCaiEvent]:
+        """In-memory events matching the filters, oldest first (subclasses' cold tiers excluded)."""
+        positions = self._positions(source_id, event_type, metric_name, levels)
+        rows = self._rows
+        candidates = rows if positions is None else (rows[p] for p in positions)
+        return (e for e in candidates if event_matches(e, source_id, event_type, metric_name, levels))
+
+    def tail(
+        self,
+        limit: Optional[int] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Iterate matching events newest-first (by arrival), stopping after limit if given."""
+        levels = normalize_levels(log_level)
+        positions = self._positions(source_id, event_type, metric_name, levels)
+        rows = self._rows
+        candidates = reversed(rows) if positions is None else (rows[p] for p in reversed(positions))
+        matching = (e for e in candidates if event_matches(e, source_id, event_type, metric_name, levels))
+        return islice(matching, limit) if limit is not None else matching
+
+    def page(
+        self,
+        limit: int = 100,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> EventPage:
+        """
+        Keyset pagination over event ids (arrival order). With after_id, events with a
+        larger id oldest-first; otherwise events below before_id (default: the newest)
+        newest-first. Returns (items, next_id): pass next_id back as after_id/before_id
+        for the following page. Cost depends on the page, not on the offset.
+
+        Here ids are 1-based positions in the store, stable until it is reset or evicted.
+        """
+        levels = normalize_levels(log_level)
+        positions = self._positions(source_id, event_type, metric_name, levels)
+        if positions is None:
+            positions = range(len(self._rows))
+        if after_id is not None:
+            lo = bisect_left(positions, after_id)
+            candidates = (positions[i] for i in range(lo, len(positions)))
+        else:
+            hi = bisect_left(positions, before_id - 1) if before_id is not None else len(positions)
+            candidates = (positions[i] for i in range(hi - 1, -1, -1))
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        rows, epochs = self._rows, self._epochs
+        items: List[Tuple[int, HCaiEvent]] = []
+        for pos in candidates:
+            us = epochs[pos]
+            if start_us is not None and us < start_us or end_us is not None and us >= end_us:
+                continue
+            event = rows[pos]
+            if event_matches(event, source_id, event_type, metric_name, levels):
+                if len(items) == limit:
+                    return items, items[-1][0]
+                items.append((pos + 1, event))
+        return items, None
+
+    def count(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> int:
+        """Count matching events; a single indexed filter is answered from the index size."""
+        filters = [f for f in (source_id, event_type, metric_name, log_level) if f is not None]
+        if not filters:
+            return len(self._rows)
+        levels = normalize_levels(log_level)
+        if len(filters) == 1 and metric_name is None:
+            positions = self._positions(source_id, event_type, None, levels)
+            return len(positions) if positions is not None else 0
+        return sum(1 for _ in self._matching(source_id, event_type, metric_name, levels))
+
+    def last_seen(self) -> Dict[str, datetime]:
+        """Latest timestamp per source_id, maintained on ingest."""
+        return {source: ts for source, (_, ts) in self._last_seen.items()}
 
     def reload(self) -> int:
         """
@@ -46,20 +490,57 @@ class EventStore:
 
 class PersistentEventStore(EventStore):
     """
-    Event store that persists events to a JSONL file for reuse across restarts.
+    Event store that persists events to segmented JSONL files for reuse across restarts.
+
+    New lines are appended to ``path`` (the active segment). Once it grows past
+    max_segment_bytes it is renamed into ``<path>.segments/NNNNNNNN.jsonl`` and a
+    fresh active file starts. A sidecar ``index.json`` in that directory keeps the
+    time bounds, event count and size of every closed segment, so:
+
+    * with hot_window, startup only parses segments that reach into the window; reads
+      merge the skipped segments back in from disk (range()/since() open only those
+      whose time bounds overlap the requested window, and an unfiltered count() takes
+      their sizes from the index);
+    * closed segments can be gzipped (compress_segments) or dropped whole
+      (drop_segments_before) without rewriting anything else.
+
+    The index is a cache: entries whose size no longer matches the file (or that
+    are missing) are rebuilt by scanning that one segment. A plain legacy
+    events.jsonl is simply the first active segment.
     """
 
-    def __init__(self, path: Path) -> None:
+    INDEX_NAME = "index.json"
+    DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        hot_window: Optional[timedelta] = None,
+    ) -> None:
         super().__init__()
         self._path = path
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self.segment_dir = segment_dir(path)
+        self.max_segment_bytes = max_segment_bytes
+        self.hot_window = hot_window
         self.total_ingested: int = 0
         self.last_error: Optional[str] = None
         self.last_ingest_at: Optional[datetime] = None
+        # Byte offset just past the last complete line read from the active segment.
+        self._offset = 0
+        # Highest closed segment already read (or deliberately left cold).
+        self._last_seq = 0
+        # Closed segments not loaded into memory (older than hot_window at startup).
+        self._cold_segments: List[int] = []
+        # Time bounds and count of the active segment, recorded in the index on rotation.
+        self._active_meta = _SegmentStats()
+        # Cold segments' last_seen(), cached with the segment list it was read from.
+        self._cold_seen: Tuple[Tuple[int, ...], Dict[str, Tuple[int, datetime]]] = ((), {})
         self._load()
 
     def _serialize(self, event: HCaiEvent) -> dict:
-        data = event.__dict__.copy()
+        data = event.to_dict()
         ts = data.get("timestamp")
         if hasattr(ts, "isoformat"):
             data["timestamp"] = ts.isoformat()
@@ -67,29 +548,205 @@ class PersistentEventStore(EventStore):
 
     def _deserialize(self, data: dict) -> Optional[HCaiEvent]:
         try:
-            ts = data.get("timestamp")
-            if isinstance(ts, str):
-                data["timestamp"] = datetime.fromisoformat(ts)
-            return HCaiEvent(**data)
+            return HCaiEvent.from_dict(data)
         except Exception:
             return None
 
-    def _load(self) -> None:
-        if not self._path.exists():
+    # ---------------------------------------------------------------- segments
+    def _segment_path(self, seq: int, compressed: bool = False) -> Path:
+        return self.segment_dir / (f"{seq:08d}.jsonl.gz" if compressed else f"{seq:08d}.jsonl")
+
+    def _closed_segments(self) -> Dict[int, Path]:
+        """Closed segment files on disk by sequence number."""
+        if not self.segment_dir.is_dir():
+            return {}
+        found: Dict[int, Path] = {}
+        for entry in self.segment_dir.iterdir():
+            stem = entry.name.split(".", 1)[0]
+            if stem.isdigit() and entry.name.endswith((".jsonl", ".jsonl.gz")):
+                found[int(stem)] = entry
+        return dict(sorted(found.items()))
+
+    def _read_index(self) -> Dict[int, dict]:
+        try:
+            raw = json.loads((self.segment_dir / self.INDEX_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {int(entry["seq"]): entry for entry in raw.get("segments", [])}
+
+    def _write_index(self, entries: Dict[int, dict]) -> None:
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        target = self.segment_dir / self.INDEX_NAME
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"segments": [entries[seq] for seq in sorted(entries)]}), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def segments(self) -> List[dict]:
+        """
+        Index entries of the closed segments, oldest first: seq, first_us/last_us (min and
+        max event epoch, None if no timestamp parsed), events, bytes (size on disk), compressed.
+        Stale or missing entries are rebuilt and written back.
+        """
+        entries = self._read_index()
+        files = self._closed_segments()
+        fresh: Dict[int, dict] = {}
+        changed = set(entries) != set(files)
+        for seq, seg_path in files.items():
+            entry = entries.get(seq)
+            size = seg_path.stat().st_size
+            compressed = seg_path.suffix == ".gz"
+            if entry is None or entry.get("bytes") != size or entry.get("compressed") != compressed:
+                stats = _SegmentStats()
+                for evt in self._iter_segment(seg_path):
+                    stats.add(evt)
+                entry = stats.entry(seq, size, compressed)
+                changed = True
+            fresh[seq] = entry
+        if changed:
+            try:
+                self._write_index(fresh)
+            except OSError:
+                self.last_error = "Failed to write segment index"
+        return list(fresh.values())
+
+    def _iter_segment(self, seg_path: Path, offset: int = 0) -> Iterator[HCaiEvent]:
+        """Events of one segment file from a byte offset (uncompressed), skipping bad lines."""
+        opener = gzip.open if seg_path.suffix == ".gz" else open
+        with opener(seg_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    obj = json.loads(line)
+                except Exception:
+                    continue
+                evt = self._deserialize(obj)
+                if evt:
+                    yield evt
+
+    def _rotate(self) -> None:
+        """Close the active segment: rename it into the segment directory and index it."""
+        if any(seq > self._last_seq for seq in self._closed_segments()):
+            # Another writer rotated first; the next read catches up with its segment.
             return
+        seq = self._last_seq + 1
+        target = self._segment_path(seq)
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        os.replace(self._path, target)
+        entries = self._read_index()
+        entries[seq] = self._active_meta.entry(seq, self._offset, False)
+        self._write_index(entries)
+        self._last_seq = seq
+        self._offset = 0
+        self._active_meta = _SegmentStats()
+
+    def compress_segments(self) -> int:
+        """Gzip closed segments that are still plain JSONL; returns how many were compressed."""
+        done = 0
+        for seq, seg_path in self._closed_segments().items():
+            if seg_path.suffix == ".gz":
+                continue
+            target = self._segment_path(seq, compressed=True)
+            tmp = target.with_name(target.name + ".tmp")
+            with seg_path.open("rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, target)
+            seg_path.unlink()
+            done += 1
+        if done:
+            self.segments()
+        return done
+
+    def drop_segments_before(self, cutoff: datetime) -> List[int]:
+        """
+        Delete closed segments whose newest event is older than cutoff; returns their
+        sequence numbers. Events already in memory stay there until the next restart.
+        """
+        cutoff_us = to_epoch_us(cutoff)
+        dropped = []
+        for entry in self.segments():
+            if entry["last_us"] is not None and entry["last_us"] < cutoff_us:
+                self._segment_path(entry["seq"], entry["compressed"]).unlink(missing_ok=True)
+                dropped.append(entry["seq"])
+        if dropped:
+            self._cold_segments = [seq for seq in self._cold_segments if seq not in dropped]
+            self.segments()
+            self.mark_reset()
+        return dropped
+
+    def truncate(self) -> None:
+        """Delete every segment and the active file, and empty the in-memory store."""
+        if self.segment_dir.exists():
+            shutil.rmtree(self.segment_dir)
+        self._path.write_text("", encoding="utf-8")
+        self._events = []
+        self._offset = 0
+        self._last_seq = 0
+        self._cold_segments = []
+        self._active_meta = _SegmentStats()
+        self.mark_reset()
+
+    # ------------------------------------------------------------------ loading
+    def _load(self) -> None:
+        self._offset = 0
+        self._last_seq = 0
+        self._cold_segments = []
+        self._active_meta = _SegmentStats()
         try:
-            with self._path.open("r", encoding="utf-8") as f:
+            floor_us = None
+            if self.hot_window is not None:
+                floor_us = to_epoch_us(datetime.now(timezone.utc) - self.hot_window)
+            loaded: List[HCaiEvent] = []
+            for entry in self.segments():
+                seq = entry["seq"]
+                if floor_us is not None and entry["last_us"] is not None and entry["last_us"] < floor_us:
+                    self._cold_segments.append(seq)
+                else:
+                    loaded.extend(self._iter_segment(self._segment_path(seq, entry["compressed"])))
+                self._last_seq = seq
+            self._index(loaded)
+            self._read_new(record=False)
+        except Exception:
+            # If load fails, keep running with in-memory empty store.
+            self._events = []
+
+    def _read_new(self, record: bool = True) -> int:
+        """
+        Read complete lines written since the last read; returns how many events were added.
+        Segments closed in the meantime are read first, the one we were tailing from the
+        current offset. Unless record is False (the startup load), they enter the change feed.
+        """
+        added: List[HCaiEvent] = []
+        for seq, seg_path in self._closed_segments().items():
+            if seq <= self._last_seq:
+                continue
+            added.extend(self._iter_segment(seg_path, self._offset))
+            self._last_seq = seq
+            self._offset = 0
+            self._active_meta = _SegmentStats()
+        if self._path.exists():
+            stats = self._active_meta
+            with self._path.open("rb") as f:
+                f.seek(self._offset)
                 for line in f:
+                    if not line.endswith(b"\n"):
+                        # Partial line from a concurrent writer; pick it up on the next read.
+                        break
+                    self._offset += len(line)
                     try:
                         obj = json.loads(line)
                     except Exception:
                         continue
                     evt = self._deserialize(obj)
                     if evt:
-                        self._events.append(evt)
-        except Exception:
-            # If load fails, keep running with in-memory empty store.
-            self._events = []
+                        stats.add(evt)
+                        added.append(evt)
+        with self._write_lock:
+            self._index(added)
+            if record:
+                self._record_changes(added)
+        return len(added)
 
     def add_events(self, events: List[HCaiEvent]) -> None:
         super().add_events(events)
@@ -97,14 +754,266 @@ class PersistentEventStore(EventStore):
         if events:
             self.last_ingest_at = datetime.utcnow()
         try:
+            if self._path.exists() and self._path.stat().st_size > self._offset:
+                # Another writer appended; read those lines first so the offset stays exact.
+                self._read_new()
             with self._path.open("a", encoding="utf-8") as f:
                 for e in events:
                     json.dump(self._serialize(e), f)
                     f.write("\n")
+                    self._active_meta.add(e)
+                f.flush()
+                self._offset = f.tell()
+            if self._offset >= self.max_segment_bytes:
+                self._rotate()
         except Exception:
             # Ignore persistence failures to avoid breaking ingestion.
             self.last_error = "Failed to append to JSONL"
 
+    # -------------------------------------------------------------------- reads
+    def _cold_entries(self) -> List[dict]:
+        """Index entries of the segments hot_window left on disk, oldest first."""
+        if not self._cold_segments:
+            return []
+        cold = set(self._cold_segments)
+        return [entry for entry in self.segments() if entry["seq"] in cold]
+
+    def _cold_numbered(
+        self,
+        entries: List[dict],
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        levels: Optional[Tuple[str, ...]] = None,
+        start_us: Optional[int] = None,
+        end_us: Optional[int] = None,
+        after_id: int = 0,
+        before_id: Optional[int] = None,
+        descending: bool = False,
+    ) -> Iterator[Tuple[int, int, HCaiEvent]]:
+        """
+        (id, epoch-us, event) for matching events of the given cold segments in arrival
+        order (reversed if descending), where ids number the segments' events from 1 in
+        order. Segments whose indexed time bounds or id span cannot match are not opened.
+        """
+        spans, first_id = [], 1
+        for entry in entries:
+            spans.append((first_id, entry))
+            first_id += entry["events"]
+        for first_id, entry in reversed(spans) if descending else spans:
+            if first_id + entry["events"] - 1 <= after_id or before_id is not None and first_id >= before_id:
+                continue
+            if entry["first_us"] is not None:
+                if start_us is not None and entry["last_us"] < start_us:
+                    continue
+                if end_us is not None and entry["first_us"] >= end_us:
+                    continue
+            events = self._iter_segment(self._segment_path(entry["seq"], entry["compressed"]))
+            numbered = enumerate(events, first_id)
+            for event_id, evt in reversed(list(numbered)) if descending else numbered:
+                if event_id <= after_id or before_id is not None and event_id >= before_id:
+                    continue
+                us = coerce_epoch_us(evt.timestamp)
+                us = 0 if us is None else us
+                if start_us is not None and us < start_us or end_us is not None and us >= end_us:
+                    continue
+                if event_matches(evt, source_id, event_type, metric_name, levels):
+                    yield event_id, us, evt
+
+    def all(self) -> List[HCaiEvent]:
+        """Every event in arrival order: cold segments from disk, then memory."""
+        cold = [evt for _, _, evt in self._cold_numbered(self._cold_entries())]
+        return cold + list(self._events)
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """
+        Served from memory; segments left on disk by hot_window are merged in when
+        their indexed time bounds overlap [start, end).
+        """
+        hot = super().range(
+            start, end, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+        )
+        if not self._cold_segments:
+            return hot
+        cold = [
+            (us, evt)
+            for _, us, evt in self._cold_numbered(
+                self._cold_entries(),
+                source_id=source_id,
+                event_type=event_type,
+                metric_name=metric_name,
+                levels=normalize_levels(log_level),
+                start_us=to_epoch_us(start) if start is not None else None,
+                end_us=to_epoch_us(end) if end is not None else None,
+            )
+        ]
+        if not cold:
+            return hot
+        cold.sort(key=lambda item: item[0])
+        hot_keyed = ((coerce_epoch_us(e.timestamp) or 0, e) for e in hot)
+        return [evt for _, evt in heapq.merge(cold, hot_keyed, key=lambda item: item[0])]
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Lazy while everything is in memory; with cold segments it falls back to range()."""
+        kwargs = dict(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        if not self._cold_segments:
+            return super().iter_range(start, end, **kwargs)
+        return iter(self.range(start, end, **kwargs))
+
+    def filter(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """Matching events in arrival order, cold segments included."""
+        filters = dict(source_id=source_id, event_type=event_type, metric_name=metric_name)
+        hot = super().filter(log_level=log_level, **filters)
+        if not self._cold_segments:
+            return hot
+        cold = self._cold_numbered(self._cold_entries(), levels=normalize_levels(log_level), **filters)
+        return [evt for _, _, evt in cold] + hot
+
+    def tail(
+        self,
+        limit: Optional[int] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """Newest first: memory, then the cold segments, opened newest first only as needed."""
+        filters = dict(source_id=source_id, event_type=event_type, metric_name=metric_name)
+        events = super().tail(log_level=log_level, **filters)
+        if self._cold_segments:
+            cold = self._cold_numbered(
+                self._cold_entries(), levels=normalize_levels(log_level), descending=True, **filters
+            )
+            events = chain(events, (evt for _, _, evt in cold))
+        return islice(events, limit) if limit is not None else events
+
+    def page(
+        self,
+        limit: int = 100,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> EventPage:
+        """
+        EventStore.page over the cold segments and memory together: ids number the cold
+        segments' events first (by the index's per-segment counts), then memory's, so
+        they stay stable while the set of cold segments does.
+        """
+        filters = dict(source_id=source_id, event_type=event_type, metric_name=metric_name)
+        entries = self._cold_entries()
+        if not entries:
+            return super().page(
+                limit, after_id=after_id, before_id=before_id, log_level=log_level, start=start, end=end, **filters
+            )
+        offset = sum(entry["events"] for entry in entries)
+        cold = partial(
+            self._cold_numbered,
+            entries,
+            levels=normalize_levels(log_level),
+            start_us=to_epoch_us(start) if start is not None else None,
+            end_us=to_epoch_us(end) if end is not None else None,
+            **filters,
+        )
+
+        def hot(ascending: bool, cursor: Optional[int]) -> Iterator[Tuple[int, HCaiEvent]]:
+            while True:
+                items, cursor = EventStore.page(
+                    self,
+                    500,
+                    after_id=cursor if ascending else None,
+                    before_id=None if ascending else cursor,
+                    log_level=log_level,
+                    start=start,
+                    end=end,
+                    **filters,
+                )
+                yield from ((pos_id + offset, evt) for pos_id, evt in items)
+                if cursor is None:
+                    return
+
+        if after_id is not None:
+            numbered = chain(
+                ((event_id, evt) for event_id, _, evt in cold(after_id=after_id)),
+                hot(True, max(after_id - offset, 0)),
+            )
+        else:
+            hot_before = before_id - offset if before_id is not None else None
+            numbered = chain(
+                hot(False, hot_before) if hot_before is None or hot_before > 1 else iter(()),
+                ((event_id, evt) for event_id, _, evt in cold(before_id=before_id, descending=True)),
+            )
+        items = list(islice(numbered, limit + 1))
+        if len(items) > limit:
+            return items[:limit], items[limit - 1][0]
+        return items, None
+
+    def count(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> int:
+        """Memory's count plus the cold segments': from the index when unfiltered, else by reading them."""
+        filters = dict(source_id=source_id, event_type=event_type, metric_name=metric_name)
+        hot = super().count(log_level=log_level, **filters)
+        entries = self._cold_entries()
+        if not entries:
+            return hot
+        if source_id is None and event_type is None and metric_name is None and log_level is None:
+            return hot + sum(entry["events"] for entry in entries)
+        return hot + sum(1 for _ in self._cold_numbered(entries, levels=normalize_levels(log_level), **filters))
+
+    def last_seen(self) -> Dict[str, datetime]:
+        """Latest timestamp per source_id; the cold segments' share is read once and cached."""
+        key = tuple(self._cold_segments)
+        if self._cold_seen[0] != key:
+            cold: Dict[str, Tuple[int, datetime]] = {}
+            for _, us, evt in self._cold_numbered(self._cold_entries()):
+                seen = cold.get(evt.source_id)
+                if isinstance(evt.timestamp, datetime) and (seen is None or us > seen[0]):
+                    cold[evt.source_id] = (us, evt.timestamp)
+            self._cold_seen = (key, cold)
+        merged = dict(self._cold_seen[1])
+        for source, seen in self._last_seen.items():
+            if source not in merged or seen[0] > merged[source][0]:
+                merged[source] = seen
+        return {source: ts for source, (_, ts) in merged.items()}
+
     def stats(self) -> dict:
         return {
             "total_ingested": self.total_ingested,
@@ -112,25 +1021,159 @@ class PersistentEventStore(EventStore):
             "last_ingest_at": self.last_ingest_at.isoformat() if self.last_ingest_at else None,
             "last_error": self.last_error,
             "path": str(self._path),
+            "offset": self._offset,
+            "segments": len(self._closed_segments()),
+            "cold_segments": len(self._cold_segments),
+            "max_segment_bytes": self.max_segment_bytes,
         }
 
     def reload(self) -> int:
-        """Reload events from JSONL into memory."""
-        self._events = []
-        self._load()
+        """
+        Pull in lines appended (and segments closed) since the last read. Falls back to a
+        full reload if the active file shrank without a rotation (truncated or replaced).
+        """
+        rotated = any(seq > self._last_seq for seq in self._closed_segments())
+        size = self._path.stat().st_size if self._path.exists() else 0
+        if size < self._offset and not rotated:
+            self._events = []
+            self._load()
+            self.mark_reset()
+            return len(self._events)
+        try:
+            self._read_new()
+        except Exception:
+            self.last_error = "Failed to read JSONL tail"
         return len(self._events)
 
 
+def segment_dir(path: Path) -> Path:
+    """Directory holding the closed segments (and their index) of a JSONL event log."""
+    return path.with_name(path.name + ".segments")
+
+
+class _SegmentStats:
+    __slots__ = ("first_us", "last_us", "events")
+
+    def __init__(self) -> None:
+        self.first_us: Optional[int] = None
+        self.last_us: Optional[int] = None
+        self.events = 0
+
+    def add(self, event: HCaiEvent) -> None:
+        self.events += 1
+        us = coerce_epoch_us(event.timestamp)
+        if us is None:
+            return
+        if self.first_us is None or us < self.first_us:
+            self.first_us = us
+        if self.last_us is None or us > self.last_us:
+            self.last_us = us
+
+    def entry(self, seq: int, size: int, compressed: bool) -> dict:
+        return {
+            "seq": seq,
+            "first_us": self.first_us,
+            "last_us": self.last_us,
+            "events": self.events,
+            "bytes": size,
+            "compressed": compressed,
+        }
+
+
 class SQLiteEventStore(EventStore):
     """
     Event store backed by SQLite for better durability and filtering.
+
+    By default every row is mirrored in memory. Passing hot_window and/or hot_bytes
+    turns memory into a bounded hot tier: only events newer than hot_start stay in
+    memory, older ranges are read from SQLite on demand.
+
+    Besides the JSON payload, metric_name, metric_value, log_level (upper-cased),
+    alert_id and incident_label are stored as typed, indexed columns so filters and
+    metric summaries run in SQL without decoding payloads.
+
+    With snapshot_path set, the in-memory state (events plus indexes) is written to a
+    binary snapshot every snapshot_interval seconds and on close, tagged with the last
+    row id it covers. Startup loads the snapshot and decodes only the rows after it.
+
+    With shared=True several processes (API workers) can use one database file:
+    add_events only writes to SQLite, and memory follows the table in row id order.
+    Every read first checks PRAGMA data_version, a per-connection counter SQLite bumps
+    whenever another connection commits, and pulls new rows only when it moved, so all
+    workers converge on the same view and see their own writes.
+
+    Connections are never shared between threads without a lock: queries that only
+    read the table (cold ranges, counts, summaries) borrow a read-only connection from
+    a pool, writes go through the single writer thread (or, with async_writes=False,
+    the control connection), and the control connection used for loading, reloads
+    and migrations is guarded by a lock whose wait time is reported in stats().
     """
 
-    def __init__(self, path: Path) -> None:
+    TYPED_COLUMNS = (
+        ("metric_name", "TEXT"),
+        ("metric_value", "REAL"),
+        ("log_level", "TEXT"),
+        ("alert_id", "TEXT"),
+        ("incident_label", "TEXT"),
+    )
+    # PRAGMA user_version once every row has its typed columns filled in.
+    SCHEMA_VERSION = 2
+
+    # WAL lets readers proceed while the writer commits; NORMAL sync is durable across
+    # application crashes in WAL mode and avoids an fsync per transaction.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA temp_store=MEMORY",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        async_writes: bool = True,
+        batch_size: int = 5000,
+        hot_window: Optional[timedelta] = None,
+        hot_bytes: Optional[int] = None,
+        snapshot_path: Optional[Path] = None,
+        snapshot_interval: Optional[float] = None,
+        shared: bool = False,
+        read_pool_size: int = 4,
+    ) -> None:
         super().__init__()
+        self.shared = shared
+        self._data_version: Optional[int] = None
+        self.syncs: int = 0
+        self.hot_window = hot_window
+        self.hot_bytes = hot_bytes
+        # Epoch-us boundary of the hot tier; None means every row is in memory.
+        self.hot_start_us: Optional[int] = None
+        self.evicted_events: int = 0
+        self._hot_size = 0
+        self._last_age_check = 0.0
+        # Highest row id reflected in memory, plus id ranges this store inserted itself,
+        # so reload() only pulls rows written by other processes.
+        self._last_id = 0
+        self._own_ranges: List[List[int]] = []
+        self._own_lock = threading.Lock()
+        self._typed_ready = threading.Event()
+        self._migration_stop = threading.Event()
+        self._migration_thread: Optional[threading.Thread] = None
+        self.migration_error: Optional[str] = None
+        # Held while events enter memory and the write queue, so a snapshot can pair the
+        # in-memory state with an exact row id high-water mark. It is the store's write
+        # lock, so writes_paused() holds off ingest and reloads too.
+        self._ingest_lock = self._write_lock
+        self.snapshot_path = snapshot_path
+        self._snapshot_id: Optional[int] = None
+        self.last_snapshot: Optional[dict] = None
+        self.startup: dict = {}
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
         self._path = path
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn_lock = TimedLock()
+        self.conn = self._connect()
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS events (
@@ -146,10 +1189,168 @@ class SQLiteEventStore(EventStore):
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source ON events(source_id)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type)")
         self.conn.commit()
-        self._load_all()
+        self._migrate()
+        self._readers = ConnectionPool(self._connect_reader, read_pool_size)
+        self._writer: Optional[SQLiteWriter] = (
+            SQLiteWriter(self._connect, self._write_batch, max_batch=batch_size) if async_writes else None
+        )
+        started = time.perf_counter()
+        if not self._load_snapshot():
+            self._load_all()
+            self.startup = {"source": "database", "events": len(self._events)}
+        self.startup["seconds"] = time.perf_counter() - started
+        if snapshot_path is not None and snapshot_interval:
+            self._snapshot_thread = threading.Thread(
+                target=self._snapshot_loop, args=(snapshot_interval,), name="hcai-snapshot", daemon=True
+            )
+            self._snapshot_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"{self._path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA cache_size=-16384")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _migrate(self) -> None:
+        """
+        Bring older databases up to date without rewriting the table: add the integer
+        ts_epoch column (backfilled here, in chunks) and the typed columns. Typed
+        columns of pre-existing rows are backfilled on a background thread while the
+        store serves requests; SQL-side filters and aggregates switch on once it is done.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(events)")}
+        if "ts_epoch" not in columns:
+            self.conn.execute("ALTER TABLE events ADD COLUMN ts_epoch INTEGER")
+        for name, decl in self.TYPED_COLUMNS:
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE events ADD COLUMN {name} {decl}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts_epoch ON events(ts_epoch)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_source_type_ts ON events(source_id, event_type, ts_epoch)"
+        )
+        # Covers both GROUP BYs in metric_series() so they never touch the table rows.
+        self.conn.execute("DROP INDEX IF EXISTS idx_events_metric")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_metric_ts ON events(metric_name, source_id, ts_epoch, metric_value) "
+            "WHERE metric_name IS NOT NULL"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_level ON events(log_level, ts_epoch) WHERE log_level IS NOT NULL"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_alert ON events(alert_id) WHERE alert_id IS NOT NULL")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_incident ON events(incident_label) WHERE incident_label IS NOT NULL"
+        )
+        while True:
+            rows = self.conn.execute("SELECT id, ts FROM events WHERE ts_epoch IS NULL LIMIT 10000").fetchall()
+            if not rows:
+                break
+            self.conn.executemany(
+                "UPDATE events SET ts_epoch = ? WHERE id = ?",
+                [(coerce_epoch_us(ts) or 0, row_id) for row_id, ts in rows],
+            )
+        self.conn.commit()
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        upto = self._max_id()
+        if version >= self.SCHEMA_VERSION or upto == 0:
+            self._set_schema_version(self.conn)
+            self._typed_ready.set()
+            return
+        # Rows written from now on carry typed values; only ids <= upto need a backfill.
+        self._migration_thread = threading.Thread(
+            target=self._backfill_typed, args=(upto,), name="hcai-sqlite-migrate", daemon=True
+        )
+        self._migration_thread.start()
+
+    def _set_schema_version(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        conn.commit()
+
+    def _backfill_typed(self, upto: int, chunk: int = 5000) -> None:
+        """Fill typed columns for rows up to id upto, one short transaction per chunk."""
+        conn = self._connect()
+        try:
+            last = 0
+            while not self._migration_stop.is_set():
+                rows = conn.execute(
+                    "SELECT id, payload FROM events WHERE id > ? AND id <= ? ORDER BY id LIMIT ?", (last, upto, chunk)
+                ).fetchall()
+                if not rows:
+                    self._set_schema_version(conn)
+                    self._typed_ready.set()
+                    return
+                updates = []
+                for row_id, payload in rows:
+                    try:
+                        evt = HCaiEvent.from_dict(json.loads(payload))
+                    except Exception:
+                        continue
+                    updates.append(self._typed_values(evt) + (row_id,))
+                with conn:
+                    conn.executemany(
+                        "UPDATE events SET metric_name = ?, metric_value = ?, log_level = ?, alert_id = ?, "
+                        "incident_label = ? WHERE id = ?",
+                        updates,
+                    )
+                last = rows[-1][0]
+        except Exception as exc:
+            self.migration_error = str(exc)
+        finally:
+            conn.close()
+
+    def wait_for_migration(self, timeout: Optional[float] = None) -> bool:
+        """Block until typed columns are backfilled. Returns False if the timeout expired."""
+        return self._typed_ready.wait(timeout)
+
+    @property
+    def typed_ready(self) -> bool:
+        return self._typed_ready.is_set()
+
+    @staticmethod
+    def _typed_values(event: HCaiEvent) -> tuple:
+        value = event.metric_value
+        if value is not None:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = None
+        level = str(event.log_level).upper() if event.log_level else None
+        return (event.metric_name, value, level, event.alert_id, event.incident_label)
+
+    def _where(
+        self,
+        clauses: List[str],
+        params: List,
+        source_id: Optional[str],
+        event_type: Optional[str],
+        metric_name: Optional[str] = None,
+        levels: Optional[Tuple[str, ...]] = None,
+    ) -> str:
+        """Append filter predicates; typed columns are only used once they are backfilled."""
+        if source_id is not None:
+            clauses.append("source_id = ?")
+            params.append(source_id)
+        if event_type is not None:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+        if self.typed_ready:
+            if metric_name is not None:
+                clauses.append("metric_name = ?")
+                params.append(metric_name)
+            if levels is not None:
+                clauses.append(f"log_level IN ({','.join('?' * len(levels))})")
+                params.extend(levels)
+        return " WHERE " + " AND ".join(clauses) if clauses else ""
 
     def _serialize(self, event: HCaiEvent) -> dict:
-        data = event.__dict__.copy()
+        data = event.to_dict()
         ts = data.get("timestamp")
         if hasattr(ts, "isoformat"):
             data["timestamp"] = ts.isoformat()
@@ -157,94 +1358,652 @@ class SQLiteEventStore(EventStore):
 
     def _deserialize(self, data: dict) -> Optional[HCaiEvent]:
         try:
-            ts = data.get("timestamp")
-            if isinstance(ts, str):
-                data["timestamp"] = datetime.fromisoformat(ts)
-            return HCaiEvent(**data)
+            return HCaiEvent.from_dict(data)
         except Exception:
             return None
 
-    def _load_all(self) -> None:
-        cur = self.conn.execute("SELECT payload FROM events ORDER BY id ASC")
-        for row in cur.fetchall():
+    def _decode_rows(self, rows) -> List[HCaiEvent]:
+        out = []
+        for row in rows:
             try:
                 obj = json.loads(row[0])
             except Exception:
                 continue
             evt = self._deserialize(obj)
             if evt:
-                self._events.append(evt)
+                out.append(evt)
+        return out
 
-    def add_events(self, events: List[HCaiEvent]) -> None:
-        super().add_events(events)
-        try:
-            to_insert: Iterable[tuple[str, str, str, str]] = []
-            for e in events:
-                payload = self._serialize(e)
-                ts = payload.get("timestamp")
-                to_insert = list(to_insert) + [
-                    (
-                        ts or "",
-                        e.source_id,
-                        e.event_type,
-                        json.dumps(payload),
-                    )
-                ]
-            if to_insert:
-                self.conn.executemany(
-                    "INSERT INTO events(ts, source_id, event_type, payload) VALUES (?,?,?,?)", to_insert
+    def _load_all(self) -> None:
+        self._last_id = self._max_id()
+        if self.tiered:
+            self._load_hot()
+            return
+        with self._conn_lock:
+            cur = self.conn.execute("SELECT payload FROM events WHERE id <= ? ORDER BY id ASC", (self._last_id,))
+            rows = cur.fetchall()
+        self._index(self._decode_rows(rows))
+
+    def _max_id(self) -> int:
+        with self._conn_lock:
+            return self.conn.execute("SELECT MAX(id) FROM events").fetchone()[0] or 0
+
+    def _record_own(self, first_id: int, last_id: int) -> None:
+        if self.shared:
+            # Shared stores learn about their own rows from the table like everyone else's.
+            return
+        with self._own_lock:
+            if self._own_ranges and self._own_ranges[-1][1] + 1 == first_id:
+                self._own_ranges[-1][1] = last_id
+            else:
+                self._own_ranges.append([first_id, last_id])
+
+    def _is_own(self, row_id: int) -> bool:
+        with self._own_lock:
+            return any(lo <= row_id <= hi for lo, hi in self._own_ranges)
+
+    # ------------------------------------------------------------- snapshots
+    def save_snapshot(self) -> Optional[dict]:
+        """
+        Write the in-memory state to snapshot_path. Own writes are flushed and foreign
+        rows reloaded first, so memory holds exactly the rows up to the recorded id.
+        Returns the snapshot header, or None without a snapshot_path. Raises
+        RuntimeError if memory no longer matches the database.
+        """
+        if self.snapshot_path is None:
+            return None
+        with self._ingest_lock, self._conn_lock:
+            self.reload()
+            last_id = self._last_id
+            db_rows = self.conn.execute("SELECT COUNT(*) FROM events WHERE id <= ?", (last_id,)).fetchone()[0]
+            expected = db_rows
+            if self.hot_start_us is not None:
+                cur = self.conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE id <= ? AND ts_epoch >= ?", (last_id, self.hot_start_us)
                 )
-                self.conn.commit()
-        except Exception:
-            # swallow DB write issues; keep in-memory
-            pass
+                expected = cur.fetchone()[0]
+            if len(self._rows) != expected:
+                # Memory was edited behind the database's back (or a write failed);
+                # a snapshot of it would not match what a full load produces.
+                raise RuntimeError(f"in-memory events ({len(self._rows)}) do not match the database ({expected})")
+            rows = list(self._rows)
+            index = self._index_state()
+            header = {
+                "path": str(Path(self._path).resolve()),
+                "last_id": last_id,
+                "db_rows": db_rows,
+                "tiered": self.tiered,
+                "hot_start_us": self.hot_start_us,
+                "hot_size": self._hot_size,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+        # Serializing happens outside the lock; ingest carries on meanwhile.
+        started = time.perf_counter()
+        size = dump_snapshot(self.snapshot_path, header, rows, index)
+        self._snapshot_id = last_id
+        self.last_snapshot = {
+            **header,
+            "events": len(rows),
+            "bytes": size,
+            "seconds": time.perf_counter() - started,
+        }
+        return header
 
-    def all(self) -> List[HCaiEvent]:
-        return list(self._events)
+    def _load_snapshot(self) -> bool:
+        """Restore memory from the snapshot and replay newer rows; False if it cannot be used."""
+        if self.snapshot_path is None:
+            return False
+        loaded = load_snapshot(self.snapshot_path)
+        if loaded is None:
+            return False
+        header, rows, index = loaded
+        max_id = self._max_id()
+        last_id = header.get("last_id", 0)
+        if (
+            header.get("path") != str(Path(self._path).resolve())
+            or header.get("tiered") != self.tiered
+            or last_id > max_id
+        ):
+            return False
+        # Rows deleted or rewritten below the snapshot's high-water mark invalidate it.
+        db_rows = self.conn.execute("SELECT COUNT(*) FROM events WHERE id <= ?", (last_id,)).fetchone()[0]
+        if db_rows != header.get("db_rows"):
+            return False
+        snapshot_events = len(rows)
+        self._restore_index(rows, index)
+        self.hot_start_us = header.get("hot_start_us")
+        self._hot_size = header.get("hot_size", 0)
+        self._last_id = max_id
+        self._snapshot_id = last_id
+        cur = self.conn.execute(
+            "SELECT payload FROM events WHERE id > ? AND id <= ? ORDER BY id ASC", (last_id, max_id)
+        )
+        replayed = self._decode_rows(cur.fetchall())
+        self._remember(replayed)
+        if self.tiered and self.hot_start_us is not None:
+            cur = self.conn.execute("SELECT COUNT(*) FROM events WHERE ts_epoch < ?", (self.hot_start_us,))
+            self.evicted_events = cur.fetchone()[0]
+        self.startup = {"source": "snapshot", "snapshot_events": snapshot_events, "replayed": len(replayed)}
+        return True
 
-    def since(self, dt: datetime) -> List[HCaiEvent]:
-        cutoff = dt.isoformat()
-        cur = self.conn.execute("SELECT payload FROM events WHERE ts >= ? ORDER BY ts ASC", (cutoff,))
-        out = []
-        for row in cur.fetchall():
+    def _snapshot_loop(self, interval: float) -> None:
+        while not self._snapshot_stop.wait(interval):
             try:
-                obj = json.loads(row[0])
-                evt = self._deserialize(obj)
-                if evt:
-                    out.append(evt)
-            except Exception:
-                continue
-        return out
+                if self._max_id() != self._snapshot_id:
+                    self.save_snapshot()
+            except Exception as exc:
+                self.last_snapshot = {"error": str(exc)}
 
-    def filter(self, *, source_id: Optional[str] = None, event_type: Optional[str] = None) -> List[HCaiEvent]:
-        query = "SELECT payload FROM events"
-        params: list[str] = []
-        clauses = []
-        if source_id is not None:
-            clauses.append("source_id = ?")
-            params.append(source_id)
-        if event_type is not None:
-            clauses.append("event_type = ?")
-            params.append(event_type)
-        if clauses:
-            query += " WHERE " + " AND ".join(clauses)
-        query += " ORDER BY id ASC"
-        cur = self.conn.execute(query, tuple(params))
-        out = []
-        for row in cur.fetchall():
+    # --------------------------------------------------------------- tiering
+    @property
+    def tiered(self) -> bool:
+        return self.hot_window is not None or self.hot_bytes is not None
+
+    @staticmethod
+    def _ts_us(event: HCaiEvent) -> int:
+        return coerce_epoch_us(event.timestamp) or 0
+
+    @staticmethod
+    def _event_size(event: HCaiEvent) -> int:
+        """Rough in-memory footprint used for the hot tier byte budget."""
+        size = 400 + len(event.log_message or "")
+        if event.has_extras:
+            size += 100 * len(event.extras)
+        return size
+
+    def _load_hot(self) -> None:
+        """Load only the newest rows that fit the hot window, newest first, stopping at the budget."""
+        floor_us = None
+        if self.hot_window is not None:
+            floor_us = to_epoch_us(datetime.now(timezone.utc) - self.hot_window)
+        query = "SELECT payload, ts_epoch FROM events WHERE id <= ?"
+        params: tuple = (self._last_id,)
+        if floor_us is not None:
+            query += " AND ts_epoch >= ?"
+            params += (floor_us,)
+        query += " ORDER BY ts_epoch DESC, id DESC"
+        hot_start = floor_us
+        loaded: List[tuple[int, HCaiEvent]] = []
+        size = 0
+        with self._conn_lock:
+            for payload, ts in self.conn.execute(query, params):
+                evts = self._decode_rows([(payload,)])
+                if not evts:
+                    continue
+                evt_size = self._event_size(evts[0])
+                if self.hot_bytes is not None and size + evt_size > self.hot_bytes:
+                    hot_start = ts + 1
+                    break
+                loaded.append((ts, evts[0]))
+                size += evt_size
+        if hot_start is not None:
+            loaded = [item for item in loaded if item[0] >= hot_start]
+        loaded.reverse()
+        self._events = [evt for _, evt in loaded]
+        self._hot_size = sum(self._event_size(e) for e in self._events)
+        self.hot_start_us = hot_start
+        if hot_start is not None:
+            with self._read() as conn:
+                self.evicted_events = conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE ts_epoch < ?", (hot_start,)
+                ).fetchone()[0]
+
+    def _enforce_hot_limits(self) -> None:
+        cutoff: Optional[int] = None
+        if self.hot_window is not None:
+            now = time.monotonic()
+            if now - self._last_age_check >= 1.0:
+                self._last_age_check = now
+                cutoff = to_epoch_us(datetime.now(timezone.utc) - self.hot_window)
+        if self.hot_bytes is not None and self._hot_size > self.hot_bytes:
+            # Evict the oldest events until the tier is back under 90% of its budget.
+            kept = 0
+            for pos in reversed(self._by_time):
+                size = self._event_size(self._rows[pos])
+                if kept + size > self.hot_bytes * 0.9:
+                    ts = self._epochs[pos]
+                    cutoff = ts + 1 if cutoff is None else max(cutoff, ts + 1)
+                    break
+                kept += size
+        if cutoff is not None and (self.hot_start_us is None or cutoff > self.hot_start_us):
+            self._evict_before(cutoff)
+
+    def _evict_before(self, cutoff_us: int) -> None:
+        self.hot_start_us = cutoff_us
+        by_time, epochs = self._by_time, self._epochs
+        if not by_time or epochs[by_time[0]] >= cutoff_us:
+            return
+        dropped = self._drop_oldest(bisect_left(by_time, cutoff_us, key=epochs.__getitem__))
+        self.evicted_events += len(dropped)
+        self._hot_size -= sum(self._event_size(e) for e in dropped)
+
+    def _cold_iter(
+        self,
+        start_us: Optional[int],
+        end_us: int,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        descending: bool = False,
+        page: int = 500,
+    ) -> Iterator[HCaiEvent]:
+        """Lazily read matching rows with start_us <= ts_epoch < end_us from SQLite, a page at a time."""
+        self.flush()
+        levels = normalize_levels(log_level)
+        clauses, params = ["ts_epoch < ?"], [end_us]
+        if start_us is not None:
+            clauses.append("ts_epoch >= ?")
+            params.append(start_us)
+        where = self._where(clauses, params, source_id, event_type, metric_name, levels)
+        order, after = ("DESC", "<") if descending else ("ASC", ">")
+        sql = f"SELECT payload, ts_epoch, id FROM events{where}"
+        sql += " AND " if where else " WHERE "
+        sql += f"(ts_epoch, id) {after} (?, ?) ORDER BY ts_epoch {order}, id {order} LIMIT {page}"
+        first = f"SELECT payload, ts_epoch, id FROM events{where} ORDER BY ts_epoch {order}, id {order} LIMIT {page}"
+        last: Optional[tuple] = None
+        while True:
+            # One pooled connection per page: nothing is held while the caller consumes rows.
+            with self._read() as conn:
+                if last is None:
+                    rows = conn.execute(first, tuple(params)).fetchall()
+                else:
+                    rows = conn.execute(sql, tuple(params) + last).fetchall()
+            if not rows:
+                return
+            last = rows[-1][1:]
+            for e in self._decode_rows(rows):
+                # Re-check in Python: typed predicates are skipped until the backfill is done.
+                if event_matches(e, source_id, event_type, metric_name, levels):
+                    yield e
+            if len(rows) < page:
+                return
+
+    def _cold(self, start_us: Optional[int], end_us: int) -> List[HCaiEvent]:
+        return list(self._cold_iter(start_us, end_us))
+
+    def _read(self):
+        """Borrow a pooled read-only connection (a context manager)."""
+        return self._readers.connection()
+
+    @property
+    def _has_cold(self) -> bool:
+        return self.tiered and self.hot_start_us is not None
+
+    # ----------------------------------------------------------------- writes
+    def _insert_rows(self, events: List[HCaiEvent]) -> List[tuple]:
+        rows = []
+        for e in events:
+            payload = self._serialize(e)
+            rows.append(
+                (
+                    payload.get("timestamp") or "",
+                    e.source_id,
+                    e.event_type,
+                    json.dumps(payload, default=str),
+                    coerce_epoch_us(e.timestamp) or 0,
+                )
+                + self._typed_values(e)
+            )
+        return rows
+
+    def _write_batch(self, conn: sqlite3.Connection, events: List[HCaiEvent]) -> None:
+        """Insert events with a single executemany inside one transaction."""
+        rows = self._insert_rows(events)
+        if rows:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO events(ts, source_id, event_type, payload, ts_epoch, metric_name, metric_value, "
+                    "log_level, alert_id, incident_label) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                    rows,
+                )
+                # AUTOINCREMENT ids are contiguous within one write transaction.
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            self._record_own(last_id - len(rows) + 1, last_id)
+
+    def add_events(self, events: List[HCaiEvent]) -> None:
+        with self._ingest_lock:
+            if not self.shared:
+                # Shared stores take in their own rows, and record them in the change
+                # feed, when sync() reads them back with everyone else's, so each row is
+                # recorded once, in table order.
+                self._remember(events)
+                self._record_changes(events)
+            if self._writer is not None:
+                self._writer.submit(events)
+            else:
+                try:
+                    with self._conn_lock:
+                        self._write_batch(self.conn, events)
+                except Exception:
+                    # swallow DB write issues; keep in-memory
+                    pass
+        self._call_listeners(events)
+
+    def _remember(self, events: List[HCaiEvent]) -> None:
+        """Apply events to the in-memory side (hot tier filtering when tiered)."""
+        if self.tiered:
+            hot = events
+            if self.hot_start_us is not None:
+                # Late arrivals older than the hot tier go straight to the cold tier.
+                hot = [e for e in events if self._ts_us(e) >= self.hot_start_us]
+                self.evicted_events += len(events) - len(hot)
+            self._index(hot)
+            self._hot_size += sum(self._event_size(e) for e in hot)
+            self._enforce_hot_limits()
+        else:
+            self._index(events)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued writes are committed. Returns False if the timeout expired."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def sync(self) -> bool:
+        """
+        Shared stores: make memory current with the database. Own queued writes are
+        flushed first; rows are only reloaded if some connection committed since the
+        last sync. Returns True if it reloaded.
+        """
+        if self._writer is not None and self._writer.pending:
+            self._writer.flush()
+        with self._conn_lock:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        self.reload()
+        self.syncs += 1
+        return True
+
+    @property
+    def seq(self) -> int:
+        if self.shared:
+            self.sync()
+        return super().seq
+
+    def changes_since(self, seq: int) -> ChangeBatch:
+        """Shared stores sync first, so rows other workers committed are part of the feed."""
+        if self.shared:
+            self.sync()
+        return super().changes_since(seq)
+
+    def close(self) -> None:
+        """
+        Drain the write queue, stop any running migration and close connections. A
+        store with snapshot_path writes a final snapshot if rows changed since the last.
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_stop.set()
+            self._snapshot_thread.join()
+        if self.snapshot_path is not None:
             try:
-                obj = json.loads(row[0])
-                evt = self._deserialize(obj)
-                if evt:
-                    out.append(evt)
-            except Exception:
-                continue
-        return out
+                self.flush()
+                if self._max_id() != self._snapshot_id:
+                    self.save_snapshot()
+            except Exception as exc:
+                self.last_snapshot = {"error": str(exc)}
+        if self._writer is not None:
+            self._writer.close()
+        if self._migration_thread is not None:
+            self._migration_stop.set()
+            self._migration_thread.join()
+        self._readers.close()
+        self.conn.close()
+
+    def all(self) -> List[HCaiEvent]:
+        if self.shared:
+            self.sync()
+        if self._has_cold:
+            return self._cold(None, self.hot_start_us) + list(self._events)
+        return list(self._events)
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """
+        Served from the in-memory time index; tiered stores read the part of the window
+        older than the hot tier from SQLite through the indexed ts_epoch column.
+        """
+        if self.shared:
+            self.sync()
+        hot = super().range(
+            start, end, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+        )
+        if not self._has_cold:
+            return hot
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = min(to_epoch_us(end), self.hot_start_us) if end is not None else self.hot_start_us
+        if start_us is not None and start_us >= end_us:
+            return hot
+        cold = self._cold_iter(
+            start_us, end_us, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+        )
+        return list(cold) + hot
+
+    def iter_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        """
+        Lazy range(): the cold part comes off SQLite a page at a time through the read
+        pool, then the hot tier streams from memory.
+        """
+        if self.shared:
+            self.sync()
+        kwargs = dict(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        hot = super().iter_range(start, end, **kwargs)
+        if not self._has_cold:
+            return hot
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = min(to_epoch_us(end), self.hot_start_us) if end is not None else self.hot_start_us
+        if start_us is not None and start_us >= end_us:
+            return hot
+        return chain(self._cold_iter(start_us, end_us, **kwargs), hot)
+
+    def filter(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> List[HCaiEvent]:
+        """
+        Served from the in-memory indexes (memory mirrors the table between reloads);
+        tiered stores also read the cold range from SQLite.
+        """
+        if self.shared:
+            self.sync()
+        hot = super().filter(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        if not self._has_cold:
+            return hot
+        cold = self._cold_iter(
+            None, self.hot_start_us, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+        )
+        return list(cold) + hot
+
+    def tail(
+        self,
+        limit: Optional[int] = None,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> Iterator[HCaiEvent]:
+        if self.shared:
+            self.sync()
+        events = super().tail(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        if self._has_cold:
+            cold = self._cold_iter(
+                None,
+                self.hot_start_us,
+                source_id=source_id,
+                event_type=event_type,
+                metric_name=metric_name,
+                log_level=log_level,
+                descending=True,
+            )
+            events = chain(events, cold)
+        return islice(events, limit) if limit is not None else events
+
+    def page(
+        self,
+        limit: int = 100,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> EventPage:
+        """
+        Keyset page over the table's primary key (see EventStore.page); ids are row ids,
+        so cursors stay valid across restarts and cover the cold tier too.
+        """
+        self.flush()
+        levels = normalize_levels(log_level)
+        ascending = after_id is not None
+        cursor = after_id if ascending else before_id
+        items: List[Tuple[int, HCaiEvent]] = []
+        while True:
+            clauses, params = [], []
+            if cursor is not None:
+                clauses.append("id > ?" if ascending else "id < ?")
+                params.append(cursor)
+            if start is not None:
+                clauses.append("ts_epoch >= ?")
+                params.append(to_epoch_us(start))
+            if end is not None:
+                clauses.append("ts_epoch < ?")
+                params.append(to_epoch_us(end))
+            where = self._where(clauses, params, source_id, event_type, metric_name, levels)
+            fetch = limit + 1 - len(items)
+            with self._read() as conn:
+                rows = conn.execute(
+                    f"SELECT id, payload FROM events{where} ORDER BY id {'ASC' if ascending else 'DESC'} LIMIT {fetch}",
+                    tuple(params),
+                ).fetchall()
+            for row_id, payload in rows:
+                decoded = self._decode_rows([(payload,)])
+                # Re-check in Python: typed predicates are skipped until the backfill is done.
+                if decoded and event_matches(decoded[0], source_id, event_type, metric_name, levels):
+                    if len(items) == limit:
+                        return items, items[-1][0]
+                    items.append((row_id, decoded[0]))
+            if len(rows) < fetch:
+                return items, None
+            cursor = rows[-1][0]
+
+    def count(
+        self,
+        *,
+        source_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        log_level: LevelFilter = None,
+    ) -> int:
+        if self.shared:
+            self.sync()
+        if not self._has_cold:
+            return super().count(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        if not self.typed_ready and (metric_name is not None or log_level is not None):
+            return len(self.filter(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level))
+        hot = super().count(source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level)
+        self.flush()
+        params: List = [self.hot_start_us]
+        where = self._where(["ts_epoch < ?"], params, source_id, event_type, metric_name, normalize_levels(log_level))
+        with self._read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM events{where}", tuple(params)).fetchone()[0] + hot
+
+    def last_seen(self) -> Dict[str, datetime]:
+        if self.shared:
+            self.sync()
+        seen = super().last_seen()
+        if self._has_cold:
+            self.flush()
+            with self._read() as conn:
+                rows = conn.execute(
+                    "SELECT source_id, MAX(ts_epoch) FROM events WHERE ts_epoch < ? GROUP BY source_id",
+                    (self.hot_start_us,),
+                ).fetchall()
+            for source, ts_us in rows:
+                seen.setdefault(source, from_epoch_us(ts_us))
+        return seen
+
+    def metric_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        MetricAggregator-shaped summary ({"metric:source": count/min/max/avg}) from
+        metric_series(). Before the typed column backfill finishes this falls back to
+        aggregating the events in Python.
+        """
+        rows = self.metric_series()
+        if rows is None:
+            from hcai_ops.analytics.processors import MetricAggregator
+
+            return MetricAggregator().aggregate(self.all())
+        return {
+            f"{name}:{source}": {"count": count, "min": low, "max": high, "avg": total / count}
+            for name, source, count, total, _, low, high, _, _ in rows
+        }
+
+    def metric_series(self) -> Optional[List[tuple]]:
+        """
+        Per-series metric aggregates computed in SQL over the typed columns, as
+        (metric_name, source_id, count, sum, sum of squares, min, max, last, last
+        epoch-us) in first-seen order; None until the typed column backfill is done.
+        Only rows this store reflects count (up to its reload high-water mark, plus its
+        own writes), so the result matches seq when read with writes paused.
+        """
+        if not self.typed_ready:
+            return None
+        self.flush()
+        with self._own_lock:
+            reflected = ["id <= ?"] + ["id BETWEEN ? AND ?"] * len(self._own_ranges)
+            params = [self._last_id] + [bound for own in self._own_ranges for bound in own]
+        where = f"metric_name IS NOT NULL AND metric_value IS NOT NULL AND ({' OR '.join(reflected)})"
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT metric_name, source_id, COUNT(metric_value), SUM(metric_value), "
+                "SUM(metric_value * metric_value), MIN(metric_value), MAX(metric_value) "
+                f"FROM events WHERE {where} GROUP BY metric_name, source_id ORDER BY MIN(id)",
+                tuple(params),
+            ).fetchall()
+            # With MAX() as the only aggregate, SQLite takes metric_value from the row holding the max.
+            last = {
+                (name, source): (value, ts_us)
+                for name, source, value, ts_us in conn.execute(
+                    "SELECT metric_name, source_id, metric_value, MAX(ts_epoch) "
+                    f"FROM events WHERE {where} GROUP BY metric_name, source_id",
+                    tuple(params),
+                )
+            }
+        return [row + last[(row[0], row[1])] for row in rows]
 
     def stats(self) -> dict:
+        self.flush()
         try:
-            cur = self.conn.execute("SELECT COUNT(*) FROM events")
-            stored = cur.fetchone()[0]
+            with self._read() as conn:
+                stored = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
         except Exception:
             stored = len(self._events)
         return {
@@ -252,10 +2011,81 @@ class SQLiteEventStore(EventStore):
             "path": str(self._path),
             "stored_events": stored,
             "in_memory": len(self._events),
+            "writer": self._writer.stats() if self._writer is not None else None,
+            "tier": self._tier_stats() if self.tiered else None,
+            "typed_columns": self.typed_ready,
+            "migration_error": self.migration_error,
+            "startup": self.startup,
+            "snapshot": self.last_snapshot,
+            "readers": self._readers.stats(),
+            "control_lock": self._conn_lock.stats(),
         }
 
+    def _tier_stats(self) -> dict:
+        return {
+            "hot_events": len(self._events),
+            "hot_bytes_estimate": self._hot_size,
+            "hot_bytes_budget": self.hot_bytes,
+            "hot_window_seconds": self.hot_window.total_seconds() if self.hot_window is not None else None,
+            "hot_start": from_epoch_us(self.hot_start_us).isoformat() if self.hot_start_us is not None else None,
+            "evicted_events": self.evicted_events,
+        }
+
+    def clear(self) -> int:
+        """
+        Delete every row and empty memory; returns the number of rows deleted. Ingest is
+        held off and queued writes are committed first, and the control connection is
+        only used under its lock, as the backfill, reload and snapshots use it.
+        """
+        with self._ingest_lock:
+            self.flush()
+            with self._conn_lock:
+                removed = self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] or 0
+                self.conn.execute("DELETE FROM events")
+                # Restart ids, so other stores on the file see max(id) drop and reload.
+                self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'events'")
+                self.conn.commit()
+                self.conn.execute("VACUUM")
+            self._last_id = 0
+            with self._own_lock:
+                self._own_ranges = []
+            self._snapshot_id = None
+            self._events = []
+            self._hot_size = 0
+            self.hot_start_us = None
+            self.evicted_events = 0
+            self.mark_reset()
+        return removed
+
     def reload(self) -> int:
-        """Reload events from SQLite into memory."""
-        self._events = []
-        self._load_all()
+        """
+        Pull in rows other writers added since the last load (id above the high-water
+        mark, excluding ids this store inserted). Falls back to a full load if the table
+        was emptied or replaced.
+        """
+        with self._ingest_lock:
+            return self._reload()
+
+    def _reload(self) -> int:
+        self.flush()
+        max_id = self._max_id()
+        if max_id < self._last_id:
+            self._events = []
+            with self._own_lock:
+                self._own_ranges = []
+            self._load_all()
+            self.mark_reset()
+            return len(self._events)
+        if max_id > self._last_id:
+            with self._conn_lock:
+                rows = self.conn.execute(
+                    "SELECT id, payload FROM events WHERE id > ? AND id <= ? ORDER BY id ASC", (self._last_id, max_id)
+                ).fetchall()
+            foreign = [(payload,) for row_id, payload in rows if not self._is_own(row_id)]
+            self._last_id = max_id
+            with self._own_lock:
+                self._own_ranges = [r for r in self._own_ranges if r[1] > max_id]
+            added = self._decode_rows(foreign)
+            self._remember(added)
+            self._record_changes(added)
         return len(self._events)
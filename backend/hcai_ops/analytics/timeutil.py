@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_NAIVE = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(ts: datetime) -> int:
+    """Convert a naive (assumed UTC) or aware datetime to integer epoch microseconds."""
+    if ts.tzinfo is None:
+        return (ts - EPOCH_NAIVE) // _MICROSECOND
+    return (ts - EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int, aware: bool = True) -> datetime:
+    """Inverse of to_epoch_us; returns a UTC-aware datetime unless aware is False."""
+    if aware:
+        return EPOCH + timedelta(microseconds=int(value))
+    return EPOCH_NAIVE + timedelta(microseconds=int(value))
+
+
+def coerce_epoch_us(value: Any) -> Optional[int]:
+    """Epoch microseconds for a datetime or ISO string, or None if it cannot be parsed."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return to_epoch_us(value)
+    return None
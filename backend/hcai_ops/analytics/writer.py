@@ -0,0 +1,140 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+
+from hcai_ops.data.schemas import HCaiEvent
+
+
+class SQLiteWriter:
+    """
+    Background group-commit writer for SQLite.
+
+    Producers call submit() with a batch of events and return immediately. A single
+    writer thread drains the queue into micro-batches and hands each one to
+    write_batch(conn, events), which is expected to run one executemany inside a
+    single transaction. flush() blocks until everything submitted so far is on disk.
+    Batches form naturally while a commit is in progress; max_delay adds an optional
+    linger to grow them further at the cost of write latency.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        write_batch: Callable[[sqlite3.Connection, List[HCaiEvent]], None],
+        max_batch: int = 5000,
+        max_delay: float = 0.0,
+    ) -> None:
+        # Connect up front so a bad path fails in the caller, not silently in the thread.
+        self._conn = connect()
+        self._write_batch = write_batch
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self._queue: "queue.Queue[Optional[List[HCaiEvent]]]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+
+        self.batches: int = 0
+        self.rows_written: int = 0
+        self.errors: int = 0
+        self.last_error: Optional[str] = None
+        self.last_batch_size: int = 0
+        self.max_batch_size: int = 0
+        self.last_flush_ms: float = 0.0
+        self.max_flush_ms: float = 0.0
+        self.total_flush_ms: float = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="hcai-sqlite-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, events: List[HCaiEvent]) -> None:
+        """Queue events for the writer thread."""
+        if not events:
+            return
+        if self._closed:
+            raise RuntimeError("SQLiteWriter is closed")
+        with self._cond:
+            self._submitted += len(events)
+        self._queue.put(list(events))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all rows submitted before this call are written. Returns False on timeout."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._written >= target, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Drain pending rows and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return self._submitted - self._written
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "pending": self.pending,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": (self.rows_written / self.batches) if self.batches else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.batches, 3) if self.batches else 0.0,
+        }
+
+    def _collect(self, first: List[HCaiEvent]) -> tuple[List[HCaiEvent], bool]:
+        """Gather a micro-batch starting with first; returns (batch, stop_requested)."""
+        batch = list(first)
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.extend(item)
+        return batch, False
+
+    def _run(self) -> None:
+        conn = self._conn
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, stop = self._collect(item)
+            started = time.perf_counter()
+            try:
+                self._write_batch(conn, batch)
+                self.rows_written += len(batch)
+            except Exception as exc:
+                # Keep the writer alive; the in-memory copy is still authoritative for readers.
+                self.errors += 1
+                self.last_error = str(exc)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.batches += 1
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.total_flush_ms += elapsed_ms
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+        conn.close()
@@ -1,12 +1,15 @@
 import os
+import shutil
 from pathlib import Path
-from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Any
 import random
 import subprocess
 import sys
 import ast
+import base64
+import json
 import joblib
 import requests
 import pandas as pd
@@ -22,7 +25,7 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     SKLEARN_AVAILABLE = False
 
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -34,8 +37,14 @@ from ..models.action_model import ActionRecommender
 from ..models.alert_model import AlertImportanceModel
 from ..models.risk_model import RiskModel
 from . import routes_actions, routes_alerts, routes_risk
-from hcai_ops.analytics.api import router as analytics_router
-from hcai_ops.analytics.processors import MetricAggregator
+from hcai_ops.analytics.api import (
+    get_anomalies as analytics_get_anomalies,
+    get_correlations as analytics_get_correlations,
+    get_timeseries as analytics_get_timeseries,
+    ndjson_response,
+    recent_log_rates,
+    router as analytics_router,
+)
 from hcai_ops.intelligence.api import router as intelligence_router
 from hcai_ops.control.api import router as control_router
 from hcai_ops.console.router import router as console_router
@@ -43,8 +52,12 @@ from hcai_ops.api.ui_router import router as ui_router
 from hcai_ops.config import HCAIConfig
 from hcai_ops.config.env import get_settings
 from hcai_ops.storage.filesystem import FileSystemStorage
-from hcai_ops.analytics import event_store, SQLITE_PATH, JSONL_PATH
-from hcai_ops.analytics.store import SQLiteEventStore, PersistentEventStore
+from hcai_ops.analytics import event_store, hot_series, log_rates, metric_stats, rollups, stream_correlator, SQLITE_PATH, JSONL_PATH, SNAPSHOT_PATH
+from hcai_ops.analytics.store import SQLiteEventStore, PersistentEventStore, segment_dir
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore
+from hcai_ops.analytics.columnar import analysis_view
+from hcai_ops.analytics.kernels import event_columns
+from hcai_ops.analytics.timeutil import from_epoch_us
 from hcai_ops.agent.engine import AgentEngine
 from hcai_ops.assets.asset_registry import AssetRegistry
 from hcai_ops.assets.asset_model import Asset
@@ -57,9 +70,8 @@ from pydantic import BaseModel
 import importlib.metadata
 from . import routes_actions, routes_alerts, routes_risk
 from hcai_ops.data.schemas import HCaiEvent
-from hcai_ops.intelligence.api import _compute_all, get_risk as intel_get_risk, get_incidents as intel_get_incidents, get_recommendations as intel_get_recommendations, get_overview as intel_get_overview
-from hcai_ops.analytics.api import get_anomalies as analytics_get_anomalies, get_correlations as analytics_get_correlations, get_timeseries as analytics_get_timeseries
-from hcai_ops.analytics.processors import LogAnomalyDetector, MetricThresholdDetector
+from hcai_ops.intelligence.api import _compute_all, get_risk as intel_get_risk, get_incidents as intel_get_incidents, get_recommendations as intel_get_recommendations, get_correlations as intel_get_correlations, get_overview as intel_get_overview
+from hcai_ops.analytics.processors import MetricThresholdDetector
 from hcai_ops.control.api import get_plan as control_get_plan, execute_control as control_execute, get_control_loop
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -134,10 +146,10 @@ def _iso(ts: datetime | None) -> str | None:
 
 def _recent_logs(limit: int = 200) -> list[dict]:
     """Normalize recent log events for reuse across endpoints."""
-    logs = [e for e in reversed(event_store.all()) if e.event_type == "log"][:limit]
+    logs = list(event_store.tail(limit, event_type="log"))
     normalized = []
     for e in logs:
-        payload = asdict(e)
+        payload = e.to_dict()
         level = (payload.get("log_level") or "").strip()
         if not level:
             level = "INFO"
@@ -156,7 +168,6 @@ def _build_alerts(limit: int = 50) -> list[dict[str, object]]:
     """Compose alert-like payloads for the legacy UI from incidents/anomalies/logs."""
     alerts: list[dict[str, object]] = []
     now_iso = datetime.utcnow().isoformat()
-    events = event_store.all()
 
     for inc in intel_get_incidents() or []:
         alerts.append(
@@ -174,7 +185,13 @@ def _build_alerts(limit: int = 50) -> list[dict[str, object]]:
 
     if len(alerts) < limit:
         try:
-            metric_anomalies = [a for a in MetricThresholdDetector().detect(events) if a.get("anomaly")]
+            hot = hot_series()
+            detector = MetricThresholdDetector()
+            if hot is not None:
+                findings = detector.detect_latest(hot)
+            else:
+                findings = detector.detect(event_columns(analysis_view(event_store)))
+            metric_anomalies = [a for a in findings if a.get("anomaly")]
         except Exception:
             metric_anomalies = []
         for idx, anomaly in enumerate(metric_anomalies):
@@ -193,17 +210,18 @@ def _build_alerts(limit: int = 50) -> list[dict[str, object]]:
 
     if len(alerts) < limit:
         try:
-            anomalies = LogAnomalyDetector().detect(events) or []
+            rates = log_rates() or recent_log_rates(event_store)
+            anomalies = [a for a in rates.detect() if a.get("anomaly")]
         except Exception:
             anomalies = []
         for idx, anomaly in enumerate(anomalies):
             alerts.append(
                 {
                     "alert_id": anomaly.get("id") or anomaly.get("source_id") or f"anomaly-{idx}",
-                    "message": f"Error spike: {anomaly.get('error_count', 0)} errors",
+                    "message": anomaly.get("message") or f"Error spike: {anomaly.get('error_count', 0)} errors",
                     "source_id": anomaly.get("source_id") or "unknown",
-                    "severity": "CRITICAL" if anomaly.get("anomaly") else "WARNING",
-                    "timestamp": now_iso,
+                    "severity": "CRITICAL",
+                    "timestamp": anomaly.get("timestamp") or now_iso,
                     "metadata": anomaly,
                 }
             )
@@ -242,14 +260,19 @@ def wipe_all_events():
     backend = "memory"
     errors: list[str] = []
 
+    # Partitioned SQLite: drop whole partition files instead of DELETE + VACUUM.
+    try:
+        if isinstance(event_store, PartitionedSQLiteEventStore):
+            removed = event_store.stats().get("stored_events", 0)
+            event_store.drop_all()
+            backend = "sqlite-partitioned"
+    except Exception as exc:  # pragma: no cover - admin-only path
+        errors.append(f"partitions: {exc}")
+
     # Clear SQLite if present
     try:
         if isinstance(event_store, SQLiteEventStore):
-            cur = event_store.conn.execute("SELECT COUNT(*) FROM events")
-            removed = cur.fetchone()[0] or 0
-            event_store.conn.execute("DELETE FROM events")
-            event_store.conn.execute("VACUUM")
-            event_store.conn.commit()
+            removed = event_store.clear()
             backend = "sqlite"
     except Exception as exc:  # pragma: no cover - admin-only path
         errors.append(f"sqlite: {exc}")
@@ -257,10 +280,8 @@ def wipe_all_events():
     # Clear JSONL fallback if present
     try:
         if isinstance(event_store, PersistentEventStore) and getattr(event_store, "_path", None):
-            path = Path(event_store._path)
             removed = max(removed, len(getattr(event_store, "_events", [])))
-            event_store._events = []
-            path.write_text("", encoding="utf-8")
+            event_store.truncate()
             backend = "jsonl"
     except Exception as exc:  # pragma: no cover
         errors.append(f"jsonl: {exc}")
@@ -270,22 +291,52 @@ def wipe_all_events():
         if hasattr(event_store, "_events"):
             removed = max(removed, len(event_store._events))
             event_store._events = []
+        event_store.mark_reset()
     except Exception as exc:  # pragma: no cover
         errors.append(f"memory: {exc}")
 
-    # Delete known storage files to fully reset
-    for path in [SQLITE_PATH, JSONL_PATH]:
+    # Rollups, hot-series buffers, streaming correlations and error rates are derived from the events, so they go too.
+    try:
+        rollups.clear()
+        for derived in (hot_series(), stream_correlator(), log_rates()):
+            if derived is not None:
+                derived.clear()
+    except Exception as exc:  # pragma: no cover
+        errors.append(f"rollups: {exc}")
+
+    # Delete known storage files to fully reset. A live SQLite store was emptied by clear()
+    # above; its file stays, since the pool, writer and control connections still hold it.
+    paths = [JSONL_PATH, SNAPSHOT_PATH]
+    if not (isinstance(event_store, SQLiteEventStore) and Path(event_store._path).resolve() == SQLITE_PATH.resolve()):
+        paths += [SQLITE_PATH.with_name(SQLITE_PATH.name + suffix) for suffix in ("", "-wal", "-shm")]
+    for path in paths:
         try:
             if path.exists():
                 path.unlink()
         except Exception as exc:  # pragma: no cover
             errors.append(f"unlink {path}: {exc}")
+    try:
+        shutil.rmtree(segment_dir(JSONL_PATH), ignore_errors=True)
+    except Exception as exc:  # pragma: no cover
+        errors.append(f"segments: {exc}")
 
     return {"status": "ok", "backend": backend, "removed": removed, "errors": errors}
 
 
+@app.post("/api/admin/retention")
+def apply_retention():
+    """Drop expired partitions according to the configured per-event_type TTLs."""
+    if not isinstance(event_store, PartitionedSQLiteEventStore):
+        return {"status": "skipped", "reason": "event store is not partitioned", "dropped": []}
+    dropped = event_store.apply_retention()
+    return {
+        "status": "ok",
+        "dropped": [{"event_type": p.event_type, "start": p.start.isoformat(), "path": str(p.path)} for p in dropped],
+    }
+
+
 def _serialize_event_for_training(evt: HCaiEvent) -> dict[str, object]:
-    data = asdict(evt)
+    data = evt.to_dict()
     ts = data.get("timestamp")
     if hasattr(ts, "isoformat"):
         try:
@@ -500,29 +551,34 @@ def _restart_hook(agent_id: str) -> dict:
 @app.get("/metrics/summary", tags=["analytics"])
 def metrics_summary():
     """Lightweight summary for dashboards; returns list with history and stats."""
-    aggregator = MetricAggregator()
-    events = event_store.all()
-    summary = aggregator.aggregate(events)
+    summary = metric_stats.sync(event_store).summary()
     active_sources = {a["id"] for a in list_agents()}
     if not active_sources:
         # No active agents; do not surface stale/offline metrics.
         return []
 
     history: dict[str, list[dict[str, object]]] = {}
-    # keep the 10 most recent samples per metric/source
-    for event in reversed(events):
-        if event.metric_name is None or event.metric_value is None:
+    hot = hot_series()
+    # keep the 10 most recent samples per metric/source, from the hot-series ring buffers
+    # (or the series index when workers share the store)
+    for key in summary:
+        metric_name, source_id = key.split(":", 1)
+        if source_id not in active_sources:
             continue
-        key = f"{event.metric_name}:{event.source_id}"
-        bucket = history.setdefault(key, [])
-        if len(bucket) >= 10:
+        if hot is not None:
+            history[key] = [
+                {"timestamp": from_epoch_us(ts_us).isoformat(), "value": value}
+                for ts_us, value in reversed(hot.last(metric_name, source_id, 10))
+            ]
             continue
-        bucket.append(
+        samples = (e for e in event_store.tail(metric_name=metric_name, source_id=source_id) if e.metric_value is not None)
+        history[key] = [
             {
                 "timestamp": event.timestamp.isoformat() if hasattr(event.timestamp, "isoformat") else None,
                 "value": event.metric_value,
             }
-        )
+            for event in islice(samples, 10)
+        ]
 
     results: list[dict[str, object]] = []
     for key, stats in summary.items():
@@ -548,21 +604,14 @@ def list_agents():
     """Derive agents from recent heartbeats/metrics in the in-memory store."""
     agents: dict[str, dict[str, Any]] = {}
     now = datetime.utcnow().replace(tzinfo=None)
-    for event in event_store.all():
-        src = event.source_id
-        agents.setdefault(
-            src,
-            {
-                "id": src,
-                "name": src,
-                "last_seen": None,
-                "status": "unknown",
-                "latency": None,
-            },
-        )
-        ts = event.timestamp
-        if ts is not None:
-            agents[src]["last_seen"] = ts if agents[src]["last_seen"] is None else max(agents[src]["last_seen"], ts)
+    for src, ts in event_store.last_seen().items():
+        agents[src] = {
+            "id": src,
+            "name": src,
+            "last_seen": ts,
+            "status": "unknown",
+            "latency": None,
+        }
     for src, info in agents.items():
         last_seen = info["last_seen"]
         if last_seen is None:
@@ -606,19 +655,23 @@ def ingest_events(payload: dict | list[dict]):
 def ingest_status():
     stats = {}
     stats_error = None
+    # Incremental reload: pulls in only rows written since the last check.
     if hasattr(event_store, "reload"):
         try:
             event_store.reload()
         except Exception:
             pass
-    # Reload from persistent store to ensure counts reflect disk.
     if hasattr(event_store, "stats"):
         try:
             stats = event_store.stats()
         except Exception as exc:
             stats = {}
             stats_error = str(exc)
-    stored = len(event_store.all())
+    # Answer from the store's counters rather than materializing every event.
+    if isinstance(stats, dict) and "stored_events" in stats:
+        stored = stats["stored_events"]
+    else:
+        stored = len(event_store.all())
     path = stats.get("path") if isinstance(stats, dict) else None
     return {
         "status": "ok",
@@ -635,8 +688,117 @@ def ingest_status():
 def recent_events(limit: int = 200):
     # Pagination support
     limit = max(1, min(limit, 1000))
-    events = list(reversed(event_store.all()))
-    return [asdict(e) for e in events[:limit]]
+    return [e.to_dict() for e in event_store.tail(limit)]
+
+
+def _encode_cursor(state: dict) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(state, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return state
+
+
+def _event_id(value: str | None) -> int | str | None:
+    """Query-string event id: an int where it is one (the partitioned store's ids are strings)."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+@app.get("/events", tags=["events"])
+@app.get("/api/events", tags=["events"])
+def list_events(
+    limit: int = 200,
+    after_id: str | None = None,
+    before_id: str | None = None,
+    cursor: str | None = None,
+    source_id: str | None = None,
+    event_type: str | None = None,
+    metric_name: str | None = None,
+    log_level: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+):
+    """
+    Keyset-paginated events. Without a cursor the newest events come first; after_id
+    walks forward (oldest first) from an id, before_id walks backward. next_cursor
+    carries the position and the filters, so the next page only needs ?cursor=.
+    Ids are integers, except with the partitioned store, whose ids are "ts:type:rowid".
+    """
+    limit = max(1, min(limit, 1000))
+    filters = {
+        "source_id": source_id,
+        "event_type": event_type,
+        "metric_name": metric_name,
+        "log_level": log_level,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+    }
+    after_id, before_id = _event_id(after_id), _event_id(before_id)
+    if cursor:
+        state = _decode_cursor(cursor)
+        after_id, before_id = state.get("after_id"), state.get("before_id")
+        if not all(v is None or isinstance(v, (int, str)) for v in (after_id, before_id)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        filters = {key: state.get(key) for key in filters}
+    if after_id is not None and before_id is not None:
+        raise HTTPException(status_code=400, detail="Pass after_id or before_id, not both")
+    keyed = isinstance(event_store, PartitionedSQLiteEventStore)
+    if not keyed and any(isinstance(v, str) for v in (after_id, before_id)):
+        raise HTTPException(status_code=400, detail="Invalid event id")
+    try:
+        items, next_id = event_store.page(
+            limit,
+            after_id=after_id,
+            before_id=before_id,
+            source_id=filters["source_id"],
+            event_type=filters["event_type"],
+            metric_name=filters["metric_name"],
+            log_level=filters["log_level"],
+            start=datetime.fromisoformat(filters["start"]) if filters["start"] else None,
+            end=datetime.fromisoformat(filters["end"]) if filters["end"] else None,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    next_cursor = None
+    if next_id is not None:
+        position = {"after_id": next_id} if after_id is not None else {"before_id": next_id}
+        next_cursor = _encode_cursor({**position, **{k: v for k, v in filters.items() if v is not None}})
+    return {
+        "items": [{**event.to_dict(), "id": event_id} for event_id, event in items],
+        "next_cursor": next_cursor,
+    }
+
+
+@app.get("/events/export", tags=["events"], response_model=None)
+@app.get("/api/events/export", tags=["events"], response_model=None)
+def export_events(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    source_id: str | None = None,
+    event_type: str | None = None,
+    metric_name: str | None = None,
+    log_level: str | None = None,
+):
+    """
+    Bulk export as NDJSON (application/x-ndjson), oldest first. Events are read and
+    serialized as the client consumes the body, so any window size streams in flat memory.
+    """
+    events = event_store.iter_range(
+        start, end, source_id=source_id, event_type=event_type, metric_name=metric_name, log_level=log_level
+    )
+    return ndjson_response(e.to_dict() for e in events)
 
 
 @app.get("/logs/recent", tags=["events"])
@@ -654,6 +816,13 @@ def recent_alerts(limit: int = 50):
     return _build_alerts(limit)
 
 
+@app.get("/alerts/log-rates", tags=["alerts"])
+@app.get("/api/alerts/log-rates", tags=["alerts"])
+def alert_log_rates():
+    """State of the error-rate detector behind log alerts: settings and each source's rate and baseline."""
+    return (log_rates() or recent_log_rates(event_store)).state()
+
+
 def _train_all(events: list[HCaiEvent]) -> dict[str, object]:
     if not events:
         return {"status": "error", "message": "No events available to train. Ingest data first."}
@@ -1202,11 +1371,29 @@ def analytics_summary_alias():
     return metrics_summary()
 
 
-@app.get("/analytics/timeseries", tags=["analytics"])
-def analytics_timeseries_alias(minutes: int = 180):
-    cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-    events = event_store.since(cutoff)
-    return [asdict(e) for e in events]
+@app.get("/analytics/timeseries", tags=["analytics"], response_model=None)
+def analytics_timeseries_alias(
+    request: Request,
+    minutes: int = 180,
+    metric_name: str | None = None,
+    source_id: str | None = None,
+    resolution: int | None = None,
+    max_points: int | None = None,
+    step: int | None = None,
+    method: str = "lttb",
+):
+    return analytics_get_timeseries(
+        minutes,
+        metric_name,
+        source_id,
+        resolution,
+        store=event_store,
+        rollup_store=rollups,
+        request=request,
+        max_points=max_points,
+        step=step,
+        method=method,
+    )
 
 
 @app.get("/ingest/events", tags=["events"])
@@ -1218,17 +1405,29 @@ def ingest_events_alias(limit: int = 0):
 # API-prefixed mirrors for SPA calls
 @app.get("/api/analytics/anomalies", tags=["analytics"])
 def analytics_anomalies_api():
-    return analytics_get_anomalies(store=event_store)
+    return analytics_get_anomalies(store=event_store, hot=hot_series(), rates=log_rates())
 
 
 @app.get("/api/analytics/correlations", tags=["analytics"])
-def analytics_correlations_api():
-    return analytics_get_correlations(store=event_store)
-
-
-@app.get("/api/analytics/timeseries", tags=["analytics"])
-def analytics_timeseries_api(minutes: int = 180):
-    return analytics_timeseries_alias(minutes)
+def analytics_correlations_api(
+    metric_name: list[str] | None = Query(None),
+    log_level: list[str] | None = Query(None),
+):
+    return analytics_get_correlations(store=event_store, metric_name=metric_name, log_level=log_level)
+
+
+@app.get("/api/analytics/timeseries", tags=["analytics"], response_model=None)
+def analytics_timeseries_api(
+    request: Request,
+    minutes: int = 180,
+    metric_name: str | None = None,
+    source_id: str | None = None,
+    resolution: int | None = None,
+    max_points: int | None = None,
+    step: int | None = None,
+    method: str = "lttb",
+):
+    return analytics_timeseries_alias(request, minutes, metric_name, source_id, resolution, max_points, step, method)
 
 
 @app.get("/api/intelligence/overview", tags=["intelligence"])
@@ -1251,6 +1450,11 @@ def intelligence_recommendations_api():
     return intel_get_recommendations()
 
 
+@app.get("/api/intelligence/correlations", tags=["intelligence"])
+def intelligence_correlations_api():
+    return intel_get_correlations()
+
+
 @app.get("/api/control/plan", tags=["control"])
 def control_plan_api():
     return control_get_plan(loop=get_control_loop())
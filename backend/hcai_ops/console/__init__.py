@@ -66,3 +66,15 @@ def stress():
     summary = run_full_ingest_test()
     click.echo(f"Total events: {summary.get('total_events')}")
     click.echo(f"Events valid: {summary.get('valid')}")
+
+
+@cli.command("migrate-storage")
+def migrate_storage():
+    """Copy a fuller legacy repo events.db over the primary store (run before starting the API)."""
+    from hcai_ops.analytics import SQLITE_PATH, migrate_legacy_storage
+
+    copied = migrate_legacy_storage()
+    if copied is None:
+        click.echo(f"Kept {SQLITE_PATH}")
+    else:
+        click.echo(f"Copied {copied} -> {SQLITE_PATH}")
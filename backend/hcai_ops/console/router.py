@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import HTMLResponse
 
-from hcai_ops.analytics import event_store
-from hcai_ops.analytics.processors import MetricAggregator
+from hcai_ops.analytics import event_store, metric_stats
 
 router = APIRouter(prefix="/console", tags=["console"])
 
@@ -13,27 +12,21 @@ def get_event_store():
 
 @router.get("/", response_class=HTMLResponse)
 def dashboard(store=Depends(get_event_store)):
-    events = store.all()
-    recent = list(events[-50:])
-    aggregator = MetricAggregator()
-    metrics = aggregator.aggregate(events)
+    recent = list(store.tail(50))
+    metrics = metric_stats.sync(store).summary()
 
-    total_events = len(events)
-    sources = len({e.source_id for e in events})
-    log_events = [e for e in events if e.event_type == "log"]
-    log_count = len(log_events)
+    total_events = store.count()
+    sources = len(store.last_seen())
+    log_count = store.count(event_type="log")
     level_counts = {
-        "CRITICAL": sum(1 for e in log_events if (e.log_level or "").upper() == "CRITICAL"),
-        "ERROR": sum(1 for e in log_events if (e.log_level or "").upper() == "ERROR"),
-        "WARNING": sum(1 for e in log_events if (e.log_level or "").upper() == "WARNING"),
-        "INFO": sum(1 for e in log_events if (e.log_level or "").upper() == "INFO"),
+        level: store.count(event_type="log", log_level=level) for level in ("CRITICAL", "ERROR", "WARNING", "INFO")
     }
-    metric_count = sum(1 for e in events if e.event_type == "metric")
-    hb_count = sum(1 for e in events if e.event_type == "heartbeat")
+    metric_count = store.count(event_type="metric")
+    hb_count = store.count(event_type="heartbeat")
 
     metric_rows = []
     for key, stats in metrics.items():
-        metric_name, source_id = key.split(":")
+        metric_name, source_id = key.split(":", 1)
         metric_rows.append(
             {
                 "metric": metric_name,
@@ -47,7 +40,7 @@ def dashboard(store=Depends(get_event_store)):
     metric_rows = sorted(metric_rows, key=lambda r: r["metric"])
 
     recent_rows = []
-    for e in reversed(recent):
+    for e in recent:
         msg = e.log_message or e.metric_name or e.event_type
         recent_rows.append(
             {
@@ -60,18 +53,15 @@ def dashboard(store=Depends(get_event_store)):
         )
 
     error_rows = []
-    for e in reversed(log_events):
-        lvl = (e.log_level or "").upper()
-        if lvl in {"ERROR", "CRITICAL"}:
-            error_rows.append(
-                {
-                    "timestamp": e.timestamp.isoformat() if hasattr(e.timestamp, "isoformat") else e.timestamp,
-                    "source": e.source_id,
-                    "level": lvl,
-                    "message": e.log_message or e.metric_name or e.event_type,
-                }
-            )
-    error_rows = error_rows[:30]
+    for e in store.tail(30, event_type="log", log_level=("ERROR", "CRITICAL")):
+        error_rows.append(
+            {
+                "timestamp": e.timestamp.isoformat() if hasattr(e.timestamp, "isoformat") else e.timestamp,
+                "source": e.source_id,
+                "level": (e.log_level or "").upper(),
+                "message": e.log_message or e.metric_name or e.event_type,
+            }
+        )
 
     metric_table = "".join(
         [
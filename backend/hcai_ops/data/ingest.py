@@ -3,14 +3,13 @@ Utilities to ingest raw data sources and convert them into HCaiEvent objects.
 Provides parsers for common text formats and helpers to persist events to disk.
 """
 
-from dataclasses import asdict
 from datetime import UTC, datetime
 from typing import Any, Dict, Iterable, List, Optional
 import ast
 
 import pandas as pd
 
-from .schemas import HCaiEvent
+from .schemas import FIELDS, HCaiEvent
 
 
 def dicts_to_events(payload: List[Dict[str, Any]]) -> List[HCaiEvent]:
@@ -19,7 +18,7 @@ def dicts_to_events(payload: List[Dict[str, Any]]) -> List[HCaiEvent]:
     Unknown keys are preserved inside the extras field.
     """
     events: List[HCaiEvent] = []
-    fields = set(HCaiEvent.__dataclass_fields__.keys())
+    fields = set(FIELDS)
 
     for item in payload:
         data = dict(item) if item is not None else {}
@@ -274,7 +273,7 @@ def save_events_csv(path: str, events: List[HCaiEvent]) -> None:
     rows: List[Dict[str, Any]] = []
 
     for e in events:
-        row = asdict(e)
+        row = e.to_dict()
         if isinstance(row.get("timestamp"), datetime):
             row["timestamp"] = row["timestamp"].isoformat()
         rows.append(row)
@@ -289,7 +288,7 @@ def load_events_csv(path: str) -> List[HCaiEvent]:
     """
     df = pd.read_csv(path)
     events: List[HCaiEvent] = []
-    known_fields = set(HCaiEvent.__dataclass_fields__.keys())
+    known_fields = set(FIELDS)
 
     for row in df.to_dict(orient="records"):
         event_kwargs: Dict[str, Any] = {}
@@ -1,4 +1,3 @@
-from dataclasses import asdict
 from typing import Dict, List
 
 import numpy as np
@@ -8,7 +7,7 @@ from .schemas import HCaiEvent
 
 
 def _events_to_df(events: List[HCaiEvent]) -> pd.DataFrame:
-    df = pd.DataFrame([asdict(e) for e in events])
+    df = pd.DataFrame([e.to_dict() for e in events])
     if not df.empty:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
     return df
@@ -1,24 +1,152 @@
-from dataclasses import dataclass, field
 from datetime import datetime
+from sys import intern
 from typing import Any, Dict, Optional
 
+_OPTIONAL_FIELDS = (
+    "metric_name",
+    "metric_value",
+    "log_message",
+    "log_level",
+    "incident_label",
+    "op_user_id",
+    "op_action_type",
+    "alert_id",
+    "recommended_action",
+    "applied_action",
+    "outcome_label",
+)
+FIELDS = ("timestamp", "source_id", "event_type") + _OPTIONAL_FIELDS + ("extras",)
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _intern(value: Any) -> Any:
+    return intern(value) if type(value) is str else value
+
 
-@dataclass
 class HCaiEvent:
-    """Dataclass representing a unified operational event used within HCAI OPS."""
-
-    timestamp: datetime
-    source_id: str
-    event_type: str
-    metric_name: Optional[str] = None
-    metric_value: Optional[float] = None
-    log_message: Optional[str] = None
-    log_level: Optional[str] = None
-    incident_label: Optional[str] = None
-    op_user_id: Optional[str] = None
-    op_action_type: Optional[str] = None
-    alert_id: Optional[str] = None
-    recommended_action: Optional[str] = None
-    applied_action: Optional[str] = None
-    outcome_label: Optional[str] = None
-    extras: Dict[str, Any] = field(default_factory=dict)
+    """
+    Unified operational event used within HCAI OPS.
+
+    Slotted, with source_id/event_type/metric_name/log_level interned since they
+    repeat across millions of events. ``extras`` is only allocated when an event
+    carries extra fields (or a caller asks for it), so bare samples hold no dict.
+    Use to_dict/from_dict rather than dataclasses.asdict for serialization.
+    """
+
+    __slots__ = ("timestamp", "source_id", "event_type") + _OPTIONAL_FIELDS + ("_extras",)
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        source_id: str,
+        event_type: str,
+        metric_name: Optional[str] = None,
+        metric_value: Optional[float] = None,
+        log_message: Optional[str] = None,
+        log_level: Optional[str] = None,
+        incident_label: Optional[str] = None,
+        op_user_id: Optional[str] = None,
+        op_action_type: Optional[str] = None,
+        alert_id: Optional[str] = None,
+        recommended_action: Optional[str] = None,
+        applied_action: Optional[str] = None,
+        outcome_label: Optional[str] = None,
+        extras: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.timestamp = timestamp
+        self.source_id = _intern(source_id)
+        self.event_type = _intern(event_type)
+        self.metric_name = _intern(metric_name)
+        self.metric_value = metric_value
+        self.log_message = log_message
+        self.log_level = _intern(log_level)
+        self.incident_label = incident_label
+        self.op_user_id = op_user_id
+        self.op_action_type = op_action_type
+        self.alert_id = alert_id
+        self.recommended_action = recommended_action
+        self.applied_action = applied_action
+        self.outcome_label = outcome_label
+        self._extras = extras if extras else None
+
+    @property
+    def extras(self) -> Dict[str, Any]:
+        extras = self._extras
+        if extras is None:
+            extras = self._extras = {}
+        return extras
+
+    @extras.setter
+    def extras(self, value: Optional[Dict[str, Any]]) -> None:
+        self._extras = value
+
+    @property
+    def has_extras(self) -> bool:
+        """True when extras holds data; unlike reading .extras, never allocates."""
+        return bool(self._extras)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field dict with the same keys as dataclasses.asdict; extras is copied one level deep."""
+        extras = self._extras
+        return {
+            "timestamp": self.timestamp,
+            "source_id": self.source_id,
+            "event_type": self.event_type,
+            "metric_name": self.metric_name,
+            "metric_value": self.metric_value,
+            "log_message": self.log_message,
+            "log_level": self.log_level,
+            "incident_label": self.incident_label,
+            "op_user_id": self.op_user_id,
+            "op_action_type": self.op_action_type,
+            "alert_id": self.alert_id,
+            "recommended_action": self.recommended_action,
+            "applied_action": self.applied_action,
+            "outcome_label": self.outcome_label,
+            "extras": dict(extras) if extras else {},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HCaiEvent":
+        """
+        Inverse of to_dict. ISO-string timestamps are parsed; keys that are not
+        event fields are kept in extras. Raises KeyError without the required fields.
+        """
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        get = data.get
+        extras = get("extras")
+        unknown = data.keys() - _FIELD_SET
+        if unknown:
+            extras = {**(extras or {}), **{key: data[key] for key in unknown}}
+        return cls(
+            timestamp,
+            data["source_id"],
+            data["event_type"],
+            get("metric_name"),
+            get("metric_value"),
+            get("log_message"),
+            get("log_level"),
+            get("incident_label"),
+            get("op_user_id"),
+            get("op_action_type"),
+            get("alert_id"),
+            get("recommended_action"),
+            get("applied_action"),
+            get("outcome_label"),
+            extras,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS[:-1]) and (
+            (self._extras or {}) == (other._extras or {})
+        )
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS[:-1])
+        return f"{type(self).__name__}({fields}, extras={self._extras or {}!r})"
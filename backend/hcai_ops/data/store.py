@@ -1,4 +1,3 @@
-from dataclasses import asdict
 from datetime import datetime
 from typing import List, Optional
 
@@ -18,7 +17,7 @@ class EventStore:
     def add_event(self, event: HCaiEvent) -> None:
         self._events.append(event)
         if self.storage:
-            self.storage.append("events", asdict(event))
+            self.storage.append("events", event.to_dict())
 
     def add_events(self, events: List[HCaiEvent]) -> None:
         for event in events:
@@ -1,8 +1,10 @@
-from typing import Dict, Any
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter
 
-from hcai_ops.analytics import event_store
+from hcai_ops.analytics import event_store, stream_correlator
+from hcai_ops.analytics.columnar import analysis_view
 from hcai_ops.analytics.processors import CorrelationEngine
 from hcai_ops.intelligence.risk import RiskScoringEngine
 from hcai_ops.intelligence.incidents import IncidentEngine
@@ -16,13 +18,37 @@ _recommendation_engine = RecommendationEngine()
 _correlation_engine = CorrelationEngine()
 
 
+_computed_lock = threading.Lock()
+# (store seq the results were computed at, results)
+_computed: Tuple[Optional[int], Dict[str, Any]] = (None, {})
+
+
+def _correlations() -> List[Dict[str, Any]]:
+    """The streaming correlator's recent findings, or a full CorrelationEngine pass without one."""
+    correlator = stream_correlator()
+    if correlator is not None:
+        return correlator.findings()
+    return _correlation_engine.correlate(event_store.all())
+
+
 def _compute_all() -> Dict[str, Any]:
-    events = event_store.all()
-    correlations = _correlation_engine.correlate(events)
-    risk = _risk_engine.score(events, correlations=correlations)
+    """
+    Risk, incidents and recommendations for the whole store. Recomputed only when the
+    store's change sequence has moved since the last call; dashboards poll these routes.
+    """
+    global _computed
+    seq = event_store.seq
+    with _computed_lock:
+        if _computed[0] == seq:
+            return _computed[1]
+    correlations = _correlations()
+    risk = _risk_engine.score(analysis_view(event_store), correlations=correlations)
     incidents = _incident_engine.generate(risk)
     recommendations = _recommendation_engine.generate(incidents)
-    return {"risk": risk, "incidents": incidents, "recommendations": recommendations}
+    result = {"risk": risk, "incidents": incidents, "recommendations": recommendations}
+    with _computed_lock:
+        _computed = (seq, result)
+    return result
 
 
 @router.get("/risk")
@@ -40,6 +66,11 @@ def get_recommendations():
     return _compute_all()["recommendations"]
 
 
+@router.get("/correlations")
+def get_correlations():
+    return _correlations()
+
+
 @router.get("/overview")
 def get_overview():
     return _compute_all()
@@ -1,5 +1,7 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+from hcai_ops.analytics.columnar import EventColumns, first_seen_order
+from hcai_ops.analytics.kernels import event_columns, source_risk
 from hcai_ops.data.schemas import HCaiEvent
 
 
@@ -8,7 +10,7 @@ class RiskScoringEngine:
 
     def score(
         self,
-        events: List[HCaiEvent],
+        events: Union[List[HCaiEvent], EventColumns],
         correlations: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Dict[str, float]]:
         scores: Dict[str, Dict[str, float]] = {}
@@ -20,23 +22,7 @@ class RiskScoringEngine:
                 continue
             correlation_counts[source] = correlation_counts.get(source, 0) + 1
 
-        for event in events:
-            source = event.source_id
-            entry = scores.setdefault(
-                source,
-                {"errors": 0, "metric_anomalies": 0, "correlations": correlation_counts.get(source, 0), "risk": 0.0},
-            )
-            if event.event_type == "log":
-                level = (event.log_level or "").upper()
-                if level == "ERROR":
-                    entry["errors"] += 1
-                    entry["risk"] += 10
-                elif level == "CRITICAL":
-                    entry["errors"] += 1
-                    entry["risk"] += 20
-            if event.metric_value is not None and event.metric_value > 0.9:
-                entry["metric_anomalies"] += 1
-                entry["risk"] += 15
+        self._score_columns(event_columns(events), scores, correlation_counts)
 
         for source_id, count in correlation_counts.items():
             entry = scores.setdefault(
@@ -49,3 +35,21 @@ class RiskScoringEngine:
         for entry in scores.values():
             entry["risk"] = min(float(entry["risk"]), 100.0)
         return scores
+
+    def _score_columns(
+        self,
+        cols: EventColumns,
+        scores: Dict[str, Dict[str, float]],
+        correlation_counts: Dict[str, int],
+    ) -> None:
+        if not len(cols):
+            return
+        errors, anomalies, risk = source_risk(cols)
+        for code in first_seen_order(cols.source_ids).tolist():
+            source = cols.source_vocab[code]
+            scores[source] = {
+                "errors": int(errors[code]),
+                "metric_anomalies": int(anomalies[code]),
+                "correlations": correlation_counts.get(source, 0),
+                "risk": float(risk[code]),
+            }
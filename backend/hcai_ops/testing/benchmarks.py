@@ -0,0 +1,322 @@
+"""
+Micro-benchmarks for the event store and analytics hot paths.
+
+Run standalone, not from the test suite: python -m hcai_ops.testing.benchmarks [name ...]
+prints each benchmark's result as JSON (all of them when no name is given).
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def make_metric_events(
+    total: int, sources: int = 50, start: Optional[datetime] = None, event_cls: type = HCaiEvent
+) -> List[Any]:
+    """Build a deterministic stream of metric samples spread across sources."""
+    start = start or datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        event_cls(
+            timestamp=start + timedelta(seconds=i),
+            source_id=f"agent-{i % sources}",
+            event_type="metric",
+            metric_name="cpu_percent",
+            metric_value=float(i % 100),
+        )
+        for i in range(total)
+    ]
+
+
+def benchmark_sqlite_ingest(total: int = 50000, call_size: int = 1, path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Measure sustained SQLiteEventStore ingest with add_events called call_size events at a time
+    (1 mimics the syslog receiver). Throughput includes the final flush to disk.
+    """
+    from hcai_ops.analytics.store import SQLiteEventStore
+
+    events = make_metric_events(total)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteEventStore(path or Path(tmp) / "bench.db")
+        started = time.perf_counter()
+        for i in range(0, total, call_size):
+            store.add_events(events[i : i + call_size])
+        store.flush()
+        duration = time.perf_counter() - started
+        writer = store.stats().get("writer") or {}
+        store.close()
+    return {
+        "events": total,
+        "call_size": call_size,
+        "duration": duration,
+        "eps": total / duration if duration else 0.0,
+        "writer": writer,
+    }
+
+
+@dataclass
+class LegacyEvent:
+    """The original dataclass layout of HCaiEvent, kept as the baseline for event benchmarks."""
+
+    timestamp: datetime
+    source_id: str
+    event_type: str
+    metric_name: Optional[str] = None
+    metric_value: Optional[float] = None
+    log_message: Optional[str] = None
+    log_level: Optional[str] = None
+    incident_label: Optional[str] = None
+    op_user_id: Optional[str] = None
+    op_action_type: Optional[str] = None
+    alert_id: Optional[str] = None
+    recommended_action: Optional[str] = None
+    applied_action: Optional[str] = None
+    outcome_label: Optional[str] = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+def _traced_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def benchmark_event_memory(total: int = 1_000_000) -> Dict[str, Any]:
+    """Bytes per bare metric sample for the legacy dataclass vs the compact HCaiEvent (incl. timestamps)."""
+    legacy = _traced_bytes(lambda: make_metric_events(total, event_cls=LegacyEvent))
+    compact = _traced_bytes(lambda: make_metric_events(total))
+    return {
+        "events": total,
+        "legacy_bytes": legacy,
+        "compact_bytes": compact,
+        "legacy_bytes_per_event": legacy / total if total else 0.0,
+        "compact_bytes_per_event": compact / total if total else 0.0,
+        "ratio": compact / legacy if legacy else 0.0,
+    }
+
+
+def benchmark_event_codec(total: int = 200_000) -> Dict[str, Any]:
+    """Serialization throughput (events/s): dataclasses.asdict vs to_dict, and (**kwargs) vs from_dict."""
+    legacy = make_metric_events(total, event_cls=LegacyEvent)
+    compact = make_metric_events(total)
+
+    def _rate(fn) -> float:
+        started = time.perf_counter()
+        out = fn()
+        duration = time.perf_counter() - started
+        return len(out) / duration if duration else 0.0
+
+    dicts = [e.to_dict() for e in compact]
+    return {
+        "events": total,
+        "asdict_eps": _rate(lambda: [asdict(e) for e in legacy]),
+        "to_dict_eps": _rate(lambda: [e.to_dict() for e in compact]),
+        "legacy_init_eps": _rate(lambda: [LegacyEvent(**d) for d in dicts]),
+        "from_dict_eps": _rate(lambda: [HCaiEvent.from_dict(d) for d in dicts]),
+    }
+
+
+def benchmark_startup(sizes: tuple = (10_000, 100_000), path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Time-to-first-request of SQLiteEventStore against database size: opening the store
+    and answering one range() query, with a full row decode versus snapshot + replay
+    (the replay covers 1% of the rows written after the snapshot).
+    """
+    from hcai_ops.analytics.store import SQLiteEventStore
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base = path or Path(tmp)
+        for total in sizes:
+            db = base / f"startup-{total}.db"
+            snapshot = base / f"startup-{total}.snapshot"
+            events = make_metric_events(total)
+            tail = max(1, total // 100)
+            store = SQLiteEventStore(db, snapshot_path=snapshot)
+            store.add_events(events[: total - tail])
+            store.save_snapshot()
+            store.add_events(events[total - tail :])
+            store.snapshot_path = None  # keep the snapshot from before the tail
+            store.close()
+
+            timings = {}
+            for label, snap in (("full_load_s", None), ("snapshot_s", snapshot)):
+                started = time.perf_counter()
+                reopened = SQLiteEventStore(db, snapshot_path=snap)
+                reopened.range(events[-10].timestamp)
+                timings[label] = time.perf_counter() - started
+                startup = reopened.startup
+                reopened.snapshot_path = None
+                reopened.close()
+            results.append(
+                {
+                    "events": total,
+                    "replayed": startup.get("replayed"),
+                    "snapshot_bytes": snapshot.stat().st_size,
+                    **timings,
+                    "speedup": timings["full_load_s"] / timings["snapshot_s"] if timings["snapshot_s"] else None,
+                }
+            )
+    return results
+
+
+def benchmark_import_time(module: str = "hcai_ops.api.server", storage_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Cold import time of a module in a fresh interpreter, and whether importing it opened
+    the event store (it should not: the store is built on first use).
+    """
+    import json
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - started\n"
+        "from hcai_ops.analytics import event_store\n"
+        "print(json.dumps({'seconds': elapsed, 'store_initialized': event_store.initialized}))\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "HCAI_STORAGE_DIR": str(storage_dir or tmp)}
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return {"module": module, **json.loads(out.stdout.strip().splitlines()[-1])}
+
+
+def benchmark_downsample(agents: int = 500, hours: int = 24, max_points: int = 300) -> Dict[str, Any]:
+    """
+    JSON payload of a 1m-rollup window across `agents` series, as stored versus reduced
+    per series with LTTB and with min/max buckets, and how long each reduction takes.
+    """
+    import json
+
+    from hcai_ops.analytics.downsample import downsample
+    from hcai_ops.analytics.rollups import points
+
+    start_us = int(datetime(2025, 1, 1, tzinfo=UTC).timestamp() * 1_000_000)
+    minutes = hours * 60
+    rows = [
+        (
+            "cpu_percent",
+            f"agent-{a:04d}",
+            start_us + m * 60_000_000,
+            4,
+            float(4 * ((a + m) % 100)),
+            float(4 * ((a + m) % 100) ** 2),
+            float((a + m) % 100),
+            float((a + m) % 100),
+            float((a + m) % 100),
+        )
+        for a in range(agents)
+        for m in range(minutes)
+    ]
+    window_us = minutes * 60_000_000
+    result: Dict[str, Any] = {"agents": agents, "rows": len(rows), "raw_bytes": len(json.dumps(points(rows, 60)))}
+    for method in ("lttb", "minmax"):
+        started = time.perf_counter()
+        reduced, width = downsample(rows, method=method, max_points=max_points, window_us=window_us)
+        result[f"{method}_s"] = time.perf_counter() - started
+        result[f"{method}_points"] = len(reduced)
+        result[f"{method}_bytes"] = len(json.dumps(points(reduced, max(60, width or 0))))
+    return result
+
+
+def _per_event_baseline(events: List[HCaiEvent], cutoff: datetime) -> None:
+    """The processors' former per-event loops: metric summary, error counts, latest sample, risk."""
+    summary: Dict[str, Dict[str, float]] = {}
+    errors: Dict[str, int] = {}
+    latest: Dict[str, tuple] = {}
+    risk: Dict[str, Dict[str, float]] = {}
+    for e in events:
+        if e.metric_name is not None and e.metric_value is not None:
+            key = f"{e.metric_name}:{e.source_id}"
+            b = summary.setdefault(key, {"count": 0, "min": e.metric_value, "max": e.metric_value, "avg": 0.0})
+            b["count"] += 1
+            b["min"] = min(b["min"], e.metric_value)
+            b["max"] = max(b["max"], e.metric_value)
+            b["avg"] = ((b["avg"] * (b["count"] - 1)) + e.metric_value) / b["count"]
+            ts = e.timestamp.astimezone(UTC)
+            if e.event_type == "metric" and ts >= cutoff and (key not in latest or ts > latest[key][0]):
+                latest[key] = (ts, e)
+        level = (e.log_level or "").upper()
+        if e.event_type == "log" and level in ("ERROR", "CRITICAL"):
+            errors[e.source_id] = errors.get(e.source_id, 0) + 1
+        entry = risk.setdefault(e.source_id, {"errors": 0, "metric_anomalies": 0, "correlations": 0, "risk": 0.0})
+        if e.event_type == "log" and level in ("ERROR", "CRITICAL"):
+            entry["errors"] += 1
+            entry["risk"] += 10 if level == "ERROR" else 20
+        if e.metric_value is not None and e.metric_value > 0.9:
+            entry["metric_anomalies"] += 1
+            entry["risk"] += 15
+
+
+def benchmark_processors(total: int = 1_000_000, sources: int = 200) -> Dict[str, Any]:
+    """
+    MetricAggregator, LogAnomalyDetector, MetricThresholdDetector and RiskScoringEngine over
+    one mixed batch: the former per-event loops versus encoding the batch once and running
+    the NumPy kernels.
+    """
+    from hcai_ops.analytics.kernels import event_columns
+    from hcai_ops.analytics.processors import LogAnomalyDetector, MetricAggregator, MetricThresholdDetector
+    from hcai_ops.intelligence.risk import RiskScoringEngine
+
+    start = datetime.now(UTC) - timedelta(seconds=total // 100)
+    names, levels = ("cpu_percent", "ram_percent", "disk_percent"), ("INFO", "warning", "error", "CRITICAL")
+    events = [
+        HCaiEvent(start + timedelta(milliseconds=10 * i), f"agent-{i % sources}", "log", log_level=levels[i % 4], log_message="m")
+        if i % 4 == 3
+        else HCaiEvent(
+            start + timedelta(milliseconds=10 * i),
+            f"agent-{i % sources}",
+            "metric",
+            metric_name=names[i % 3],
+            metric_value=float(i % 100),
+        )
+        for i in range(total)
+    ]
+    detector = MetricThresholdDetector(lookback_minutes=24 * 60)
+    cutoff = datetime.now(UTC) - detector.lookback
+
+    started = time.perf_counter()
+    _per_event_baseline(events, cutoff)
+    baseline_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cols = event_columns(events)
+    encode_s = time.perf_counter() - started
+    started = time.perf_counter()
+    MetricAggregator().aggregate(cols)
+    LogAnomalyDetector().detect(cols)
+    detector.detect(cols)
+    RiskScoringEngine().score(cols)
+    kernels_s = time.perf_counter() - started
+    return {
+        "events": total,
+        "per_event_s": baseline_s,
+        "encode_s": encode_s,
+        "kernels_s": kernels_s,
+        "speedup": baseline_s / (encode_s + kernels_s),
+        "speedup_columnar_store": baseline_s / kernels_s,
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    names = sys.argv[1:] or [name[len("benchmark_") :] for name in sorted(globals()) if name.startswith("benchmark_")]
+    for name in names:
+        print(json.dumps({name: globals()[f"benchmark_{name}"]()}, default=str))
@@ -0,0 +1,83 @@
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.store import EventStore, PersistentEventStore, SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+import hcai_ops.intelligence.api as intelligence_api
+from hcai_ops.intelligence.incidents import IncidentEngine
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _events(n: int, start: int = 0):
+    return [HCaiEvent(BASE + timedelta(seconds=start + i), "s1", "metric", metric_name="cpu", metric_value=float(start + i)) for i in range(n)]
+
+
+def _values(batch):
+    return [e.metric_value for e in batch.events]
+
+
+def test_changes_since_returns_only_new_events():
+    store = EventStore()
+    assert store.seq == 0 and store.changes_since(0) == ([], 0, True)
+    store.add_events(_events(3))
+    store.add_events(_events(2, start=3))
+    assert store.seq == 5
+    batch = store.changes_since(2)
+    assert _values(batch) == [2.0, 3.0, 4.0] and batch.seq == 5 and batch.complete
+    assert store.changes_since(batch.seq).events == []
+
+    store.CHANGE_LOG_SIZE = 4
+    store.add_events(_events(3, start=5))
+    assert store.changes_since(1).complete is False
+    assert _values(store.changes_since(5)) == [5.0, 6.0, 7.0]
+
+    store.mark_reset()
+    after_reset = store.changes_since(8)
+    assert after_reset.seq == 9 and not after_reset.complete and after_reset.events == []
+    assert store.changes_since(42).complete is False
+
+
+def test_listeners_can_unsubscribe():
+    store, seen = EventStore(), []
+    store.add_listener(seen.extend)
+    store.add_events(_events(2))
+    store.remove_listener(seen.extend)
+    store.add_events(_events(2, start=2))
+    assert len(seen) == 2 and store.seq == 4
+
+
+def test_reload_feeds_rows_from_other_writers(tmp_path):
+    writer = SQLiteEventStore(tmp_path / "events.db")
+    reader = SQLiteEventStore(tmp_path / "events.db")
+    writer.add_events(_events(4))
+    writer.flush()
+    start = reader.seq
+    reader.reload()
+    assert _values(reader.changes_since(start)) == [0.0, 1.0, 2.0, 3.0]
+    writer.close()
+    reader.close()
+
+    jsonl = PersistentEventStore(tmp_path / "events.jsonl")
+    other = PersistentEventStore(tmp_path / "events.jsonl")
+    jsonl.add_events(_events(2))
+    other.reload()
+    assert _values(other.changes_since(0)) == [0.0, 1.0]
+    other.truncate()
+    assert not other.changes_since(2).complete
+
+
+def test_intelligence_recomputes_only_after_changes(monkeypatch):
+    store = EventStore()
+    calls = []
+    monkeypatch.setattr(intelligence_api, "event_store", store)
+    monkeypatch.setattr(intelligence_api, "_computed", (None, {}))
+    monkeypatch.setattr(intelligence_api, "_incident_engine", IncidentEngine())
+    real = intelligence_api._risk_engine.score
+    monkeypatch.setattr(intelligence_api._risk_engine, "score", lambda *args, **kwargs: calls.append(1) or real(*args, **kwargs))
+
+    store.add_events(_events(3))
+    first = intelligence_api._compute_all()
+    assert intelligence_api._compute_all() is first and len(calls) == 1
+    store.add_events(_events(1, start=3))
+    intelligence_api._compute_all()
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.processors import LogAnomalyDetector, MetricAggregator
+from hcai_ops.data.schemas import HCaiEvent
+from hcai_ops.intelligence.risk import RiskScoringEngine
+
+
+def _events() -> list[HCaiEvent]:
+    base = datetime(2025, 1, 1, 0, 0, 0, tzinfo=UTC)
+    return [
+        HCaiEvent(timestamp=base, source_id="s1", event_type="metric", metric_name="cpu", metric_value=0.5),
+        HCaiEvent(timestamp=base + timedelta(seconds=10), source_id="s2", event_type="metric", metric_name="cpu", metric_value=0.95),
+        HCaiEvent(timestamp=base + timedelta(seconds=20), source_id="s1", event_type="metric", metric_name="cpu", metric_value=0.7),
+        HCaiEvent(timestamp=base + timedelta(seconds=30), source_id="s1", event_type="log", log_message="boom", log_level="error"),
+        HCaiEvent(timestamp=base + timedelta(seconds=40), source_id="s2", event_type="log", log_message="down", log_level="CRITICAL"),
+        HCaiEvent(timestamp=base + timedelta(seconds=50), source_id="s2", event_type="log", log_message="ok", log_level="INFO", extras={"k": 1}),
+        HCaiEvent(timestamp=datetime(2025, 1, 1, 0, 1, 0), source_id="s3", event_type="heartbeat"),
+    ]
+
+
+def test_columnar_store_roundtrips_events_across_chunks():
+    events = _events()
+    store = ColumnarEventStore(chunk_rows=3)
+    store.add_events(events[:2])
+    store.add_events(events[2:])
+
+    assert len(store) == len(events)
+    assert store.all() == events
+    assert store.stats()["chunks"] == 3
+
+
+def test_columnar_store_since_and_filter():
+    store = ColumnarEventStore(chunk_rows=4)
+    store.add_events(_events())
+
+    since = store.since(datetime(2025, 1, 1, 0, 0, 35, tzinfo=UTC))
+    assert [e.log_message for e in since if e.event_type == "log"] == ["down", "ok"]
+    assert since[-1].source_id == "s3"
+
+    logs = store.filter(source_id="s2", event_type="log")
+    assert [e.log_level for e in logs] == ["CRITICAL", "INFO"]
+    assert store.filter(source_id="missing") == []
+
+
+def test_columnar_store_reset_via_events_attribute():
+    store = ColumnarEventStore()
+    store.add_events(_events())
+    store._events = []  # type: ignore[attr-defined]
+    assert store.all() == []
+    assert len(store.columns()) == 0
+
+
+def test_assigning_events_rebuilds_columns_without_notifying():
+    events = _events()
+    store = ColumnarEventStore(chunk_rows=3)
+    store.add_events(events[:2])
+    seen = []
+    store.add_listener(seen.extend)
+    seq = store.seq
+    store._events = events  # type: ignore[attr-defined]
+    assert store.all() == events
+    assert seen == [] and store.seq == seq
+
+
+def test_columns_copy_only_rows_written_since_the_last_read():
+    events = _events()
+    store = ColumnarEventStore(chunk_rows=3)
+    store.add_events(events[:4])
+    first = store.columns()
+    assert first is store.columns()
+    store.add_events(events[4:])
+    second = store.columns()
+    assert list(first.timestamps) == list(second.timestamps[:4])
+    assert len(first) == 4 and len(second) == len(events)
+    assert [second.source_vocab[c] for c in second.source_ids] == [e.source_id for e in events]
+    assert store._flat_rows == len(events)
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda data: MetricAggregator().aggregate(data),
+        lambda data: LogAnomalyDetector(threshold=1).detect(data),
+        lambda data: RiskScoringEngine().score(data, correlations=[{"source_id": "s1"}]),
+    ],
+)
+def test_column_fast_paths_match_list_paths(run):
+    store = ColumnarEventStore(chunk_rows=2)
+    store.add_events(_events())
+    assert run(store.columns()) == run(store.all())
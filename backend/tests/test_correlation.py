@@ -0,0 +1,94 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from hcai_ops.analytics.kernels import window_join
+from hcai_ops.analytics.processors import CorrelationEngine
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _nested_loop(events, threshold=0.9, window=timedelta(minutes=5), levels=("ERROR",), metric_names=None):
+    findings = []
+    for event in events:
+        if event.metric_value is None or event.metric_name is None or event.metric_value <= threshold:
+            continue
+        if metric_names is not None and event.metric_name not in metric_names:
+            continue
+        for log in events:
+            if log.event_type != "log" or log.source_id != event.source_id:
+                continue
+            if (log.log_level or "").upper() in levels and abs(event.timestamp - log.timestamp) <= window:
+                findings.append(
+                    {
+                        "source_id": event.source_id,
+                        "metric": event.metric_name,
+                        "metric_value": event.metric_value,
+                        "log_message": log.log_message,
+                    }
+                )
+                break
+    return findings
+
+
+def _shuffled_events(n=600, seed=5):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        ts = BASE + timedelta(seconds=rng.randrange(0, 3600))
+        source = rng.choice(["web-1", "web-2", "db-1"])
+        if rng.random() < 0.5:
+            name = rng.choice(["cpu_usage", "mem_usage"])
+            events.append(HCaiEvent(ts, source, "metric", metric_name=name, metric_value=rng.choice([0.5, 0.95, 0.99, None])))
+        else:
+            level = rng.choice(["ERROR", "error", "CRITICAL", "INFO", None])
+            events.append(HCaiEvent(ts, source, "log", log_level=level, log_message=f"log-{i}"))
+    return events
+
+
+def test_window_join_matches_nested_loop_on_unsorted_input():
+    events = _shuffled_events()
+    assert CorrelationEngine().correlate(events) == _nested_loop(events)
+    engine = CorrelationEngine(window_minutes=1, metric_names=["mem_usage"], log_levels=["error", "critical"])
+    assert engine.correlate(events) == _nested_loop(
+        events, window=timedelta(minutes=1), levels=("ERROR", "CRITICAL"), metric_names={"mem_usage"}
+    )
+    assert CorrelationEngine().correlate([]) == []
+
+
+def test_window_edges_are_inclusive():
+    events = [
+        HCaiEvent(BASE, "s1", "metric", metric_name="cpu", metric_value=0.95),
+        HCaiEvent(BASE + timedelta(minutes=5, microseconds=1), "s1", "log", log_level="ERROR", log_message="late"),
+        HCaiEvent(BASE - timedelta(minutes=5), "s1", "log", log_level="ERROR", log_message="edge"),
+        HCaiEvent(BASE, "s2", "log", log_level="ERROR", log_message="other source"),
+    ]
+    assert [c["log_message"] for c in CorrelationEngine().correlate(events)] == ["edge"]
+
+    left = np.array([0, 0, 1])
+    matches = window_join(left, np.array([100, 500, 100]), np.array([0, 0, 1, 0]), np.array([400, 90, 100, 95]), 10)
+    # Row 0 sees positions 1 and 3 in its window and takes the first; row 1 has none.
+    assert matches.tolist() == [1, -1, 2]
+
+
+def test_correlations_endpoint_filters(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from hcai_ops.analytics.store import EventStore
+    from hcai_ops.api.server import app
+
+    store = EventStore()
+    store.add_events(
+        [
+            HCaiEvent(BASE, "s1", "metric", metric_name="cpu", metric_value=0.95),
+            HCaiEvent(BASE, "s1", "metric", metric_name="mem", metric_value=0.97),
+            HCaiEvent(BASE, "s1", "log", log_level="CRITICAL", log_message="disk"),
+        ]
+    )
+    monkeypatch.setattr("hcai_ops.api.server.event_store", store)
+    client = TestClient(app)
+    assert client.get("/api/analytics/correlations").json() == []
+    found = client.get("/api/analytics/correlations", params={"log_level": "critical", "metric_name": "mem"}).json()
+    assert [(c["metric"], c["log_message"]) for c in found] == [("mem", "disk")]
@@ -0,0 +1,94 @@
+import math
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from hcai_ops.analytics.api import get_timeseries
+from hcai_ops.analytics.downsample import downsample, lttb_indices, series_bounds
+from hcai_ops.analytics.rollups import RollupStore
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _reference_lttb(x, y, n):
+    if n >= len(x):
+        return list(range(len(x)))
+    every, a, out = (len(x) - 2) / (n - 2), 0, [0]
+    for i in range(n - 2):
+        lo, hi = math.floor(i * every) + 1, math.floor((i + 1) * every) + 1
+        nxt = min(math.floor((i + 2) * every) + 1, len(x))
+        mx, my = sum(x[hi:nxt]) / (nxt - hi), sum(y[hi:nxt]) / (nxt - hi)
+        areas = [abs((x[a] - mx) * (y[j] - y[a]) - (x[a] - x[j]) * (my - y[a])) for j in range(lo, hi)]
+        a = lo + areas.index(max(areas))
+        out.append(a)
+    return out + [len(x) - 1]
+
+
+def test_vectorized_lttb_matches_reference_per_series():
+    rng = np.random.default_rng(7)
+    lengths = rng.integers(1, 300, 12)
+    xs = [np.cumsum(rng.integers(1, 9, n)).astype(float) for n in lengths]
+    ys = [rng.normal(size=n).cumsum() for n in lengths]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    for n_out in (3, 40):
+        got = lttb_indices(np.concatenate(xs), np.concatenate(ys), starts, lengths, n_out)
+        want = [s + i for s, x, y in zip(starts, xs, ys) for i in _reference_lttb(list(x), list(y), n_out)]
+        assert got.tolist() == sorted(want)
+
+
+def _rows(sources=3, minutes=120):
+    start = int(datetime(2025, 1, 1, tzinfo=UTC).timestamp() * 1_000_000)
+    return [
+        ("cpu", f"s{s}", start + m * 60_000_000, 2, 2.0 * m, 2.0 * m * m, float(m), float(m + s), float(m))
+        for s in range(sources)
+        for m in range(minutes)
+    ]
+
+
+def test_minmax_buckets_keep_extremes_and_counts():
+    rows = _rows()
+    reduced, width = downsample(rows, method="minmax", step_us=600_000_000)
+    assert width == 600
+    starts, lengths = series_bounds(reduced)
+    assert lengths.tolist() == [12, 12, 12]
+    first = reduced[0]
+    assert first[3] == 20 and first[6] == 0.0 and first[7] == 9.0 and first[8] == 9.0
+    assert sum(r[3] for r in reduced) == sum(r[3] for r in rows)
+
+    lttb, width = downsample(rows, method="lttb", max_points=20)
+    assert width is None and len(lttb) == 60 and set(lttb) <= set(rows)
+    with pytest.raises(ValueError):
+        downsample(rows, method="spline", max_points=20)
+
+
+def test_timeseries_downsamples_per_series(tmp_path):
+    store = EventStore()
+    rollups = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    store.add_listener(rollups.add_events)
+    now = datetime.now(UTC).replace(second=0, microsecond=0)
+    store.add_events(
+        [
+            HCaiEvent(now - timedelta(seconds=10 * i), f"s{s}", "metric", metric_name="cpu", metric_value=float(i % 7))
+            for s in range(2)
+            for i in range(300)
+        ]
+    )
+
+    raw = get_timeseries(minutes=60, metric_name="cpu", store=store, rollup_store=rollups)
+    assert len(raw) == 600
+    # 200 points over an hour is finer than any rollup tier: LTTB picks raw samples.
+    reduced = get_timeseries(minutes=60, metric_name="cpu", max_points=200, store=store, rollup_store=rollups)
+    assert [sum(p["source_id"] == s for p in reduced) for s in ("s0", "s1")] == [200, 200]
+    assert {p["bucket_seconds"] for p in reduced} == {0}
+    assert {p["max"] for p in reduced} == {float(v) for v in range(7)}
+    coarse = get_timeseries(minutes=60, metric_name="cpu", max_points=30, store=store, rollup_store=rollups)
+    assert len(coarse) == 60 and {p["bucket_seconds"] for p in coarse} == {60}
+
+    buckets = get_timeseries(
+        minutes=60, source_id="s1", step=300, method="minmax", store=store, rollup_store=rollups
+    )
+    assert {p["source_id"] for p in buckets} == {"s1"} and {p["bucket_seconds"] for p in buckets} == {300}
+    assert sum(p["count"] for p in buckets) == 300
+    assert max(p["max"] for p in buckets) == 6.0
+    rollups.close()
@@ -0,0 +1,114 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.api.server import app
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _events(n: int = 50):
+    return [
+        HCaiEvent(
+            BASE + timedelta(seconds=i),
+            f"s{i % 3}",
+            "log" if i % 5 == 0 else "metric",
+            log_level="error" if i % 5 == 0 else None,
+            metric_value=float(i),
+        )
+        for i in range(n)
+    ]
+
+
+def _walk(store, **kwargs):
+    seen, items, next_id = [], *store.page(7, **kwargs)
+    while True:
+        seen.extend(items)
+        if next_id is None:
+            return seen
+        key = "after_id" if "after_id" in kwargs else "before_id"
+        kwargs[key] = next_id
+        items, next_id = store.page(7, **kwargs)
+
+
+@pytest.fixture(params=["memory", "sqlite", "tiered", "columnar", "partitioned"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = EventStore()
+    elif request.param == "columnar":
+        store = ColumnarEventStore(chunk_rows=16)
+    elif request.param == "partitioned":
+        store = PartitionedSQLiteEventStore(tmp_path / "partitions", granularity="hour")
+    else:
+        store = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9 if request.param == "tiered" else None)
+    store.add_events(_events())
+    if request.param == "tiered":
+        store._evict_before(to_epoch_us(BASE + timedelta(seconds=30)))
+        assert len(store._events) == 20
+    yield store
+    if isinstance(store, SQLiteEventStore):
+        store.close()
+
+
+def test_pages_walk_every_event_once(store):
+    newest_first = _walk(store, before_id=None)
+    assert [e.metric_value for _, e in newest_first] == [float(i) for i in range(49, -1, -1)]
+    oldest_first = _walk(store, after_id=0)
+    assert [event_id for event_id, _ in oldest_first] == sorted(event_id for event_id, _ in newest_first)
+
+    logs = _walk(store, after_id=0, source_id="s0", log_level="ERROR")
+    assert [e.metric_value for _, e in logs] == [0.0, 15.0, 30.0, 45.0]
+    window = _walk(store, after_id=0, start=BASE + timedelta(seconds=20), end=BASE + timedelta(seconds=40), event_type="log")
+    assert [e.metric_value for _, e in window] == [20.0, 25.0, 30.0, 35.0]
+
+    items, next_id = store.page(5)
+    assert next_id == items[-1][0]
+    assert store.page(5, before_id=next_id)[0][0][1].metric_value == 44.0
+
+
+def test_events_endpoint_returns_opaque_cursor(monkeypatch):
+    store = EventStore()
+    store.add_events(_events())
+    monkeypatch.setattr("hcai_ops.api.server.event_store", store)
+    client = TestClient(app)
+
+    first = client.get("/api/events", params={"limit": 20, "after_id": 0, "event_type": "metric"}).json()
+    assert len(first["items"]) == 20 and first["items"][0]["id"] == 2
+    second = client.get("/api/events", params={"cursor": first["next_cursor"]}).json()
+    assert second["next_cursor"] is None
+    assert {item["event_type"] for item in second["items"]} == {"metric"}
+    assert len(first["items"]) + len(second["items"]) == 40
+
+    assert client.get("/api/events", params={"cursor": "%%%"}).status_code == 400
+    recent = client.get("/api/events", params={"limit": 3}).json()
+    assert [item["id"] for item in recent["items"]] == [50, 49, 48]
+
+
+def test_partitioned_pages_cross_periods_and_types(tmp_path, monkeypatch):
+    store = PartitionedSQLiteEventStore(tmp_path / "partitions", granularity="hour")
+    # Every 20 minutes a metric and a log with the same timestamp, over four hours.
+    events = [
+        HCaiEvent(BASE + timedelta(minutes=20 * (i // 2)), "s1", "log" if i % 2 else "metric", metric_value=float(i))
+        for i in range(24)
+    ]
+    store.add_events(events)
+    expected = sorted(range(24), key=lambda i: (i // 2, "log" if i % 2 else "metric"))
+
+    assert [int(e.metric_value) for _, e in _walk(store, after_id=0)] == expected
+    assert [int(e.metric_value) for _, e in _walk(store, before_id=None)] == expected[::-1]
+    with pytest.raises(ValueError):
+        store.page(5, after_id="not-an-id")
+
+    monkeypatch.setattr("hcai_ops.api.server.event_store", store)
+    client = TestClient(app)
+    first = client.get("/api/events", params={"limit": 5}).json()
+    assert [int(item["metric_value"]) for item in first["items"]] == expected[:-6:-1]
+    second = client.get("/api/events", params={"limit": 5, "cursor": first["next_cursor"]}).json()
+    assert [int(item["metric_value"]) for item in second["items"]] == expected[-6:-11:-1]
+    assert client.get("/api/events", params={"after_id": "1:metric"}).status_code == 400
@@ -0,0 +1,57 @@
+from datetime import UTC, datetime
+
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def test_event_is_slotted_and_allocates_extras_lazily():
+    evt = HCaiEvent(timestamp=datetime(2025, 1, 1, tzinfo=UTC), source_id="agent-1", event_type="metric", extras={})
+    assert not hasattr(evt, "__dict__")
+    assert not evt.has_extras and evt._extras is None
+    evt.extras["note"] = "x"
+    assert evt.has_extras and evt.extras == {"note": "x"}
+
+
+def test_event_strings_are_interned():
+    a = HCaiEvent(datetime(2025, 1, 1), "".join(["agent", "-1"]), "metric", metric_name="".join(["cpu", "_pct"]))
+    b = HCaiEvent(datetime(2025, 1, 1), "".join(["agent", "-1"]), "metric", metric_name="".join(["cpu", "_pct"]))
+    assert a.source_id is b.source_id
+    assert a.metric_name is b.metric_name
+
+
+def test_to_dict_from_dict_round_trip():
+    evt = HCaiEvent(
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+        source_id="s1",
+        event_type="log",
+        log_message="boom",
+        log_level="ERROR",
+        extras={"severity": 0.9},
+    )
+    data = evt.to_dict()
+    assert list(data) == [
+        "timestamp",
+        "source_id",
+        "event_type",
+        "metric_name",
+        "metric_value",
+        "log_message",
+        "log_level",
+        "incident_label",
+        "op_user_id",
+        "op_action_type",
+        "alert_id",
+        "recommended_action",
+        "applied_action",
+        "outcome_label",
+        "extras",
+    ]
+    data["extras"]["severity"] = 0.1
+    assert evt.extras["severity"] == 0.9
+
+    data["timestamp"] = data["timestamp"].isoformat()
+    data["service"] = "api"
+    back = HCaiEvent.from_dict(data)
+    assert back.timestamp == evt.timestamp
+    assert back.extras == {"severity": 0.1, "service": "api"}
+    assert HCaiEvent.from_dict(evt.to_dict()) == evt
+    assert evt != back
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.api import get_anomalies
+from hcai_ops.analytics.hotseries import HotSeriesCache
+from hcai_ops.analytics.processors import MetricThresholdDetector
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _metric(ts: datetime, value, source_id: str = "agent-1", name: str = "cpu_percent") -> HCaiEvent:
+    return HCaiEvent(ts, source_id, "metric", metric_name=name, metric_value=value)
+
+
+def test_ring_wraps_and_tracks_latest_by_timestamp():
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    hot = HotSeriesCache(capacity=4)
+    hot.add_events([_metric(base + timedelta(seconds=i), float(i)) for i in range(6)])
+    hot.add_events([_metric(base + timedelta(seconds=1), 99.0), _metric(base, "n/a"), HCaiEvent(base, "agent-1", "log")])
+
+    assert [v for _, v in hot.last("cpu_percent", "agent-1", 10)] == [3.0, 4.0, 5.0, 99.0]
+    assert hot.last("cpu_percent", "agent-1", 2)[-1] == (to_epoch_us(base + timedelta(seconds=1)), 99.0)
+    assert hot.latest("cpu_percent", "agent-1") == (to_epoch_us(base + timedelta(seconds=5)), 5.0)
+    stats = hot.window_stats("cpu_percent", "agent-1", to_epoch_us(base + timedelta(seconds=4)))
+    assert stats == {"count": 2, "min": 4.0, "max": 5.0, "avg": 4.5, "last": 5.0}
+    assert hot.window_stats("cpu_percent", "missing")["count"] == 0
+    assert hot.stats()["series"] == 1 and hot.folded_samples == 7
+
+    hot.add_events([_metric(base + timedelta(seconds=i), float(i)) for i in range(10, 20)])
+    assert [v for _, v in hot.last("cpu_percent", "agent-1", 10)] == [16.0, 17.0, 18.0, 19.0]
+
+
+def test_detect_latest_matches_event_scan():
+    now = datetime.now(UTC)
+    events = [
+        _metric(now - timedelta(minutes=2), 97.0),
+        _metric(now - timedelta(minutes=1), 40.0),
+        _metric(now - timedelta(minutes=1), 0.95, source_id="agent-2", name="ram_percent"),
+        _metric(now - timedelta(minutes=30), 99.0, source_id="agent-3"),
+        _metric(now - timedelta(minutes=1), 50.0, name="unthresholded"),
+    ]
+    store, hot = EventStore(), HotSeriesCache()
+    store.add_listener(hot.add_events)
+    store.add_events(events)
+
+    detector = MetricThresholdDetector()
+    by_id = lambda findings: sorted(findings, key=lambda f: f["id"])
+    assert by_id(detector.detect_latest(hot)) == by_id(detector.detect(events))
+    assert [f["anomaly"] for f in by_id(detector.detect_latest(hot))] == [False, True]
+
+    findings = get_anomalies(store=store, hot=hot, rates=None)
+    assert {f["id"] for f in findings if f.get("type") == "metric_threshold"} == {
+        "cpu_percent:agent-1",
+        "ram_percent:agent-2",
+    }
@@ -0,0 +1,54 @@
+from datetime import UTC, datetime
+
+from hcai_ops.analytics.store import PersistentEventStore, SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _evt(source_id: str) -> HCaiEvent:
+    return HCaiEvent(timestamp=datetime(2025, 1, 1, tzinfo=UTC), source_id=source_id, event_type="heartbeat")
+
+
+def test_sqlite_reload_pulls_only_foreign_rows(tmp_path):
+    path = tmp_path / "events.db"
+    reader = SQLiteEventStore(path)
+    writer = SQLiteEventStore(path)
+
+    reader.add_events([_evt("own-1")])
+    writer.add_events([_evt("other-1"), _evt("other-2")])
+    writer.flush()
+    reader.add_events([_evt("own-2")])
+
+    assert reader.reload() == 4
+    assert [e.source_id for e in reader.all()] == ["own-1", "own-2", "other-1", "other-2"]
+    # Nothing new: reload is a no-op and does not duplicate rows.
+    assert reader.reload() == 4
+    assert reader.stats()["stored_events"] == 4
+
+    # An emptied table triggers a full reload.
+    reader.conn.execute("DELETE FROM events")
+    reader.conn.commit()
+    assert reader.reload() == 0
+    reader.close()
+    writer.close()
+
+
+def test_jsonl_reload_reads_from_offset(tmp_path):
+    path = tmp_path / "events.jsonl"
+    reader = PersistentEventStore(path)
+    reader.add_events([_evt("own-1")])
+
+    other = PersistentEventStore(path)
+    other.add_events([_evt("other-1")])
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"timestamp": "2025-01-01T00:00:00", "source_id": "partial"')
+
+    assert reader.reload() == 2
+    assert [e.source_id for e in reader.all()] == ["own-1", "other-1"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(', "event_type": "heartbeat"}\n')
+    assert reader.reload() == 3
+    assert reader.all()[-1].source_id == "partial"
+
+    path.write_text("", encoding="utf-8")
+    assert reader.reload() == 0
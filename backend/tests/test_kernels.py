@@ -0,0 +1,139 @@
+import math
+import random
+from datetime import UTC, datetime, timedelta, timezone
+
+import numpy as np
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.kernels import event_columns, grouped_stats, latest_rows
+from hcai_ops.analytics.processors import LogAnomalyDetector, MetricAggregator, MetricThresholdDetector
+from hcai_ops.data.schemas import HCaiEvent
+from hcai_ops.intelligence.risk import RiskScoringEngine
+
+
+# Per-event reference loops, as the processors computed them before the kernels.
+def _reference_aggregate(events):
+    summary = {}
+    for event in events:
+        if event.metric_name is None or event.metric_value is None:
+            continue
+        key = f"{event.metric_name}:{event.source_id}"
+        bucket = summary.setdefault(key, {"count": 0, "min": event.metric_value, "max": event.metric_value, "avg": 0.0})
+        bucket["count"] += 1
+        bucket["min"] = min(bucket["min"], event.metric_value)
+        bucket["max"] = max(bucket["max"], event.metric_value)
+        bucket["avg"] = ((bucket["avg"] * (bucket["count"] - 1)) + event.metric_value) / bucket["count"]
+    return summary
+
+
+def _reference_log_counts(events):
+    counts = {}
+    for event in events:
+        if event.event_type == "log" and (event.log_level or "").upper() in ("ERROR", "CRITICAL"):
+            counts[event.source_id] = counts.get(event.source_id, 0) + 1
+    return counts
+
+
+def _reference_latest(events, cutoff):
+    latest = {}
+    for event in events:
+        if event.event_type != "metric" or event.metric_name is None or event.metric_value is None:
+            continue
+        ts = event.timestamp
+        ts = ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+        if ts < cutoff:
+            continue
+        key = f"{event.metric_name}:{event.source_id}"
+        if key not in latest or ts > latest[key][0]:
+            latest[key] = (ts, event.metric_value)
+    return latest
+
+
+def _reference_risk(events):
+    scores = {}
+    for event in events:
+        entry = scores.setdefault(event.source_id, {"errors": 0, "metric_anomalies": 0, "correlations": 0, "risk": 0.0})
+        if event.event_type == "log":
+            level = (event.log_level or "").upper()
+            if level in ("ERROR", "CRITICAL"):
+                entry["errors"] += 1
+                entry["risk"] += 10 if level == "ERROR" else 20
+        if event.metric_value is not None and event.metric_value > 0.9:
+            entry["metric_anomalies"] += 1
+            entry["risk"] += 15
+    for entry in scores.values():
+        entry["risk"] = min(float(entry["risk"]), 100.0)
+    return scores
+
+
+def _events(n=3000, seed=3):
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    out = []
+    for i in range(n):
+        ts = now - timedelta(seconds=rng.randrange(0, 1800))
+        if rng.random() < 0.2:
+            ts = ts.replace(tzinfo=None)
+        source = rng.choice(["web-1", "web-2", "db-1", None])
+        kind = rng.random()
+        if kind < 0.5:
+            value = rng.choice([rng.uniform(0, 100), rng.uniform(0, 1), rng.randrange(0, 100)])
+            name = rng.choice(["cpu_percent", "ram_percent", "latency_ms"])
+            out.append(HCaiEvent(ts, source, "metric", metric_name=name, metric_value=value))
+        elif kind < 0.9:
+            level = rng.choice(["error", "ERROR", "Critical", "warning", "INFO", None])
+            out.append(HCaiEvent(ts, source, "log", log_level=level, log_message="m", metric_value=rng.choice([None, 0.95])))
+        else:
+            out.append(HCaiEvent(ts, source, "heartbeat"))
+    return out
+
+
+def test_processors_match_per_event_loops():
+    events = _events()
+    summary = MetricAggregator().aggregate(events)
+    expected = _reference_aggregate(events)
+    assert list(summary) == list(expected)
+    for key, stats in expected.items():
+        assert summary[key]["count"] == stats["count"]
+        assert summary[key]["min"] == stats["min"] and summary[key]["max"] == stats["max"]
+        assert math.isclose(summary[key]["avg"], stats["avg"])
+
+    detected = LogAnomalyDetector(threshold=50).detect(events)
+    assert {d["source_id"]: d["error_count"] for d in detected} == _reference_log_counts(events)
+    assert [d["source_id"] for d in detected] == list(_reference_log_counts(events))
+    assert [d["anomaly"] for d in detected] == [d["error_count"] >= 50 for d in detected]
+
+    detector = MetricThresholdDetector(lookback_minutes=20)
+    findings = detector.detect(events)
+    expected_latest = _reference_latest(events, datetime.now(timezone.utc) - detector.lookback)
+    expected_ids = [key for key in expected_latest if key.split(":", 1)[0] in detector.thresholds]
+    assert [f["id"] for f in findings] == expected_ids
+    for finding in findings:
+        ts, value = expected_latest[finding["id"]]
+        assert finding["timestamp"] == ts.isoformat()
+        assert finding["current_value"] == round(detector._normalize_percent(value), 2)
+
+    assert RiskScoringEngine().score(events) == _reference_risk(events)
+
+
+def test_list_and_store_columns_agree():
+    events = _events(500, seed=11)
+    store = ColumnarEventStore(chunk_rows=64)
+    store.add_events(events)
+    assert MetricAggregator().aggregate(store.columns()) == MetricAggregator().aggregate(events)
+    assert RiskScoringEngine().score(store.columns()) == RiskScoringEngine().score(events)
+    assert len(event_columns(events)) == 500 and event_columns(store.columns()) is store.columns()
+    assert MetricAggregator().aggregate([]) == {} and LogAnomalyDetector().detect([]) == []
+
+
+def test_grouping_kernels_keep_first_seen_order():
+    keys = np.array([5, 2, 5, 9, 2, 5])
+    values = np.array([1.0, 4.0, 3.0, 7.0, -1.0, 2.0])
+    groups, counts, sums, mins, maxs = grouped_stats(keys, values)
+    assert groups.tolist() == [5, 2, 9] and counts.tolist() == [3, 2, 1]
+    assert sums.tolist() == [6.0, 3.0, 7.0] and mins.tolist() == [1.0, -1.0, 7.0] and maxs.tolist() == [3.0, 4.0, 7.0]
+
+    timestamps = np.array([10, 30, 20, 5, 30, 20])
+    mask = np.array([True, True, True, True, True, False])
+    # Key 2 ties at ts 30: the first row wins; row 5 is masked out.
+    assert latest_rows(keys, timestamps, mask).tolist() == [2, 1, 3]
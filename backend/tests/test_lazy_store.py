@@ -0,0 +1,50 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from hcai_ops.analytics import LazyProxy, migrate_legacy_storage
+from hcai_ops.analytics.store import EventStore
+
+
+def test_lazy_proxy_builds_once_and_forwards():
+    built = []
+
+    def factory():
+        built.append(1)
+        return EventStore()
+
+    proxy = LazyProxy(factory)
+    proxy.storage = "fs"
+    assert not proxy.initialized and built == []
+    assert isinstance(proxy, EventStore)
+    assert proxy.initialized and built == [1]
+    assert proxy.storage == "fs"
+    proxy.add_events([])
+    proxy._events = []
+    assert proxy.all() == [] and built == [1]
+
+
+def test_migrate_legacy_storage_copies_fuller_database(tmp_path, monkeypatch):
+    legacy = tmp_path / "legacy.db"
+    conn = sqlite3.connect(legacy)
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO events(payload) VALUES (?)", [("{}",)] * 3)
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr("hcai_ops.analytics.LEGACY_SQLITE_PATHS", (legacy,))
+
+    primary = tmp_path / "data" / "events.db"
+    assert migrate_legacy_storage(primary) == legacy
+    assert primary.exists()
+    assert migrate_legacy_storage(primary) is None
+
+
+@pytest.mark.parametrize("module", ["hcai_ops.analytics", "hcai_ops.api.server"])
+def test_import_does_not_open_the_store(module, tmp_path):
+    code = f"import {module}\nfrom hcai_ops.analytics import event_store\nprint(event_store.initialized)"
+    env = {**os.environ, "HCAI_STORAGE_DIR": str(tmp_path)}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,96 @@
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+import hcai_ops.api.server as server
+from hcai_ops.analytics.api import get_anomalies
+from hcai_ops.analytics.lograte import LogRateDetector
+from hcai_ops.analytics.processors import LogAnomalyDetector
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _log(seconds, level="ERROR", source="s1"):
+    return HCaiEvent(BASE + timedelta(seconds=seconds), source, "log", log_level=level, log_message="boom")
+
+
+def _at(seconds) -> int:
+    return to_epoch_us(BASE + timedelta(seconds=seconds))
+
+
+def _by_source(findings):
+    return {f["source_id"]: f for f in findings}
+
+
+def test_burst_is_flagged_then_decays_unlike_all_history_counts():
+    # One error every ten minutes for two hours, then ten within a minute.
+    events = [_log(i * 600) for i in range(12)] + [_log(7200 + i * 5) for i in range(10)]
+    detector = LogRateDetector()
+    detector.add_events(events)
+
+    finding = _by_source(detector.detect(_at(7250)))["s1"]
+    assert finding["anomaly"] is True and finding["zscore"] >= 3
+    assert finding["error_count"] == 22 and finding["type"] == "log_rate"
+    assert finding["rate_per_min"] > 10 * finding["baseline_per_min"]
+
+    # An hour later the burst has decayed away; the all-history count still flags it.
+    later = _by_source(detector.detect(_at(7250 + 3600)))["s1"]
+    assert later["anomaly"] is False and later["decayed_errors"] < 1
+    assert LogAnomalyDetector().detect(events)[0]["anomaly"] is True
+
+
+def test_steady_rate_becomes_the_baseline():
+    detector = LogRateDetector()
+    # Five errors a minute for three hours.
+    detector.add_events(_log(i * 12) for i in range(5 * 180))
+    finding = detector.detect(_at(180 * 60))[0]
+    assert finding["anomaly"] is False
+    assert abs(finding["baseline_per_min"] - 5) < 0.1
+    assert abs(finding["rate_per_min"] - 5) < 0.5
+
+
+def test_levels_late_logs_idle_gaps_and_clear():
+    detector = LogRateDetector(log_levels=("ERROR",))
+    detector.add_events([_log(0), _log(1, level="INFO"), _log(2, level="CRITICAL"), _log(3, level="error")])
+    assert detector.stats()["folded_logs"] == 2
+
+    # A late log still counts, decayed by how much older it is.
+    detector.add_events([_log(60 * 5 * 10), _log(0)])
+    level = _by_source(detector.detect(_at(3000)))["s1"]["decayed_errors"]
+    assert 1.0 < level < 1.01
+
+    # Years of silence fold only a bounded number of empty buckets into the baseline.
+    before = detector.stats()["baseline_buckets"]
+    detector.add_events([_log(10 * 365 * 86400)])
+    assert detector.stats()["baseline_buckets"] - before <= detector._max_idle + 1
+
+    detector.clear()
+    assert detector.detect() == [] and detector.stats()["source_count"] == 0
+
+
+def test_anomalies_and_alerts_use_the_rate_detector(monkeypatch):
+    now = datetime.now(UTC)
+    events = [
+        HCaiEvent(now - timedelta(seconds=i), "spiky", "log", log_level="ERROR", log_message="boom") for i in range(10)
+    ]
+    events.append(HCaiEvent(now - timedelta(days=2), "old", "log", log_level="ERROR", log_message="boom"))
+    store, rates = EventStore(), LogRateDetector()
+    store.add_listener(rates.add_events)
+    store.add_events(events)
+
+    flagged = {f["source_id"]: f["anomaly"] for f in get_anomalies(store=store, hot=None, rates=rates) if f["type"] == "log_rate"}
+    assert flagged == {"spiky": True, "old": False}
+    # Without a live detector, one is built from the store's recent logs.
+    assert {f["source_id"] for f in get_anomalies(store=store, hot=None, rates=None) if f["type"] == "log_rate"} == {"spiky"}
+
+    monkeypatch.setattr(server, "log_rates", lambda: rates)
+    monkeypatch.setattr(server, "intel_get_incidents", lambda: [])
+    alerts = [a for a in server._build_alerts(50) if a["alert_id"].startswith("log_rate:")]
+    assert [(a["source_id"], a["severity"]) for a in alerts] == [("spiky", "CRITICAL")]
+
+    state = TestClient(server.app).get("/api/alerts/log-rates").json()
+    assert state["k"] == rates.k and state["source_count"] == 2
+    assert [s["source_id"] for s in state["sources"]] == ["spiky", "old"]
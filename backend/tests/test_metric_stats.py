@@ -0,0 +1,117 @@
+import math
+import random
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from hcai_ops.analytics.aggregates import StreamingMetricAggregator
+from hcai_ops.analytics.api import get_summary
+from hcai_ops.analytics.processors import MetricAggregator
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _metric(ts: datetime, value, source_id: str = "agent-1", name: str = "cpu_percent") -> HCaiEvent:
+    return HCaiEvent(ts, source_id, "metric", metric_name=name, metric_value=value)
+
+
+def test_running_stats_match_a_full_scan():
+    rng = random.Random(7)
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    events = [
+        _metric(base + timedelta(seconds=i), rng.uniform(0, 100), source_id=f"agent-{rng.randrange(5)}", name=rng.choice(["cpu", "ram"]))
+        for i in range(2000)
+    ]
+    events.append(HCaiEvent(base, "agent-1", "log", log_message="boom"))
+    events.append(_metric(base, None))
+    store, running = EventStore(), StreamingMetricAggregator()
+    store.add_events(events[:1000])
+    running.sync(store)
+    store.add_events(events[1000:])
+    summary = running.sync(store).summary()
+
+    expected = MetricAggregator().aggregate(events)
+    assert list(summary) == list(expected)
+    for key, stats in expected.items():
+        assert summary[key]["count"] == stats["count"]
+        assert summary[key]["min"] == stats["min"] and summary[key]["max"] == stats["max"]
+        assert math.isclose(summary[key]["avg"], stats["avg"])
+    row = next(r for r in running.series_stats() if (r["metric_name"], r["source_id"]) == ("cpu", "agent-0"))
+    values = [e.metric_value for e in events if (e.metric_name, e.source_id) == ("cpu", "agent-0")]
+    mean = sum(values) / len(values)
+    assert math.isclose(row["stddev"], math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)))
+    assert running.folded_samples == 2000 and running.rebuilds == 1
+
+
+def test_sync_rebuilds_after_a_reset_or_store_switch():
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    store, running = EventStore(), StreamingMetricAggregator()
+    store.add_events([_metric(base, 1.0), _metric(base, 3.0)])
+    assert running.sync(store).summary()["cpu_percent:agent-1"]["avg"] == 2.0
+    assert running.sync(store).rebuilds == 1
+
+    store._events = []
+    store.mark_reset()
+    store.add_events([_metric(base, 10.0)])
+    assert running.sync(store).summary() == {"cpu_percent:agent-1": {"count": 1, "min": 10.0, "max": 10.0, "avg": 10.0}}
+    assert running.rebuilds == 2
+
+    other = EventStore()
+    assert running.sync(other).summary() == {} and running.rebuilds == 3
+
+
+def test_rebuild_counts_events_ingested_during_the_scan(monkeypatch):
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    store, running = EventStore(), StreamingMetricAggregator()
+    store.add_events([_metric(base, 1.0)])
+    scan = store.iter_range
+    writer = threading.Thread(target=store.add_events, args=([_metric(base, 2.0)],))
+
+    def scanning(*args, **kwargs):
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()  # the write waits for the scan
+        yield from scan(*args, **kwargs)
+
+    monkeypatch.setattr(store, "iter_range", scanning)
+    assert running.sync(store).summary()["cpu_percent:agent-1"]["count"] == 1
+    writer.join()
+    assert running.sync(store).summary()["cpu_percent:agent-1"]["count"] == 2
+    assert running.rebuilds == 1
+
+
+def test_sliding_windows_use_bucketed_counters():
+    now = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    now_us = to_epoch_us(now)
+    running = StreamingMetricAggregator()
+    running.add_events(
+        [
+            _metric(now - timedelta(hours=2), 500.0),
+            _metric(now - timedelta(minutes=30), 50.0),
+            _metric(now - timedelta(minutes=2), 10.0),
+            _metric(now - timedelta(minutes=1), 20.0),
+        ],
+        now_us=now_us,
+    )
+    assert running.summary("5m", now_us=now_us)["cpu_percent:agent-1"] == {"count": 2, "min": 10.0, "max": 20.0, "avg": 15.0}
+    assert running.summary("1h", now_us=now_us)["cpu_percent:agent-1"]["count"] == 3
+    assert running.summary(now_us=now_us)["cpu_percent:agent-1"]["count"] == 4
+    # Ten minutes on, the 5m window has emptied and its buckets are released.
+    assert running.summary("5m", now_us=now_us + 600_000_000) == {}
+    assert running.stats()["window_buckets"]["5m"] == 0
+    with pytest.raises(ValueError):
+        running.summary("1d")
+
+
+def test_summary_endpoint_windows():
+    now = datetime.now(UTC)
+    store, running = EventStore(), StreamingMetricAggregator()
+    store.add_events([_metric(now - timedelta(hours=3), 1.0), _metric(now - timedelta(minutes=1), 3.0)])
+    assert get_summary(store=store, running=running)["cpu_percent:agent-1"]["count"] == 2
+    assert get_summary(window="5m", store=store, running=running)["cpu_percent:agent-1"]["avg"] == 3.0
+    with pytest.raises(HTTPException) as exc:
+        get_summary(window="bogus", store=store, running=running)
+    assert exc.value.status_code == 400
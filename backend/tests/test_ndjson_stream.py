@@ -0,0 +1,67 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.api.server import app
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _events(n: int = 60, base: datetime = BASE):
+    return [
+        HCaiEvent(base + timedelta(minutes=i), f"s{i % 2}", "metric", metric_name="cpu", metric_value=float(i))
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(params=["memory", "tiered", "columnar", "partitioned"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = EventStore()
+    elif request.param == "columnar":
+        store = ColumnarEventStore(chunk_rows=16)
+    elif request.param == "partitioned":
+        store = PartitionedSQLiteEventStore(tmp_path / "parts", granularity="hour")
+    else:
+        store = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9)
+    store.add_events(_events())
+    if request.param == "tiered":
+        store._evict_before(to_epoch_us(BASE + timedelta(minutes=40)))
+    yield store
+    if hasattr(store, "close"):
+        store.close()
+
+
+def test_iter_range_matches_range(store):
+    start, end = BASE + timedelta(minutes=10), BASE + timedelta(minutes=55)
+    lazy = store.iter_range(start, end, source_id="s1")
+    assert iter(lazy) is lazy
+    assert list(lazy) == store.range(start, end, source_id="s1")
+    assert [e.metric_value for e in store.iter_range()] == [float(i) for i in range(60)]
+
+
+def test_export_and_timeseries_stream_ndjson(monkeypatch):
+    store = EventStore()
+    store.add_events(_events(30, datetime.now(UTC) - timedelta(minutes=44, seconds=30)))
+    monkeypatch.setattr("hcai_ops.api.server.event_store", store)
+    client = TestClient(app)
+
+    resp = client.get("/api/events/export", params={"source_id": "s0"})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["metric_value"] for row in rows] == [float(i) for i in range(0, 30, 2)]
+
+    plain = client.get("/api/analytics/timeseries", params={"minutes": 22}).json()
+    streamed = client.get(
+        "/api/analytics/timeseries", params={"minutes": 22}, headers={"Accept": "application/x-ndjson"}
+    )
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in streamed.text.splitlines()] == plain
+    assert len(plain) == 7
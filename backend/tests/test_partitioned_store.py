@@ -0,0 +1,106 @@
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore, parse_ttls
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _evt(ts: datetime, event_type: str = "metric", source_id: str = "s1", **kw) -> HCaiEvent:
+    return HCaiEvent(timestamp=ts, source_id=source_id, event_type=event_type, **kw)
+
+
+def test_partitioned_store_routes_events_by_type_and_day(tmp_path):
+    store = PartitionedSQLiteEventStore(tmp_path)
+    day1 = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    day2 = day1 + timedelta(days=1)
+    store.add_events(
+        [
+            _evt(day1, metric_name="cpu", metric_value=0.1),
+            _evt(day2, metric_name="cpu", metric_value=0.2),
+            _evt(day1 + timedelta(minutes=5), "log", log_message="err", log_level="ERROR"),
+        ]
+    )
+
+    parts = store.partitions()
+    assert [(p.event_type, p.start.day) for p in parts] == [("log", 1), ("metric", 1), ("metric", 2)]
+    assert [e.metric_value for e in store.filter(event_type="metric")] == [0.1, 0.2]
+    assert [e.event_type for e in store.all()] == ["metric", "log", "metric"]
+
+
+def test_partitioned_store_range_only_reads_overlapping_partitions(tmp_path):
+    store = PartitionedSQLiteEventStore(tmp_path, granularity="hour")
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    store.add_events([_evt(base + timedelta(minutes=30 * i), metric_name="cpu", metric_value=float(i)) for i in range(6)])
+    assert len(store.partitions()) == 3
+
+    # Remove the first hour's file: a query that does not overlap it must still succeed.
+    store._unlink(store.partitions()[0])
+    window = store.range(base + timedelta(hours=1, minutes=30), base + timedelta(hours=3))
+    assert [e.metric_value for e in window] == [3.0, 4.0, 5.0]
+    assert [e.metric_value for e in store.since(base + timedelta(hours=2))] == [4.0, 5.0]
+
+
+def test_partitioned_store_retention_drops_whole_files(tmp_path):
+    ttls, default = parse_ttls("metric=1,log=10,bogus=x")
+    assert default is None and set(ttls) == {"metric", "log"}
+    store = PartitionedSQLiteEventStore(tmp_path, ttls=ttls)
+    old = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    store.add_events([_evt(old, metric_name="cpu", metric_value=1.0), _evt(old, "log", log_level="INFO")])
+    store.add_events([_evt(old + timedelta(days=3), metric_name="cpu", metric_value=2.0)])
+
+    # Retention also runs whenever a new partition is opened, so the expired metric day is already gone.
+    dropped = store.apply_retention(now=old + timedelta(days=3, hours=1))
+    assert dropped == []
+    assert store.dropped_partitions == 1
+    assert not (tmp_path / "metric" / old.strftime("%Y%m%d.db")).exists()
+    assert [e.metric_value for e in store.filter(event_type="metric")] == [2.0]
+    assert len(store.filter(event_type="log")) == 1
+
+    assert store.drop_all() == 2
+    assert store.stats()["stored_events"] == 0
+
+
+def test_partitioned_count_filters_in_sql(tmp_path, monkeypatch):
+    store = PartitionedSQLiteEventStore(tmp_path)
+    day1 = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    events = [
+        _evt(day1 + timedelta(days=i % 2, minutes=i), "log", f"s{i % 3}", log_message="m", log_level=level)
+        for i, level in enumerate(["ERROR", "error", "INFO", None, "CRITICAL", "WARNING"] * 3)
+    ] + [_evt(day1 + timedelta(minutes=i), metric_name="cpu" if i % 2 else "mem", metric_value=1.0) for i in range(7)]
+    store.add_events(events)
+    cases = [
+        {"event_type": "log", "log_level": "error"},
+        {"event_type": "log", "log_level": ["ERROR", "critical"]},
+        {"log_level": "INFO", "source_id": "s2"},
+        {"metric_name": "cpu"},
+        {"metric_name": "mem", "event_type": "log"},
+    ]
+    expected = [len(store.filter(**case)) for case in cases]
+    # Counting never decodes a payload in Python.
+    monkeypatch.setattr(store, "_deserialize", lambda data: (_ for _ in ()).throw(AssertionError("decoded")))
+    assert [store.count(**case) for case in cases] == expected == [6, 9, 3, 3, 0]
+
+
+def test_reads_never_recreate_a_dropped_partition(tmp_path, monkeypatch):
+    day1 = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    writer = PartitionedSQLiteEventStore(tmp_path)
+    writer.add_events([_evt(day1, metric_name="cpu", metric_value=1.0), _evt(day1 + timedelta(days=1), "log")])
+    reader = PartitionedSQLiteEventStore(tmp_path)
+    assert reader.count() == 2
+
+    # Retention elsewhere removes a file between listing partitions and reading them.
+    listed = reader.partitions()
+    writer.drop_all()
+    monkeypatch.setattr(reader, "partitions", lambda event_type=None: listed)
+    assert reader.all() == [] and reader.count() == 0 and reader.last_seen() == {}
+    assert reader.stats()["stored_events"] == 0
+    assert not any(p.path.exists() for p in listed)
+
+
+def test_retention_matches_sanitized_event_types(tmp_path):
+    store = PartitionedSQLiteEventStore(tmp_path, ttls={"k8s/event": timedelta(days=1)})
+    old = datetime.now(UTC) - timedelta(days=5)
+    assert store.ttl_for("k8s/event") == store.ttl_for("k8s_event") == timedelta(days=1)
+    # Retention runs as the new partitions open and finds the TTL under the directory name.
+    store.add_events([_evt(old, "k8s/event"), _evt(old, "metric")])
+    assert [p.event_type for p in store.partitions()] == ["metric"]
+    assert store.dropped_partitions == 1
@@ -0,0 +1,159 @@
+import sys
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.api import get_timeseries
+from hcai_ops.analytics.rollups import RollupStore, _Bucket, pick_tier
+from hcai_ops.analytics.store import EventStore
+from hcai_ops.analytics.timeutil import to_epoch_us
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _samples(count: int, step: timedelta = timedelta(seconds=20), source_id: str = "s1"):
+    return [
+        HCaiEvent(BASE + step * i, source_id, "metric", metric_name="cpu", metric_value=float(i)) for i in range(count)
+    ]
+
+
+def test_rollups_fold_samples_into_tiers(tmp_path):
+    store = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    store.add_events(_samples(18) + [HCaiEvent(BASE, "s1", "log", log_message="ignored")])
+
+    minute = store.series("cpu", "1m")
+    assert [p["count"] for p in minute] == [3, 3, 3, 3, 3, 3]
+    first = minute[0]
+    assert (first["min"], first["max"], first["last"], first["sum"], first["sumsq"]) == (0.0, 2.0, 2.0, 3.0, 5.0)
+    assert abs(first["stddev"] - (2 / 3) ** 0.5) < 1e-9
+    five = store.series("cpu", "5m")
+    assert [p["count"] for p in five] == [15, 3]
+    assert store.series("cpu", "1h")[0]["avg"] == sum(range(18)) / 18
+    store.close()
+
+
+def test_rollups_merge_across_flushes_and_processes(tmp_path):
+    path = tmp_path / "rollups.db"
+    a = RollupStore(path, flush_interval=0)
+    b = RollupStore(path, flush_interval=0)
+    a.add_events(_samples(3))
+    a.flush()
+    b.add_events([HCaiEvent(BASE + timedelta(seconds=5), "s1", "metric", metric_name="cpu", metric_value=-1.0)])
+    b.flush()
+    bucket = a.series("cpu", "1m")[0]
+    assert bucket["count"] == 4
+    assert bucket["min"] == -1.0
+    assert bucket["last"] == 2.0  # latest timestamp wins, not latest write
+    a.close()
+    b.close()
+
+
+def test_retention_is_per_tier(tmp_path):
+    store = RollupStore(tmp_path / "rollups.db", flush_interval=0, ttls={"1m": timedelta(hours=1), "5m": None, "1h": None})
+    store.add_events(_samples(3))
+    removed = store.apply_retention(now=BASE + timedelta(hours=2))
+    assert removed == 1
+    assert store.series("cpu", "1m") == []
+    assert len(store.series("cpu", "5m")) == 1
+    store.close()
+
+
+def test_pick_tier_uses_coarsest_sufficient_resolution():
+    assert pick_tier(BASE, BASE + timedelta(hours=1), now=BASE) is None
+    assert pick_tier(BASE, BASE + timedelta(days=1), now=BASE) == "1m"
+    assert pick_tier(BASE, BASE + timedelta(days=30), now=BASE) == "1h"
+    assert pick_tier(BASE, BASE + timedelta(hours=1), resolution=timedelta(minutes=10), now=BASE) == "5m"
+
+
+def test_pick_tier_skips_tiers_whose_retention_ends_after_start():
+    now = BASE + timedelta(days=7)
+    # 1m buckets are kept for two days, so a week at fine resolution comes from 5m.
+    assert pick_tier(BASE, now, resolution=timedelta(minutes=1), now=now) == "5m"
+    assert pick_tier(now - timedelta(days=1), now, resolution=timedelta(minutes=1), now=now) == "1m"
+    assert pick_tier(BASE, now, timedelta(minutes=1), ttls={"1m": None, "5m": None, "1h": None}, now=now) == "1m"
+    assert pick_tier(BASE - timedelta(days=30), now, now=now) == "1h"
+    assert pick_tier(BASE, now, resolution=timedelta(seconds=10), now=now) is None
+
+
+def test_timeseries_endpoint_serves_rollups_or_raw(tmp_path):
+    store = EventStore()
+    rollups = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    store.add_listener(rollups.add_events)
+    now = datetime.now(UTC).replace(second=0, microsecond=0)
+    store.add_events(
+        [HCaiEvent(now - timedelta(minutes=m), "s1", "metric", metric_name="cpu", metric_value=1.0) for m in range(30)]
+    )
+
+    points = get_timeseries(minutes=60, metric_name="cpu", resolution=300, store=store, rollup_store=rollups)
+    assert {p["bucket_seconds"] for p in points} == {300}
+    assert sum(p["count"] for p in points) == 30
+
+    raw = get_timeseries(minutes=60, metric_name="cpu", store=store, rollup_store=rollups)
+    assert len(raw) == 30 and raw[0]["bucket_seconds"] == 0
+    rollups.close()
+
+
+def test_store_listeners_skip_reloaded_events(tmp_path):
+    from hcai_ops.analytics.store import SQLiteEventStore
+
+    first = SQLiteEventStore(tmp_path / "events.db")
+    first.add_events(_samples(3))
+    first.close()
+    seen = []
+    store = SQLiteEventStore(tmp_path / "events.db")
+    store.add_listener(seen.extend)
+    store.add_events(_samples(2, source_id="s2"))
+    assert [e.source_id for e in seen] == ["s2", "s2"]
+    assert store.count() == 5
+    store.close()
+
+
+def test_backfill_folds_history_in_batches_off_the_caller(tmp_path, monkeypatch):
+    store = EventStore()
+    store.add_events(_samples(30))
+    batches = []
+    monkeypatch.setattr(store, "all", lambda: (_ for _ in ()).throw(AssertionError("history loaded at once")))
+
+    rollups = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    original = rollups._fold
+    monkeypatch.setattr(rollups, "_fold", lambda dirty, events: (batches.append(len(events)), original(dirty, events))[1])
+    assert rollups.empty and not rollups.backfill_pending
+    # Only events older than end are folded; newer ones are the listener's.
+    assert rollups.backfill(store, BASE + timedelta(seconds=20 * 25), batch=7) == 25
+    assert batches == [7, 7, 7, 4] and not rollups.backfill_pending
+    assert sum(p["count"] for p in rollups.series("cpu", "1h")) == 25
+    # Once done, the file is not folded again.
+    assert rollups.start_backfill(store, BASE + timedelta(hours=1)) is None
+    rollups.close()
+
+
+def test_one_store_backfills_a_shared_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys.modules["hcai_ops.analytics.rollups"], "BACKFILL_STALE_SECONDS", 0.4)
+    store = EventStore()
+    store.add_events(_samples(30))
+    end = BASE + timedelta(seconds=20 * 25)
+    a = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    b = RollupStore(tmp_path / "rollups.db", flush_interval=0)
+    assert a._claim_backfill(to_epoch_us(end)) == ("claimed", to_epoch_us(end))
+    waiting = b.start_backfill(store, end + timedelta(hours=1), batch=4)
+    # The listeners take over at the claimed end: older samples are the backfill's.
+    b.add_events(_samples(30))
+    b.flush()
+    assert a._fold_history(store, to_epoch_us(end), batch=4) == 25
+    waiting.join()
+    assert b.backfilled_samples == 0 and not b.backfill_pending
+    assert sum(p["count"] for p in a.series("cpu", "1h")) == 25 + 5
+    a.close()
+    b.close()
+
+    # A claim whose owner stopped reporting progress is taken over, with its end, and
+    # whatever it staged is discarded.
+    path = tmp_path / "other.db"
+    dead = RollupStore(path, flush_interval=0)
+    dead._claim_backfill(to_epoch_us(end))
+    dead._commit_staged({("1h", "cpu", "s1", 0): _Bucket(1.0, 0)})
+    dead.close()
+    live = RollupStore(path, flush_interval=0)
+    live.start_backfill(store, BASE + timedelta(hours=1)).join()
+    assert live.backfilled_samples == 25 and not live.backfill_pending
+    assert sum(p["count"] for p in live.series("cpu", "1h")) == 25
+    live.close()
@@ -0,0 +1,109 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.store import PersistentEventStore, segment_dir
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _batch(start: int, n: int = 50):
+    return [
+        HCaiEvent(BASE + timedelta(minutes=i), f"s{i % 3}", "metric", metric_name="cpu", metric_value=float(i))
+        for i in range(start, start + n)
+    ]
+
+
+def test_active_file_rotates_into_indexed_segments(tmp_path):
+    path = tmp_path / "events.jsonl"
+    store = PersistentEventStore(path, max_segment_bytes=4096)
+    for start in range(0, 300, 50):
+        store.add_events(_batch(start))
+
+    segments = store.segments()
+    assert len(segments) >= 3
+    active = sum(1 for _ in path.open()) if path.exists() else 0
+    assert sum(s["events"] for s in segments) + active == 300
+    index = json.loads((segment_dir(path) / "index.json").read_text())
+    assert [s["seq"] for s in index["segments"]] == [s["seq"] for s in segments]
+    assert segments[0]["first_us"] < segments[1]["first_us"]
+
+    reopened = PersistentEventStore(path, max_segment_bytes=4096)
+    assert [e.metric_value for e in reopened.all()] == [float(i) for i in range(300)]
+
+
+def test_reader_follows_rotation_by_another_writer(tmp_path):
+    path = tmp_path / "events.jsonl"
+    reader = PersistentEventStore(path, max_segment_bytes=4096)
+    writer = PersistentEventStore(path, max_segment_bytes=4096)
+    writer.add_events(_batch(0, 10))
+    assert reader.reload() == 10
+    for start in range(10, 200, 50):
+        writer.add_events(_batch(start))
+    assert writer.segments()
+    assert reader.reload() == 210
+    assert [e.metric_value for e in reader.all()] == [float(i) for i in range(210)]
+
+
+def test_hot_window_leaves_old_segments_on_disk(tmp_path):
+    path = tmp_path / "events.jsonl"
+    store = PersistentEventStore(path, max_segment_bytes=4096)
+    store.add_events(_batch(0, 150))
+    now = datetime.now(UTC)
+    store.add_events([HCaiEvent(now - timedelta(seconds=i), "s0", "heartbeat") for i in range(5)])
+
+    hot = PersistentEventStore(path, max_segment_bytes=4096, hot_window=timedelta(hours=1))
+    assert hot.stats()["stored_events"] < 155
+    assert hot.stats()["cold_segments"] >= 1
+    window = hot.range(BASE + timedelta(minutes=10), BASE + timedelta(minutes=20), source_id="s1")
+    assert [e.metric_value for e in window] == [10.0, 13.0, 16.0, 19.0]
+    assert len(hot.since(BASE)) == 155
+
+
+def test_reads_include_segments_left_cold(tmp_path):
+    path = tmp_path / "events.jsonl"
+    full = PersistentEventStore(path, max_segment_bytes=4096)
+    full.add_events(_batch(0, 150))
+    now = datetime.now(UTC)
+    full.add_events([HCaiEvent(now - timedelta(seconds=i), "s0", "heartbeat") for i in range(5)])
+
+    hot = PersistentEventStore(path, max_segment_bytes=4096, hot_window=timedelta(hours=1))
+    assert hot.stats()["cold_segments"] >= 1
+    assert [e.source_id for e in hot.all()] == [e.source_id for e in full.all()]
+    assert hot.filter(source_id="s1") == full.filter(source_id="s1")
+    assert hot.count() == 155 and hot.count(source_id="s1", metric_name="cpu") == 50
+    assert [e.metric_value for e in hot.tail(3, source_id="s2")] == [149.0, 146.0, 143.0]
+    assert hot.last_seen() == full.last_seen()
+
+    # Pages number cold events first and walk across into memory both ways.
+    seen, cursor = [], 0
+    while cursor is not None:
+        items, cursor = hot.page(40, after_id=cursor)
+        seen.extend(items)
+    assert [i for i, _ in seen] == list(range(1, 156))
+    assert [e.source_id for _, e in seen] == [e.source_id for e in full.all()]
+    items, cursor = hot.page(7, event_type="heartbeat")
+    assert len(items) == 5 and cursor is None
+    items, cursor = hot.page(3, before_id=153, source_id="s0")
+    assert [i for i, _ in items] == [152, 151, 148] and cursor == 148
+    assert [i for i, _ in hot.page(2, before_id=cursor, source_id="s0")[0]] == [145, 142]
+
+
+def test_compress_and_drop_whole_segments(tmp_path):
+    path = tmp_path / "events.jsonl"
+    store = PersistentEventStore(path, max_segment_bytes=4096)
+    for start in range(0, 300, 50):
+        store.add_events(_batch(start))
+    closed = store.segments()
+
+    assert store.compress_segments() == len(closed)
+    assert all(s["compressed"] for s in store.segments())
+    assert len(PersistentEventStore(path).all()) == 300
+
+    cutoff = datetime.fromtimestamp(closed[1]["last_us"] / 1e6, UTC) + timedelta(microseconds=1)
+    assert store.drop_segments_before(cutoff) == [closed[0]["seq"], closed[1]["seq"]]
+    assert PersistentEventStore(path).all()[0].metric_value == float(closed[0]["events"] + closed[1]["events"])
+
+    store.truncate()
+    assert not segment_dir(path).exists()
+    assert PersistentEventStore(path).all() == []
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.aggregates import StreamingMetricAggregator
+from hcai_ops.analytics.store import SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _evt(i: int, source_id: str) -> HCaiEvent:
+    return HCaiEvent(BASE + timedelta(seconds=i), source_id, "metric", metric_name="cpu", metric_value=float(i))
+
+
+def test_shared_workers_converge_on_table_order(tmp_path):
+    path = tmp_path / "events.db"
+    a = SQLiteEventStore(path, shared=True)
+    b = SQLiteEventStore(path, shared=True)
+
+    a.add_events([_evt(0, "a"), _evt(1, "a")])
+    # Both writers are asynchronous: commit a's rows first so the table order is fixed.
+    a.flush()
+    b.add_events([_evt(2, "b")])
+    # Each worker sees its own write immediately and the other's after it commits.
+    assert [e.source_id for e in b.tail(1)] == ["b"]
+    assert [e.source_id for e in a.all()] == ["a", "a", "b"]
+    assert [e.source_id for e in b.all()] == ["a", "a", "b"]
+    assert a.count(source_id="b") == 1
+
+    syncs = a.syncs
+    assert a.range(BASE) == b.range(BASE)
+    assert a.syncs == syncs  # nothing committed since: no reload
+    a.close()
+    b.close()
+
+
+def test_shared_store_follows_another_process(tmp_path):
+    path = tmp_path / "events.db"
+    reader = SQLiteEventStore(path, shared=True)
+    assert reader.all() == []
+    code = (
+        "import sys\n"
+        "from datetime import datetime\n"
+        "from pathlib import Path\n"
+        "from hcai_ops.analytics.store import SQLiteEventStore\n"
+        "from hcai_ops.data.schemas import HCaiEvent\n"
+        "store = SQLiteEventStore(Path(sys.argv[1]), shared=True)\n"
+        "store.add_events([HCaiEvent(datetime(2025, 1, 1), f'p{i}', 'heartbeat') for i in range(5)])\n"
+        "store.close()\n"
+    )
+    subprocess.run([sys.executable, "-c", code, str(path)], check=True)
+    assert [e.source_id for e in reader.all()] == [f"p{i}" for i in range(5)]
+    assert reader.last_seen().keys() == {f"p{i}" for i in range(5)}
+    reader.close()
+
+
+def test_shared_write_enters_the_change_feed_once(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db", shared=True)
+    seen = []
+    store.add_listener(seen.extend)
+    store.add_events([_evt(0, "a")])
+
+    assert len(seen) == 1
+    assert [e.source_id for e in store.changes_since(0).events] == ["a"]
+    assert store.seq == 1
+    summary = StreamingMetricAggregator().sync(store).summary()
+    assert summary["cpu:a"]["count"] == 1
+    store.close()
@@ -0,0 +1,68 @@
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.store import SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+from hcai_ops.testing.benchmarks import make_metric_events
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def test_startup_replays_only_rows_after_snapshot(tmp_path):
+    db, snap = tmp_path / "events.db", tmp_path / "events.db.snapshot"
+    store = SQLiteEventStore(db, snapshot_path=snap)
+    events = make_metric_events(500, sources=5, start=BASE)
+    store.add_events(events[:400])
+    header = store.save_snapshot()
+    assert header["last_id"] == 400
+
+    writer = SQLiteEventStore(db)
+    writer.add_events(events[400:])
+    writer.close()
+    store.snapshot_path = None  # keep the 400-row snapshot
+    store.close()
+
+    reopened = SQLiteEventStore(db, snapshot_path=snap)
+    assert reopened.startup["source"] == "snapshot"
+    assert reopened.startup == {**reopened.startup, "snapshot_events": 400, "replayed": 100}
+    full = SQLiteEventStore(db)
+    assert reopened.all() == full.all()
+    assert reopened.count(source_id="agent-1") == 100
+    assert reopened.range(BASE + timedelta(seconds=398), BASE + timedelta(seconds=402)) == events[398:402]
+    assert reopened.last_seen() == full.last_seen()
+    reopened.close()
+    full.close()
+
+
+def test_close_writes_snapshot_and_stale_snapshots_are_ignored(tmp_path):
+    db, snap = tmp_path / "events.db", tmp_path / "events.db.snapshot"
+    store = SQLiteEventStore(db, snapshot_path=snap)
+    store.add_events(make_metric_events(50, start=BASE))
+    store.close()
+    assert snap.exists()
+
+    # Rows deleted under the snapshot's high-water mark force a full load.
+    store = SQLiteEventStore(db)
+    store.conn.execute("DELETE FROM events WHERE id <= 10")
+    store.conn.commit()
+    store.close()
+    reopened = SQLiteEventStore(db, snapshot_path=snap)
+    assert reopened.startup["source"] == "database"
+    assert len(reopened.all()) == 40
+    reopened.close()
+
+    snap.write_bytes(b"not a pickle")
+    assert SQLiteEventStore(db, snapshot_path=snap).startup["source"] == "database"
+
+
+def test_snapshot_refuses_diverged_memory(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db", snapshot_path=tmp_path / "snap")
+    store.add_events([HCaiEvent(BASE, "s", "heartbeat")])
+    store.flush()
+    store._events = []
+    try:
+        store.save_snapshot()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+    assert not (tmp_path / "snap").exists()
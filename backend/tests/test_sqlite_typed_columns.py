@@ -0,0 +1,109 @@
+import json
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.aggregates import StreamingMetricAggregator
+from hcai_ops.analytics.processors import MetricAggregator
+from hcai_ops.analytics.store import SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _events():
+    out = []
+    for i in range(20):
+        out.append(
+            HCaiEvent(BASE + timedelta(seconds=i), f"s{i % 2}", "metric", metric_name="cpu", metric_value=float(i))
+        )
+    out.append(HCaiEvent(BASE, "s0", "log", log_message="boom", log_level="error", alert_id="a-1"))
+    out.append(HCaiEvent(BASE, "s1", "incident", incident_label="outage"))
+    return out
+
+
+def test_typed_columns_are_written_and_aggregated_in_sql(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db")
+    events = _events()
+    store.add_events(events)
+    assert store.typed_ready
+
+    summary = store.metric_summary()
+    assert summary == MetricAggregator().aggregate(events)
+
+    row = store.conn.execute("SELECT log_level, alert_id FROM events WHERE event_type = 'log'").fetchone()
+    assert row == ("ERROR", "a-1")
+    plan = " ".join(
+        r[-1]
+        for r in store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT metric_name, source_id, COUNT(metric_value), MIN(metric_value), "
+            "MAX(metric_value), AVG(metric_value) FROM events WHERE metric_name IS NOT NULL "
+            "AND metric_value IS NOT NULL GROUP BY metric_name, source_id"
+        )
+    )
+    assert "COVERING INDEX idx_events_metric" in plan
+    store.close()
+
+
+def test_streaming_summary_is_seeded_from_sql(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9)
+    store.add_events(_events())
+    now = datetime.now(UTC)
+    recent = [HCaiEvent(now - timedelta(seconds=i), "s1", "metric", metric_name="cpu", metric_value=i) for i in range(5)]
+    store.add_events(recent)
+    store._evict_before(store._ts_us(now - timedelta(minutes=1)))
+    scanned = []
+    original = store.iter_range
+    store.iter_range = lambda start=None, *a, **kw: (scanned.append(start), original(start, *a, **kw))[1]
+
+    running = StreamingMetricAggregator().sync(store)
+    # Only the windows are read back as events; the 2025 history comes from SQL.
+    assert len(scanned) == 1 and scanned[0] > BASE
+    expected = StreamingMetricAggregator()
+    expected.add_events(_events() + recent)
+    assert running.summary() == expected.summary()
+    assert running.summary("5m") == expected.summary("5m") == {"cpu:s1": {"count": 5, "min": 0.0, "max": 4.0, "avg": 2.0}}
+    got = {(r["metric_name"], r["source_id"]): r for r in running.series_stats()}
+    for row in expected.series_stats():
+        mine = got[(row["metric_name"], row["source_id"])]
+        assert mine["last"] == row["last"] and abs(mine["stddev"] - row["stddev"]) < 1e-9
+
+    store.add_events([HCaiEvent(now, "s0", "metric", metric_name="cpu", metric_value=100.0)])
+    assert running.sync(store).summary()["cpu:s0"]["max"] == 100.0 and running.rebuilds == 1
+    store.close()
+
+
+def test_legacy_database_migrates_online(tmp_path):
+    path = tmp_path / "events.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT, source_id TEXT, event_type TEXT, payload TEXT)"
+    )
+    for e in _events():
+        data = e.to_dict()
+        data["timestamp"] = e.timestamp.isoformat()
+        conn.execute(
+            "INSERT INTO events(ts, source_id, event_type, payload) VALUES (?,?,?,?)",
+            (data["timestamp"], e.source_id, e.event_type, json.dumps(data)),
+        )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteEventStore(path)
+    # Reads work while the backfill runs; typed predicates wait for it.
+    assert store.count(event_type="log", log_level="ERROR") == 1
+    assert store.wait_for_migration(timeout=10)
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SQLiteEventStore.SCHEMA_VERSION
+    assert store.conn.execute("SELECT COUNT(*) FROM events WHERE metric_name = 'cpu'").fetchone()[0] == 20
+    assert store.metric_summary()["cpu:s1"] == {"count": 10, "min": 1.0, "max": 19.0, "avg": 10.0}
+    assert store.stats()["typed_columns"] is True
+    store.close()
+
+
+def test_tiered_count_uses_typed_columns(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9)
+    store.add_events(_events())
+    store._evict_before(store._ts_us(BASE + timedelta(seconds=10)))
+    assert store.count(metric_name="cpu") == 20
+    assert store.count(source_id="s0", log_level=["error", "warning"]) == 1
+    assert [e.metric_value for e in store.filter(metric_name="cpu", source_id="s1")][:3] == [1.0, 3.0, 5.0]
+    store.close()
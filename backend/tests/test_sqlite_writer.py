@@ -0,0 +1,52 @@
+import sqlite3
+from datetime import UTC, datetime
+
+from hcai_ops.analytics.store import SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+from hcai_ops.testing.benchmarks import make_metric_events
+
+
+def test_sqlite_store_group_commits_single_event_calls(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db")
+    for event in make_metric_events(500):
+        store.add_events([event])
+    assert store.flush(timeout=10)
+
+    stats = store.stats()
+    assert stats["stored_events"] == 500
+    writer = stats["writer"]
+    assert writer["rows_written"] == 500
+    assert writer["pending"] == 0
+    assert writer["batches"] <= 500
+    assert writer["max_batch_size"] >= 1
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()
+
+    reopened = SQLiteEventStore(tmp_path / "events.db")
+    assert len(reopened.all()) == 500
+    reopened.close()
+
+
+def test_sqlite_store_reads_see_queued_writes(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db")
+    evt = HCaiEvent(
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+        source_id="s1",
+        event_type="log",
+        log_message="hello",
+        extras={"when": datetime(2025, 1, 1)},
+    )
+    store.add_events([evt])
+    logs = store.filter(source_id="s1")
+    assert len(logs) == 1
+    assert logs[0].log_message == "hello"
+    store.close()
+
+
+def test_sqlite_store_sync_mode(tmp_path):
+    store = SQLiteEventStore(tmp_path / "events.db", async_writes=False)
+    store.add_events(make_metric_events(10))
+    count = sqlite3.connect(tmp_path / "events.db").execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    assert count == 10
+    assert store.stats()["writer"] is None
+    store.close()
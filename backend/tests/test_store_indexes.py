@@ -0,0 +1,94 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _events():
+    out = []
+    for i in range(12):
+        out.append(
+            HCaiEvent(
+                timestamp=BASE + timedelta(minutes=i),
+                source_id=f"s{i % 2}",
+                event_type="metric",
+                metric_name="cpu" if i % 3 else "mem",
+                metric_value=float(i),
+            )
+        )
+        out.append(
+            HCaiEvent(
+                timestamp=BASE + timedelta(minutes=i, seconds=30),
+                source_id=f"s{i % 2}",
+                event_type="log",
+                log_message=f"line {i}",
+                log_level=("error", "INFO", "CRITICAL")[i % 3],
+            )
+        )
+    return out
+
+
+@pytest.fixture(params=["memory", "columnar", "sqlite", "tiered", "partitioned"])
+def store(request, tmp_path):
+    kind = request.param
+    if kind == "memory":
+        s = EventStore()
+    elif kind == "columnar":
+        s = ColumnarEventStore(chunk_rows=5)
+    elif kind == "sqlite":
+        s = SQLiteEventStore(tmp_path / "events.db")
+    elif kind == "tiered":
+        s = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9)
+    else:
+        s = PartitionedSQLiteEventStore(tmp_path / "parts", granularity="hour")
+    s.add_events(_events())
+    if kind == "tiered":
+        # Push the hot boundary into the data so queries have to merge memory and disk.
+        s._evict_before(s._ts_us(BASE + timedelta(minutes=6)))
+    yield s
+    if hasattr(s, "close"):
+        s.close()
+
+
+def test_filter_by_indexed_fields(store):
+    cpu_s1 = store.filter(source_id="s1", metric_name="cpu")
+    assert [e.metric_value for e in cpu_s1] == [1.0, 5.0, 7.0, 11.0]
+    errors = store.filter(event_type="log", log_level=["ERROR", "critical"])
+    assert [e.log_message for e in errors] == [f"line {i}" for i in range(12) if i % 3 != 1]
+
+
+def test_tail_is_newest_first_and_lazy(store):
+    latest = list(store.tail(3))
+    assert [e.timestamp for e in latest] == [
+        BASE + timedelta(minutes=11, seconds=30),
+        BASE + timedelta(minutes=11),
+        BASE + timedelta(minutes=10, seconds=30),
+    ]
+    logs = [e.log_message for e in store.tail(2, event_type="log", source_id="s0")]
+    assert logs == ["line 10", "line 8"]
+    assert [e.metric_value for e in store.tail(metric_name="mem")] == [9.0, 6.0, 3.0, 0.0]
+
+
+def test_count_and_last_seen(store):
+    assert store.count() == 24
+    assert store.count(event_type="log") == 12
+    assert store.count(log_level="info") == 4
+    assert store.count(source_id="s0", metric_name="cpu") == 4
+    seen = store.last_seen()
+    assert seen["s1"] == BASE + timedelta(minutes=11, seconds=30)
+    assert seen["s0"] == BASE + timedelta(minutes=10, seconds=30)
+
+
+def test_indexes_rebuild_when_events_are_reset():
+    store = EventStore()
+    store.add_events(_events())
+    store._events = []
+    assert store.count(event_type="log") == 0
+    assert list(store.tail(5)) == []
+    assert store.last_seen() == {}
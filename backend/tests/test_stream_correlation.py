@@ -0,0 +1,71 @@
+import random
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.correlation import StreamingCorrelator
+from hcai_ops.analytics.processors import CorrelationEngine
+from hcai_ops.data.schemas import HCaiEvent
+import hcai_ops.intelligence.api as intelligence_api
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _sample(seconds, value=0.95, source="s1", name="cpu"):
+    return HCaiEvent(BASE + timedelta(seconds=seconds), source, "metric", metric_name=name, metric_value=value)
+
+
+def _log(seconds, message, level="ERROR", source="s1"):
+    return HCaiEvent(BASE + timedelta(seconds=seconds), source, "log", log_level=level, log_message=message)
+
+
+def test_streaming_matches_batch_on_ordered_input():
+    rng = random.Random(9)
+    events = []
+    for i in range(4000):
+        source = rng.choice(["a", "b", "c"])
+        if rng.random() < 0.5:
+            events.append(_sample(i * 2, rng.choice([0.5, 0.95]), source=source))
+        else:
+            events.append(_log(i * 2, f"m{i}", rng.choice(["ERROR", "error", "INFO"]), source=source))
+    correlator = StreamingCorrelator(capacity=10_000)
+    for offset in range(0, len(events), 250):
+        correlator.add_events(events[offset : offset + 250])
+    expected = CorrelationEngine().correlate(events)
+    assert Counter(map(str, correlator.findings())) == Counter(map(str, expected))
+    assert correlator.emitted == len(expected) > 0
+
+
+def test_late_logs_complete_waiting_samples_and_state_expires():
+    correlator = StreamingCorrelator(window_minutes=5, capacity=2)
+    assert correlator.add_events([_sample(0), _sample(10, name="mem"), _sample(20, value=0.2)]) == []
+    assert correlator.stats()["pending_samples"] == 2
+    found = correlator.add_events([_log(200, "oom")])
+    assert [(f["metric"], f["log_message"]) for f in found] == [("cpu", "oom"), ("mem", "oom")]
+    assert correlator.add_events([_sample(250)])[0]["log_message"] == "oom"
+    # The findings ring keeps only the latest two.
+    assert [f["metric"] for f in correlator.findings()] == ["mem", "cpu"]
+
+    # Ten minutes later the old log has expired, so the new sample waits instead.
+    assert correlator.add_events([_sample(900)]) == []
+    stats = correlator.stats()
+    assert stats["buffered_logs"] == 0 and stats["pending_samples"] == 1
+
+    # A source that stays quiet for a whole window is dropped.
+    correlator.add_events([_log(2000, "later", source="s2")])
+    assert correlator.stats()["sources"] == 1
+
+
+def test_state_is_bounded_by_the_window():
+    correlator = StreamingCorrelator(window_minutes=1)
+    for hour in range(5):
+        correlator.add_events([_log(hour * 3600 + i, f"e{i}") for i in range(0, 3600, 10)])
+        assert correlator.stats()["buffered_logs"] <= 7
+
+
+def test_filters_and_intelligence_endpoint(monkeypatch):
+    correlator = StreamingCorrelator(metric_names=["mem"], log_levels=["critical"])
+    correlator.add_events([_log(0, "disk", "CRITICAL"), _sample(1), _sample(2, name="mem"), _log(3, "plain")])
+    assert [(f["metric"], f["log_message"]) for f in correlator.findings()] == [("mem", "disk")]
+
+    monkeypatch.setattr(intelligence_api, "stream_correlator", lambda: correlator)
+    assert intelligence_api.get_correlations() == correlator.findings()
@@ -0,0 +1,100 @@
+from datetime import UTC, datetime, timedelta
+
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+
+def _metric(ts: datetime, value: float) -> HCaiEvent:
+    return HCaiEvent(timestamp=ts, source_id="s1", event_type="metric", metric_name="cpu", metric_value=value)
+
+
+def test_tiered_store_loads_only_hot_window_on_startup(tmp_path):
+    now = datetime.now(UTC)
+    seed = SQLiteEventStore(tmp_path / "events.db")
+    seed.add_events([_metric(now - timedelta(hours=h), float(h)) for h in (5, 4, 3, 0)])
+    seed.close()
+
+    store = SQLiteEventStore(tmp_path / "events.db", hot_window=timedelta(hours=1))
+    assert [e.metric_value for e in store._events] == [0.0]
+    tier = store.stats()["tier"]
+    assert tier["hot_events"] == 1
+    assert tier["evicted_events"] == 3
+
+    # Reads fall through to SQLite for ranges older than the hot window.
+    assert [e.metric_value for e in store.since(now - timedelta(hours=3, minutes=30))] == [3.0, 0.0]
+    assert [e.metric_value for e in store.all()] == [5.0, 4.0, 3.0, 0.0]
+    store.close()
+
+
+def test_tiered_store_evicts_by_byte_budget(tmp_path):
+    base = datetime.now(UTC) - timedelta(minutes=30)
+    store = SQLiteEventStore(tmp_path / "events.db", hot_bytes=4000)
+    store.add_events([_metric(base + timedelta(seconds=i), float(i)) for i in range(30)])
+
+    tier = store.stats()["tier"]
+    assert tier["hot_bytes_estimate"] <= 4000
+    assert 0 < tier["hot_events"] < 30
+    assert tier["evicted_events"] == 30 - tier["hot_events"]
+    assert [e.metric_value for e in store.all()] == [float(i) for i in range(30)]
+
+    # Late arrivals older than the hot tier are written to SQLite only.
+    store.add_events([_metric(base - timedelta(hours=1), -1.0)])
+    assert all(e.metric_value != -1.0 for e in store._events)
+    assert store.all()[0].metric_value == -1.0
+    store.close()
+
+
+def test_sqlite_store_backfills_epoch_column_for_old_databases(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT, source_id TEXT, event_type TEXT, payload TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO events(ts, source_id, event_type, payload) VALUES (?,?,?,?)",
+        ("2025-01-01T00:00:00", "s1", "heartbeat", '{"timestamp": "2025-01-01T00:00:00", "source_id": "s1", "event_type": "heartbeat"}'),
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteEventStore(path)
+    epoch = store.conn.execute("SELECT ts_epoch FROM events").fetchone()[0]
+    assert epoch == int(datetime(2025, 1, 1, tzinfo=UTC).timestamp()) * 1_000_000
+    store.close()
+
+
+def test_eviction_compacts_indexes_like_a_rebuild(tmp_path):
+    base = datetime.now(UTC) - timedelta(minutes=30)
+    store = SQLiteEventStore(tmp_path / "events.db", hot_window=timedelta(hours=1))
+    events = [
+        HCaiEvent(base + timedelta(seconds=i), f"s{i % 3}", "log" if i % 2 else "metric",
+                  metric_name=None if i % 2 else "cpu", metric_value=None if i % 2 else float(i),
+                  log_level=None if i % 2 == 0 else ("ERROR" if i % 4 == 1 else "INFO"))
+        for i in range(40)
+    ]
+    # Late arrivals, so the oldest events are not a prefix of the arrival order.
+    store.add_events(events[10:] + events[:10])
+    rows = store._rows
+
+    # Nothing is older than the cutoff: no work, and the row list is left alone.
+    store._evict_before(store._ts_us(events[0]))
+    assert store._rows is rows and store.stats()["tier"]["evicted_events"] == 0
+
+    size_before = store._hot_size
+    store._evict_before(store._ts_us(events[15]))
+    kept = [e for e in events[10:] + events[:10] if e.timestamp >= events[15].timestamp]
+    assert store._events == kept
+    assert store._hot_size == size_before - sum(store._event_size(e) for e in events[:15])
+    assert store.stats()["tier"]["evicted_events"] == 15
+
+    fresh = EventStore()
+    fresh.add_events(kept)
+    for name in ("_by_source", "_by_type", "_by_level", "_by_series", "_last_seen"):
+        assert getattr(store, name) == getattr(fresh, name), name
+    assert list(store._epochs) == list(fresh._epochs) and list(store._by_time) == list(fresh._by_time)
+    assert store.count(event_type="log", log_level="ERROR") == len([e for e in events if e.log_level == "ERROR"])
+    store.add_events([_metric(base + timedelta(minutes=5), 1.0)])
+    assert store._events[-1].metric_value == 1.0
+    store.close()
@@ -0,0 +1,68 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from hcai_ops.analytics.columnar import ColumnarEventStore
+from hcai_ops.analytics.partitioned import PartitionedSQLiteEventStore
+from hcai_ops.analytics.store import EventStore, SQLiteEventStore
+from hcai_ops.data.schemas import HCaiEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _evt(minute: int, naive: bool = False, **kw) -> HCaiEvent:
+    ts = BASE + timedelta(minutes=minute)
+    if naive:
+        ts = ts.replace(tzinfo=None)
+    return HCaiEvent(
+        timestamp=ts,
+        source_id=kw.pop("source_id", "s1"),
+        event_type="metric",
+        metric_name="cpu",
+        metric_value=float(minute),
+        **kw,
+    )
+
+
+@pytest.fixture(params=["memory", "columnar", "sqlite", "tiered", "partitioned"])
+def store(request, tmp_path):
+    kind = request.param
+    if kind == "memory":
+        s = EventStore()
+    elif kind == "columnar":
+        s = ColumnarEventStore(chunk_rows=4)
+    elif kind in ("sqlite", "tiered"):
+        s = SQLiteEventStore(tmp_path / "events.db", hot_bytes=10**9 if kind == "tiered" else None)
+    else:
+        s = PartitionedSQLiteEventStore(tmp_path / "parts", granularity="hour")
+    # Slightly out-of-order arrivals, mixing naive (UTC) and aware timestamps.
+    s.add_events([_evt(m, naive=m % 2 == 0, source_id=f"s{m % 2}") for m in (0, 1, 3, 2, 5, 4, 7, 6, 9, 8)])
+    if kind == "tiered":
+        s._evict_before(s._ts_us(BASE + timedelta(minutes=4)))
+    yield s
+    if hasattr(s, "close"):
+        s.close()
+
+
+def _minutes(events):
+    return [int(e.metric_value) for e in events]
+
+
+def test_range_returns_window_in_time_order(store):
+    assert _minutes(store.range(BASE + timedelta(minutes=2), BASE + timedelta(minutes=7))) == [2, 3, 4, 5, 6]
+    assert _minutes(store.range(end=BASE + timedelta(minutes=2))) == [0, 1]
+    assert _minutes(store.range(BASE + timedelta(minutes=3), source_id="s0")) == [4, 6, 8]
+
+
+def test_since_accepts_naive_and_aware_cutoffs(store):
+    assert _minutes(store.since(BASE + timedelta(minutes=6))) == [6, 7, 8, 9]
+    naive_cutoff = (BASE + timedelta(minutes=6)).replace(tzinfo=None)
+    assert _minutes(store.since(naive_cutoff)) == [6, 7, 8, 9]
+
+
+def test_late_arrival_is_inserted_in_order():
+    store = EventStore()
+    store.add_events([_evt(m) for m in range(10)])
+    store.add_events([_evt(3), _evt(-1)])
+    assert _minutes(store.since(BASE)) == [0, 1, 2, 3, 3, 4, 5, 6, 7, 8, 9]
+    assert _minutes(store.range(BASE - timedelta(minutes=1), BASE + timedelta(minutes=1))) == [-1, 0]
@@ -8,7 +8,6 @@ import json
 import logging
 import os
 import sqlite3
-from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -46,7 +45,7 @@ def _ensure_queue(config: AgentConfig) -> None:
 
 
 async def _post_event(config: AgentConfig, event: HCaiEvent) -> bool:
-    payload = asdict(event)
+    payload = event.to_dict()
     ts = payload.get("timestamp")
     if ts:
         try:
@@ -84,7 +83,7 @@ async def send_event(config: AgentConfig, event: HCaiEvent) -> None:
     path = _get_queue_path(config)
     conn = sqlite3.connect(path)
     try:
-        conn.execute("INSERT INTO queue(payload) VALUES(?)", (json.dumps(asdict(event)),))
+        conn.execute("INSERT INTO queue(payload) VALUES(?)", (json.dumps(event.to_dict()),))
         conn.commit()
     finally:
         conn.close()